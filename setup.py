@@ -22,6 +22,7 @@ setup(
     license="MPL2.0",
     setup_requires=["wheel"],
     install_requires=["boto3==1.34.25", "pydantic==2.5.3"],
+    extras_require={"fast": ["numpy"]},
     package_dir={"willy": "willy"},
     entry_points={
         "console_scripts": ["willy=willy.cli:cli"],
@@ -1,12 +1,15 @@
 import json
+from threading import Lock
 from typing import List, Dict, Union
 from uuid import uuid4
 
-from botocore.exceptions import WaiterError
+from botocore.exceptions import ClientError, WaiterError
 
 from willy.models import TaskDefinition, Cluster, ContainerInstance, Service, Container
 from willy.services import ECSService
 
+DOCKER_API_19 = {"name": "com.amazonaws.ecs.capability.docker-remote-api.1.19"}
+
 
 def read_json(file_path: str) -> dict:
     with open(file_path, "r") as input_data:
@@ -125,6 +128,72 @@ def get_service(task_definition: TaskDefinition, desired_count: int = 1) -> Serv
     )
 
 
+def get_named_service(
+    name: str,
+    desired_count: int,
+    cpu: int = 256,
+    memory: int = 256,
+    ports: list = None,
+    distinct: bool = False,
+    requires_attributes: list = None,
+) -> Service:
+    task_definition = get_task_definition(
+        cpu=cpu,
+        memory=memory,
+        ports_tcp=ports,
+        requires_attributes=requires_attributes,
+    )
+    task_definition.distinct_instance = distinct
+
+    return Service(
+        name=name,
+        arn=f"arn:aws:ecs:eu-west-1:123456789012:service/cluster-prod/{name}",
+        desired_count=desired_count,
+        task_definition=task_definition,
+    )
+
+
+def get_instance(
+    arn: str, cpu: int = 512, memory: int = 512, ports: list = None, attributes=None
+) -> ContainerInstance:
+    return ContainerInstance(
+        arn=arn,
+        cpu_remaining=cpu,
+        cpu_total=8192,
+        memory_remaining=memory,
+        memory_total=15742,
+        attributes=attributes or [DOCKER_API_19],
+        instance_id=f"i-{arn}",
+        ports_tcp=ports or [],
+    )
+
+
+def get_instances(
+    num_nodes: int, cpu: int = 1024, memory: int = 2048, ports: list = None
+) -> List[ContainerInstance]:
+    return [
+        ContainerInstance(
+            arn=f"arn:aws:ecs:eu-west-1:123456789012:container-instance/cluster-prod/{idx}",
+            instance_id=f"i-{idx}",
+            cpu_remaining=cpu,
+            cpu_total=cpu,
+            memory_remaining=memory,
+            memory_total=memory,
+            attributes=[],
+            ports_tcp=ports or [],
+        )
+        for idx in range(num_nodes)
+    ]
+
+
+def get_cluster_of(*container_instances: ContainerInstance) -> Cluster:
+    return Cluster(
+        name="cluster-prod",
+        arn="arn:aws:ecs:eu-west-1:123456789012:cluster/cluster-prod",
+        container_instances=list(container_instances),
+    )
+
+
 def get_ecs_service(cluster_name: str, ecs_client, service_name: str) -> ECSService:
     return ECSService(
         cluster_name=cluster_name,
@@ -133,6 +202,244 @@ def get_ecs_service(cluster_name: str, ecs_client, service_name: str) -> ECSServ
     )
 
 
+def get_container_instance_response(
+    arn: str,
+    instance_id: str,
+    cpu_remaining: int = 1024,
+    memory_remaining: int = 2048,
+    cpu_total: int = 1024,
+    memory_total: int = 2048,
+    attributes: List[Dict[str, str]] = None,
+    ports_tcp: List[str] = None,
+    ports_udp: List[str] = None,
+    version: int = 1,
+) -> dict:
+    return {
+        "containerInstanceArn": arn,
+        "ec2InstanceId": instance_id,
+        "version": version,
+        "remainingResources": [
+            {"name": "CPU", "type": "INTEGER", "integerValue": cpu_remaining},
+            {"name": "MEMORY", "type": "INTEGER", "integerValue": memory_remaining},
+            {"name": "PORTS", "type": "STRINGSET", "stringSetValue": ports_tcp or []},
+            {
+                "name": "PORTS_UDP",
+                "type": "STRINGSET",
+                "stringSetValue": ports_udp or [],
+            },
+        ],
+        "registeredResources": [
+            {"name": "CPU", "type": "INTEGER", "integerValue": cpu_total},
+            {"name": "MEMORY", "type": "INTEGER", "integerValue": memory_total},
+            {"name": "PORTS", "type": "STRINGSET", "stringSetValue": []},
+            {"name": "PORTS_UDP", "type": "STRINGSET", "stringSetValue": []},
+        ],
+        "attributes": attributes or [],
+        "status": "ACTIVE",
+    }
+
+
+class StubECSClient:
+    """In-memory stand-in for the boto3 ECS client that serves canned responses and counts calls."""
+
+    def __init__(
+        self,
+        cluster_name: str = "cluster-prod",
+        container_instances: List[dict] = None,
+        services: List[dict] = None,
+        task_definitions: List[dict] = None,
+        page_size: int = 100,
+        tasks: List[dict] = None,
+    ):
+        self.cluster_name = cluster_name
+        self.container_instances = container_instances or []
+        self.services = services or []
+        self.task_definitions = {
+            elem["taskDefinition"]["taskDefinitionArn"]: elem
+            for elem in (task_definitions or [])
+        }
+        self.page_size = page_size
+        self.tasks = tasks or []
+        self.calls: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def _count(self, operation: str):
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+
+    def _check_cluster(self, cluster: str, operation: str):
+        # like ECS, calls other than describe_clusters fail for clusters that do not exist
+        if cluster != self.cluster_name:
+            raise ClientError(
+                {
+                    "Error": {
+                        "Code": "ClusterNotFoundException",
+                        "Message": "Cluster not found.",
+                    }
+                },
+                operation,
+            )
+
+    def describe_clusters(self, clusters: List[str]) -> dict:
+        self._count("describe_clusters")
+
+        if clusters != [self.cluster_name]:
+            return {
+                "clusters": [],
+                "failures": [{"arn": clusters[0], "reason": "MISSING"}],
+            }
+
+        return {
+            "clusters": [
+                {
+                    "clusterName": self.cluster_name,
+                    "clusterArn": f"arn:aws:ecs:eu-west-1:123456789012:cluster/{self.cluster_name}",
+                }
+            ],
+            "failures": [],
+        }
+
+    def list_container_instances(
+        self, cluster: str, status: str = "ACTIVE", nextToken: str = None, **kwargs
+    ) -> dict:
+        self._count("list_container_instances")
+
+        start = int(nextToken) if nextToken else 0
+        end = start + self.page_size
+        response = {
+            "containerInstanceArns": [
+                elem["containerInstanceArn"]
+                for elem in self.container_instances[start:end]
+            ]
+        }
+
+        if end < len(self.container_instances):
+            response["nextToken"] = str(end)
+
+        return response
+
+    def describe_container_instances(
+        self, cluster: str, containerInstances: List[str]
+    ) -> dict:
+        self._count("describe_container_instances")
+
+        if len(containerInstances) > 100:
+            raise ValueError("describe_container_instances accepts at most 100 ARNs")
+
+        by_arn = {
+            elem["containerInstanceArn"]: elem for elem in self.container_instances
+        }
+
+        return {
+            "containerInstances": [
+                by_arn[arn] for arn in containerInstances if arn in by_arn
+            ],
+            "failures": [],
+        }
+
+    def list_services(self, cluster: str, nextToken: str = None, **kwargs) -> dict:
+        self._count("list_services")
+        self._check_cluster(cluster, "ListServices")
+
+        start = int(nextToken) if nextToken else 0
+        end = start + self.page_size
+        response = {
+            "serviceArns": [elem["serviceArn"] for elem in self.services[start:end]]
+        }
+
+        if end < len(self.services):
+            response["nextToken"] = str(end)
+
+        return response
+
+    def describe_services(self, cluster: str, services: List[str]) -> dict:
+        self._count("describe_services")
+        self._check_cluster(cluster, "DescribeServices")
+
+        if len(services) > 10:
+            raise ValueError("describe_services accepts at most 10 services")
+
+        by_name = {elem["serviceName"]: elem for elem in self.services}
+        by_name.update({elem["serviceArn"]: elem for elem in self.services})
+
+        return {
+            "services": [by_name[name] for name in services if name in by_name],
+            "failures": [
+                {"arn": name, "reason": "MISSING"}
+                for name in services
+                if name not in by_name
+            ],
+        }
+
+    def describe_task_definition(self, taskDefinition: str) -> dict:
+        self._count("describe_task_definition")
+
+        return self.task_definitions[taskDefinition]
+
+    def list_tasks(
+        self,
+        cluster: str,
+        serviceName: str = None,
+        nextToken: str = None,
+        **kwargs,
+    ) -> dict:
+        self._count("list_tasks")
+
+        tasks = [
+            elem
+            for elem in self.tasks
+            if serviceName is None or elem["group"] == f"service:{serviceName}"
+        ]
+        start = int(nextToken) if nextToken else 0
+        end = start + self.page_size
+        response = {"taskArns": [elem["taskArn"] for elem in tasks[start:end]]}
+
+        if end < len(tasks):
+            response["nextToken"] = str(end)
+
+        return response
+
+    def describe_tasks(self, cluster: str, tasks: List[str]) -> dict:
+        self._count("describe_tasks")
+
+        if len(tasks) > 100:
+            raise ValueError("describe_tasks accepts at most 100 tasks")
+
+        by_arn = {elem["taskArn"]: elem for elem in self.tasks}
+
+        return {
+            "tasks": [by_arn[arn] for arn in tasks if arn in by_arn],
+            "failures": [],
+        }
+
+
+def get_stub_ecs_client(num_instances: int = 3, page_size: int = 100) -> StubECSClient:
+    task_definition = read_json("tests/assets/task_definition.json")
+
+    return StubECSClient(
+        cluster_name="cluster-prod",
+        container_instances=[
+            get_container_instance_response(
+                arn=f"arn:aws:ecs:eu-west-1:123456789012:container-instance/cluster-prod/{idx:08x}",
+                instance_id=f"i-{idx:017x}",
+            )
+            for idx in range(num_instances)
+        ],
+        services=[
+            {
+                "serviceName": "my-service",
+                "serviceArn": "arn:aws:ecs:eu-west-1:123456789012:service/cluster-prod/my-service",
+                "desiredCount": 2,
+                "taskDefinition": task_definition["taskDefinition"][
+                    "taskDefinitionArn"
+                ],
+            }
+        ],
+        task_definitions=[task_definition],
+        page_size=page_size,
+    )
+
+
 # class get_ecs_service():
 #     def __init__(self, cluster_name: str, ecs_client, service_name: str):
 #         self.cluster_name = cluster_name
@@ -0,0 +1,112 @@
+import unittest
+
+from parameterized import parameterized
+
+from tests.constants import all_attributes, just_enough_attributes
+from tests.helpers import get_service, get_task_definition
+from willy.models import Attribute, ContainerInstance
+from willy.validators import AttributesValidator
+from willy.validators.attribute_index import AttributeIndex
+
+DOCKER_API = "com.amazonaws.ecs.capability.docker-remote-api."
+
+
+def get_instance(arn: str, attributes: list) -> ContainerInstance:
+    return ContainerInstance(
+        arn=arn,
+        cpu_remaining=1024,
+        cpu_total=1024,
+        memory_remaining=1024,
+        memory_total=1024,
+        attributes=attributes,
+        instance_id=f"i-{arn}",
+    )
+
+
+def get_instances():
+    return [
+        get_instance("all", all_attributes),
+        get_instance("just-enough", just_enough_attributes),
+        get_instance(
+            "eu-central-1b",
+            [
+                {"name": "ecs.availability-zone", "value": "eu-central-1b"},
+                {"name": f"{DOCKER_API}1.19"},
+            ],
+        ),
+        get_instance("old-docker", [{"name": f"{DOCKER_API}1.17"}]),
+        get_instance("no-attributes", []),
+    ]
+
+
+class TestAttributeIndex(unittest.TestCase):
+    def test_lookups(self):
+        index = AttributeIndex(get_instances())
+
+        self.assertEqual({0, 1, 2, 3, 4}, index.all)
+        self.assertEqual({4}, index.without_attributes)
+        self.assertEqual(
+            {2}, index.with_value("ecs.availability-zone", "eu-central-1b")
+        )
+        self.assertEqual(set(), index.with_value("ecs.availability-zone", "mars-1a"))
+        self.assertEqual({0, 1, 2, 3}, index.with_version_prefix(DOCKER_API))
+
+    @parameterized.expand(
+        [
+            ("no attributes", [], []),
+            ("all attributes", all_attributes, []),
+            ("one docker version", [{"name": f"{DOCKER_API}1.19"}], []),
+            (
+                "availability zone",
+                [{"name": "ecs.availability-zone", "value": "eu-central-1b"}],
+                [],
+            ),
+            (
+                "missing attribute",
+                [{"name": "com.amazonaws.ecs.capability.ecr-auth"}],
+                [],
+            ),
+            (
+                "availability zone in a list",
+                [],
+                [
+                    {
+                        "type": "memberOf",
+                        "expression": "attribute:ecs.availability-zone in [eu-central-1a, eu-central-1b]",
+                    }
+                ],
+            ),
+            (
+                "availability zone not in a list",
+                [],
+                [
+                    {
+                        "type": "memberOf",
+                        "expression": "attribute:ecs.availability-zone in [us-east-1a, us-east-1b]",
+                    }
+                ],
+            ),
+        ]
+    )
+    def test_candidates_match_check_instance(
+        self, name: str, requires_attributes: list, placement_constraints: list
+    ):
+        instances = get_instances()
+        task_definition = get_task_definition(
+            requires_attributes=requires_attributes,
+            placement_constraints=[
+                Attribute.parse_obj(elem) for elem in placement_constraints
+            ],
+        )
+        service = get_service(task_definition=task_definition)
+        validator = AttributesValidator()
+
+        expected = {
+            position
+            for position, elem in enumerate(instances)
+            if validator.check_instance(None, service, elem) is None
+        }
+
+        self.assertEqual(
+            expected, validator.candidates(AttributeIndex(instances), service)
+        )
@@ -7,6 +7,10 @@ from tests.helpers import get_cluster, get_service, get_task_definition
 from willy.exceptions import MissingECSAttributeException
 from willy.models import TaskDefinition, Cluster, Service, Attribute, ContainerInstance
 from willy.validators import AttributesValidator
+from willy.validators.attributes import (
+    _instance_max_versions,
+    _parse_versioned_attribute,
+)
 
 
 class TestAttributesValidator(unittest.TestCase):
@@ -56,6 +60,14 @@ class TestAttributesValidator(unittest.TestCase):
                 ],
                 [{"name": "com.amazonaws.ecs.capability.docker-remote-api.1.19"}],
             ),
+            (
+                "one node one container one replica docker api version compared as a number",
+                1,
+                1,
+                1,
+                [{"name": "com.amazonaws.ecs.capability.docker-remote-api.1.19"}],
+                [{"name": "com.amazonaws.ecs.capability.docker-remote-api.1.9"}],
+            ),
         ]
     )
     def test_service_fits_on_a_cluster_with(
@@ -139,6 +151,14 @@ class TestAttributesValidator(unittest.TestCase):
                     {"name": "com.amazonaws.ecs.capability.docker-remote-api.1.21"},
                 ],
             ),
+            (
+                "one node one container one replica docker api version compared as a number",
+                1,
+                1,
+                1,
+                [{"name": "com.amazonaws.ecs.capability.docker-remote-api.1.9"}],
+                [{"name": "com.amazonaws.ecs.capability.docker-remote-api.1.19"}],
+            ),
         ]
     )
     def test_service_does_not_fit_on_a_cluster_with(
@@ -695,6 +715,34 @@ class TestAttributesValidator(unittest.TestCase):
         for attr_name in attribute_names:
             self.assertIn(attr_name, verbose_exception)
 
+    @parameterized.expand(
+        [
+            (
+                "docker api",
+                "com.amazonaws.ecs.capability.docker-remote-api.1.19",
+                ("com.amazonaws.ecs.capability.docker-remote-api.", (1, 19)),
+            ),
+            ("not versioned", "com.amazonaws.ecs.capability.ecr-auth", None),
+        ]
+    )
+    def test_parse_versioned_attribute(self, name: str, attribute_name: str, expected):
+        self.assertEqual(expected, _parse_versioned_attribute(attribute_name))
+
+    def test_instance_max_versions(self):
+        container_instance = get_cluster(
+            attributes=[
+                {"name": "com.amazonaws.ecs.capability.docker-remote-api.1.9"},
+                {"name": "com.amazonaws.ecs.capability.docker-remote-api.1.19"},
+                {"name": "com.amazonaws.ecs.capability.docker-remote-api.1.17"},
+                {"name": "com.amazonaws.ecs.capability.ecr-auth"},
+            ]
+        ).container_instances[0]
+
+        self.assertEqual(
+            {"com.amazonaws.ecs.capability.docker-remote-api.": (1, 19)},
+            _instance_max_versions(container_instance),
+        )
+
 
 # ovde dodaj test koji priverava da je instance-type g4dn.xlarge i moras taj atribut staviti na cluster
 # dodaj test koji proverava da li ima dovoljno gpuova, tu moras container instance model promeniti
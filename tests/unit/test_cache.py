@@ -0,0 +1,122 @@
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from tests.helpers import get_stub_ecs_client
+from willy.main import cache_namespace
+from willy.services import CachedECSClient, ECSService, ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _ecs_service(self, ecs_client, max_age: float = 60) -> ECSService:
+        return ECSService(
+            ecs_client=CachedECSClient(
+                ecs_client_factory=lambda: ecs_client,
+                cache=ResponseCache(directory=self.directory.name, max_age=max_age),
+                namespace="default/eu-west-1",
+            ),
+            cluster_name="cluster-prod",
+            service_name="my-service",
+        )
+
+    def test_warm_cache_makes_no_calls(self):
+        cold_client = get_stub_ecs_client(num_instances=150)
+        cold = self._ecs_service(cold_client).snapshot
+
+        warm_client = get_stub_ecs_client(num_instances=150)
+        warm = self._ecs_service(warm_client).snapshot
+
+        self.assertEqual(warm_client.calls, {})
+        self.assertEqual(cold_client.calls["describe_container_instances"], 2)
+        self.assertEqual(cold, warm)
+
+    def test_warm_cache_does_not_build_the_client(self):
+        self._ecs_service(get_stub_ecs_client()).snapshot
+        factory = mock.Mock()
+
+        ECSService(
+            ecs_client=CachedECSClient(
+                ecs_client_factory=factory,
+                cache=ResponseCache(directory=self.directory.name),
+                namespace="default/eu-west-1",
+            ),
+            cluster_name="cluster-prod",
+            service_name="my-service",
+        ).snapshot
+
+        factory.assert_not_called()
+
+    def test_expired_entries_are_not_used(self):
+        self._ecs_service(get_stub_ecs_client()).snapshot
+
+        ecs_client = get_stub_ecs_client()
+        self._ecs_service(ecs_client, max_age=0).snapshot
+
+        self.assertEqual(ecs_client.calls["describe_clusters"], 1)
+
+    def test_oldest_entries_are_evicted(self):
+        cache = ResponseCache(directory=self.directory.name, max_entries=3)
+
+        for idx in range(5):
+            cache.put(f"key-{idx}", {"idx": idx})
+            # mtime resolution on some file systems is coarse, so entries are explicitly aged
+            written_at = time.time() - 10 + idx
+            os.utime(cache._path(f"key-{idx}"), (written_at, written_at))
+
+        cache.evict()
+
+        self.assertIsNone(cache.get("key-0"))
+        self.assertIsNone(cache.get("key-1"))
+        self.assertEqual(cache.get("key-4"), {"idx": 4})
+        self.assertEqual(len(os.listdir(self.directory.name)), 3)
+
+    def test_evicts_on_the_first_and_every_nth_write(self):
+        cache = ResponseCache(directory=self.directory.name, evict_every=10)
+
+        with mock.patch.object(cache, "evict") as evict:
+            for idx in range(25):
+                cache.put(f"key-{idx}", {"idx": idx})
+
+        self.assertEqual(3, evict.call_count)
+
+    def test_concurrent_writes_of_the_same_key(self):
+        cache = ResponseCache(directory=self.directory.name)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda idx: cache.put("key", {"idx": idx}), range(64)))
+
+        self.assertIn(cache.get("key")["idx"], range(64))
+        self.assertEqual(["key.json"], os.listdir(self.directory.name))
+
+    def test_namespace_does_not_resolve_credentials(self):
+        with open(os.path.join(self.directory.name, "config"), "w") as config_file:
+            config_file.write("[default]\nregion = eu-west-1\n")
+            config_file.write("[profile sso]\nregion = us-east-1\nsso_session = corp\n")
+
+        config = {"AWS_CONFIG_FILE": os.path.join(self.directory.name, "config")}
+
+        self.assertEqual(
+            [
+                "default/eu-west-1/-",
+                "sso/us-east-1/-",
+                "default/eu-central-1/-",
+                "default/eu-west-1/AKIAFIRSTACCOUNT",
+                "default/eu-west-1/AKIASECONDACCOUNT",
+            ],
+            [
+                cache_namespace(config),
+                cache_namespace({**config, "AWS_PROFILE": "sso"}),
+                cache_namespace({**config, "AWS_DEFAULT_REGION": "eu-central-1"}),
+                cache_namespace({**config, "AWS_ACCESS_KEY_ID": "AKIAFIRSTACCOUNT"}),
+                cache_namespace({**config, "AWS_ACCESS_KEY_ID": "AKIASECONDACCOUNT"}),
+            ],
+        )
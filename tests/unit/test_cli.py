@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from typing import List
+from unittest import mock
+
+from parameterized import parameterized
+
+from willy.cli import cli
+from willy.defaults import DEFAULT_MAX_AGE
+
+
+def run_cli(argv: List[str], target: str) -> mock.Mock:
+    """Runs the CLI with `argv` and returns the mock that replaced `target` in willy.main."""
+    with mock.patch.object(sys, "argv", ["willy"] + argv), mock.patch(
+        f"willy.main.{target}"
+    ) as function:
+        cli()
+
+    return function
+
+
+class TestCli(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("plan", ["plan", "-c", "prod", "--cpu", "1024", "--memory", "1024"]),
+            ("drain", ["drain", "-c", "prod", "--az", "eu-west-1a"]),
+        ]
+    )
+    def test_fetch_options(self, name: str, argv: List[str]):
+        target = f"will_it_{name}"
+
+        defaults = run_cli(argv, target).call_args.kwargs
+        fresh = run_cli(
+            argv + ["--no-cache", "--max-age", "5", "--backend", "async"], target
+        ).call_args.kwargs
+
+        self.assertEqual(
+            (True, DEFAULT_MAX_AGE, "sync"),
+            (defaults["cache"], defaults["max_age"], defaults["backend"]),
+        )
+        self.assertEqual(
+            (False, 5, "async"), (fresh["cache"], fresh["max_age"], fresh["backend"])
+        )
+
+    def test_desired_count_requires_task_definition_files(self):
+        with mock.patch.object(
+            sys, "argv", ["willy", "-c", "prod", "-s", "web", "--desired-count", "3"]
+        ), mock.patch("sys.stderr"), self.assertRaises(SystemExit):
+            cli()
+
+        function = run_cli(
+            ["-c", "prod", "--task-definition-file", "web.json"],
+            "will_task_definitions_fit",
+        )
+
+        self.assertEqual(1, function.call_args.kwargs["desired_count"])
+
+    def test_snapshot_of_another_format_version_exits(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "cluster.json")
+
+            with open(file_path, "w") as output_file:
+                json.dump({"version": 2, "clusters": []}, output_file)
+
+            # the cluster name is read from the snapshot, or the snapshot is only loaded to fetch the cluster
+            for argv in (
+                ["--snapshot", file_path, "-s", "web"],
+                ["-c", "prod", "--snapshot", file_path, "-s", "web"],
+            ):
+                with mock.patch.object(sys, "argv", ["willy"] + argv):
+                    with self.assertRaisesRegex(SystemExit, "format version 2"):
+                        cli()
@@ -0,0 +1,86 @@
+import unittest
+
+from tests.helpers import get_service, get_task_definition
+from willy.columnar import ColumnarCluster, columnar_available
+from willy.models import Cluster, ContainerInstance
+from willy.validators import CPUValidator, MemoryValidator, ValidationEngine
+
+
+def get_instance(arn: str, cpu: int, memory: int) -> ContainerInstance:
+    return ContainerInstance(
+        arn=arn,
+        cpu_remaining=cpu,
+        cpu_total=2048,
+        memory_remaining=memory,
+        memory_total=4096,
+        attributes=[],
+        instance_id=f"i-{arn}",
+    )
+
+
+def get_mixed_cluster() -> Cluster:
+    return Cluster(
+        name="cluster-prod",
+        arn="arn:aws:ecs:eu-west-1:123456789012:cluster/cluster-prod",
+        container_instances=[
+            get_instance("fits", cpu=512, memory=1024),
+            get_instance("no-cpu", cpu=128, memory=1024),
+            get_instance("no-memory", cpu=512, memory=256),
+            get_instance("exact", cpu=256, memory=256),
+        ],
+    )
+
+
+@unittest.skipUnless(columnar_available(), "NumPy is not installed")
+class TestColumnarCluster(unittest.TestCase):
+    def test_columns_follow_container_instances(self):
+        columns = ColumnarCluster.from_cluster(get_mixed_cluster())
+
+        self.assertEqual(4, len(columns))
+        self.assertEqual(["fits", "no-cpu", "no-memory", "exact"], columns.arns)
+        self.assertEqual([512, 128, 512, 256], columns.cpu_remaining.tolist())
+        self.assertEqual([1024, 1024, 256, 256], columns.memory_remaining.tolist())
+        self.assertEqual([2048] * 4, columns.cpu_total.tolist())
+        self.assertEqual([4096] * 4, columns.memory_total.tolist())
+
+    def test_masks_match_check_instance(self):
+        cluster = get_mixed_cluster()
+        columns = ColumnarCluster.from_cluster(cluster)
+        service = get_service(task_definition=get_task_definition(cpu=256, memory=256))
+
+        for validator in [CPUValidator(), MemoryValidator()]:
+            expected = [
+                validator.check_instance(cluster, service, elem) is None
+                for elem in cluster.container_instances
+            ]
+
+            self.assertEqual(expected, validator.mask(columns, service).tolist())
+
+    def test_select(self):
+        cluster = get_mixed_cluster()
+        columns = ColumnarCluster.from_cluster(cluster)
+        service = get_service(task_definition=get_task_definition(cpu=256, memory=256))
+
+        mask = CPUValidator().mask(columns, service) & MemoryValidator().mask(
+            columns, service
+        )
+
+        self.assertEqual(["fits"], [elem.arn for elem in columns.select(mask)])
+
+    def test_engine_gives_same_result_with_and_without_columns(self):
+        cluster = get_mixed_cluster()
+        service = get_service(task_definition=get_task_definition(cpu=256, memory=256))
+
+        columnar = ValidationEngine(columnar=True).validate(cluster, service)
+        row_wise = ValidationEngine(columnar=False).validate(cluster, service)
+
+        self.assertEqual(row_wise.valid_instances, columnar.valid_instances)
+        self.assertEqual(row_wise.invalid_instances, columnar.invalid_instances)
+
+    def test_engine_builds_columns_once(self):
+        cluster = get_mixed_cluster()
+        engine = ValidationEngine(columnar=True)
+
+        columns = engine.columns(cluster.container_instances)
+
+        self.assertIs(columns, engine.columns(cluster.container_instances))
@@ -0,0 +1,233 @@
+import unittest
+
+from parameterized import parameterized
+
+from tests.helpers import get_service, get_task_definition
+from willy.constraints import (
+    InvalidExpressionError,
+    compile_expression,
+    instance_facts,
+)
+from willy.exceptions import PlacementConstraintException
+from willy.models import Cluster, ContainerInstance, TaskDefinition
+from willy.validators import ValidationEngine
+from willy.validators.attribute_index import AttributeIndex
+
+
+def get_instance(instance_id: str, instance_type: str, zone: str) -> ContainerInstance:
+    return ContainerInstance(
+        arn=f"arn:aws:ecs:eu-west-1:123456789012:container-instance/cluster-prod/{instance_id}",
+        cpu_remaining=1024,
+        cpu_total=1024,
+        memory_remaining=1024,
+        memory_total=1024,
+        attributes=[
+            {"name": "ecs.instance-type", "value": instance_type},
+            {"name": "ecs.availability-zone", "value": zone},
+            {"name": "com.amazonaws.ecs.capability.ecr-auth"},
+        ],
+        instance_id=instance_id,
+    )
+
+
+def get_instances():
+    return [
+        get_instance("i-1", "t3.small", "eu-west-1a"),
+        get_instance("i-2", "t3.large", "eu-west-1b"),
+        get_instance("i-3", "m5.large", "eu-west-1c"),
+    ]
+
+
+def get_task_definition_json(placement_constraints: list) -> dict:
+    return {
+        "taskDefinition": {
+            "taskDefinitionArn": "arn:aws:ecs:eu-west-1:123456789012:task-definition/app:1",
+            "containerDefinitions": [
+                {"name": "app", "cpu": 128, "memory": 128, "portMappings": []}
+            ],
+            "requiresAttributes": [],
+            "placementConstraints": placement_constraints,
+        }
+    }
+
+
+class TestConstraints(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("equals", "attribute:ecs.instance-type == t3.small", ["i-1"]),
+            ("equals without spaces", "attribute:ecs.instance-type==t3.small", ["i-1"]),
+            ("equals word", "attribute:ecs.instance-type equals t3.small", ["i-1"]),
+            ("not equals", "attribute:ecs.instance-type != t3.small", ["i-2", "i-3"]),
+            (
+                "in",
+                "attribute:ecs.instance-type in [t3.small, m5.large]",
+                ["i-1", "i-3"],
+            ),
+            (
+                "not in",
+                "attribute:ecs.instance-type not in [t3.small, m5.large]",
+                ["i-2"],
+            ),
+            ("not_in", "attribute:ecs.instance-type not_in [t3.small]", ["i-2", "i-3"]),
+            ("!in", "attribute:ecs.instance-type !in [t3.small]", ["i-2", "i-3"]),
+            (
+                "quoted list",
+                "attribute:ecs.instance-type in ['t3.small', \"t3.large\"]",
+                ["i-1", "i-2"],
+            ),
+            ("matches", "attribute:ecs.instance-type =~ t3.*", ["i-1", "i-2"]),
+            ("does not match", "attribute:ecs.instance-type !~ t3.*", ["i-3"]),
+            (
+                "exists",
+                "attribute:com.amazonaws.ecs.capability.ecr-auth exists",
+                ["i-1", "i-2", "i-3"],
+            ),
+            ("not exists", "attribute:ecs.gpu !exists", ["i-1", "i-2", "i-3"]),
+            ("instance id", "ec2InstanceId in [i-1, i-3]", ["i-1", "i-3"]),
+            (
+                "and",
+                "attribute:ecs.instance-type =~ t3.* and attribute:ecs.availability-zone != eu-west-1a",
+                ["i-2"],
+            ),
+            (
+                "or",
+                "attribute:ecs.instance-type == m5.large || ec2InstanceId == i-1",
+                ["i-1", "i-3"],
+            ),
+            (
+                "and binds tighter than or",
+                "ec2InstanceId == i-1 or ec2InstanceId == i-2 and attribute:ecs.instance-type == m5.large",
+                ["i-1"],
+            ),
+            (
+                "parentheses",
+                "(ec2InstanceId == i-1 or ec2InstanceId == i-2) && attribute:ecs.instance-type == t3.large",
+                ["i-2"],
+            ),
+            (
+                "task group is not known",
+                "task:group == service:production",
+                ["i-1", "i-2", "i-3"],
+            ),
+        ]
+    )
+    def test_expression(self, name: str, expression: str, expected: list):
+        instances = get_instances()
+        predicate = compile_expression(expression)
+        index = AttributeIndex(instances)
+
+        self.assertEqual(
+            expected,
+            [
+                elem.instance_id
+                for elem in instances
+                if predicate.matches(instance_facts(elem))
+            ],
+        )
+        self.assertEqual(
+            expected,
+            [
+                instances[position].instance_id
+                for position in sorted(predicate.positions(index))
+            ],
+        )
+
+    @parameterized.expand(
+        [
+            ("no operator", "attribute:ecs.instance-type"),
+            ("unknown operator", "attribute:ecs.instance-type is t3.small"),
+            ("unclosed list", "attribute:ecs.instance-type in [t3.small"),
+            ("unclosed parenthesis", "(ec2InstanceId == i-1"),
+            ("dangling and", "ec2InstanceId == i-1 and"),
+        ]
+    )
+    def test_invalid_expression(self, name: str, expression: str):
+        with self.assertRaises(InvalidExpressionError):
+            compile_expression(expression)
+
+    def test_expressions_are_compiled_once(self):
+        expression = "attribute:ecs.instance-type != t3.small"
+
+        self.assertIs(compile_expression(expression), compile_expression(expression))
+
+    def test_task_definition_keeps_expressions_it_can_not_check_as_attributes(self):
+        task_definition = TaskDefinition.parse_obj(
+            get_task_definition_json(
+                [
+                    {
+                        "type": "memberOf",
+                        "expression": "attribute:ecs.instance-type == t3.small",
+                    },
+                    {
+                        "type": "memberOf",
+                        "expression": "attribute:ecs.instance-type != t3.large",
+                    },
+                    {"type": "distinctInstance"},
+                ]
+            )
+        )
+
+        self.assertEqual(
+            [("ecs.instance-type", "t3.small")],
+            [(elem.name, elem.value) for elem in task_definition.placement_constraints],
+        )
+        self.assertEqual(
+            ["attribute:ecs.instance-type != t3.large"],
+            task_definition.constraint_expressions,
+        )
+
+    def test_exists_matches_attributes_with_a_value(self):
+        cluster = Cluster(
+            name="cluster-prod",
+            arn="arn:aws:ecs:eu",
+            container_instances=get_instances(),
+        )
+        task_definition = TaskDefinition.parse_obj(
+            get_task_definition_json(
+                [
+                    {
+                        "type": "memberOf",
+                        "expression": "attribute:ecs.availability-zone exists",
+                    }
+                ]
+            )
+        )
+
+        result = ValidationEngine().validate(
+            cluster=cluster, service=get_service(task_definition=task_definition)
+        )
+
+        self.assertEqual([], task_definition.placement_constraints)
+        self.assertEqual(
+            ["i-1", "i-2", "i-3"],
+            [elem.instance_id for elem in result.valid_instances],
+        )
+
+    def test_engine_filters_instances_by_expression(self):
+        cluster = Cluster(
+            name="cluster-prod",
+            arn="arn:aws:ecs:eu",
+            container_instances=get_instances(),
+        )
+        task_definition = get_task_definition(cpu=128, memory=128)
+        task_definition.constraint_expressions = ["attribute:ecs.instance-type !~ t3.*"]
+
+        result = ValidationEngine().validate(
+            cluster=cluster, service=get_service(task_definition=task_definition)
+        )
+
+        self.assertEqual(["i-3"], [elem.instance_id for elem in result.valid_instances])
+
+    def test_engine_raises_when_no_instance_meets_the_expression(self):
+        cluster = Cluster(
+            name="cluster-prod",
+            arn="arn:aws:ecs:eu",
+            container_instances=get_instances(),
+        )
+        service = get_service(task_definition=get_task_definition(cpu=128, memory=128))
+        service.constraint_expressions = [
+            "attribute:ecs.instance-type == c5.large or ec2InstanceId == i-9"
+        ]
+
+        with self.assertRaises(PlacementConstraintException):
+            ValidationEngine().validate(cluster=cluster, service=service)
@@ -0,0 +1,124 @@
+import unittest
+
+from tests.helpers import (
+    get_cluster_of,
+    get_ecs_service,
+    get_instances,
+    get_service,
+    get_stub_ecs_client,
+    get_task_definition,
+    read_json,
+)
+from willy.main import check_service
+from willy.models import Service, TaskDefinition
+from willy.placement import PlacementSimulator
+
+
+def get_distinct_service(
+    desired_count: int, occupied_instances: list = None
+) -> Service:
+    task_definition = get_task_definition(cpu=128, memory=128)
+    task_definition.distinct_instance = True
+    service = get_service(task_definition=task_definition, desired_count=desired_count)
+    service.occupied_instances = occupied_instances or []
+
+    return service
+
+
+class TestDistinctInstance(unittest.TestCase):
+    def test_task_definition_with_distinct_instance(self):
+        task_definition_json = read_json("tests/assets/task_definition.json")
+        task_definition_json["taskDefinition"]["placementConstraints"] = [
+            {"type": "distinctInstance"}
+        ]
+
+        task_definition = TaskDefinition.parse_obj(task_definition_json)
+
+        self.assertTrue(task_definition.distinct_instance)
+        self.assertEqual([], task_definition.constraint_expressions)
+
+    def test_service_with_distinct_instance(self):
+        service = Service.parse_obj(
+            {
+                "services": [
+                    {
+                        "serviceName": "my-service",
+                        "serviceArn": "arn:aws:ecs:eu-west-1:123456789012:service/cluster-prod/my-service",
+                        "desiredCount": 2,
+                        "placementConstraints": [{"type": "distinctInstance"}],
+                    }
+                ]
+            }
+        )
+
+        self.assertTrue(service.requires_distinct_instance)
+
+    def test_occupied_instances_are_fetched_for_distinct_services_only(self):
+        ecs_client = get_stub_ecs_client()
+        ecs_client.services[0]["placementConstraints"] = [{"type": "distinctInstance"}]
+        ecs_client.tasks = [
+            {
+                "taskArn": f"arn:aws:ecs:eu-west-1:123456789012:task/cluster-prod/{idx}",
+                "group": "service:my-service",
+                "containerInstanceArn": ecs_client.container_instances[0][
+                    "containerInstanceArn"
+                ],
+            }
+            for idx in range(2)
+        ]
+
+        svc = get_ecs_service(
+            cluster_name="cluster-prod",
+            ecs_client=ecs_client,
+            service_name="my-service",
+        )
+
+        self.assertEqual(
+            [ecs_client.container_instances[0]["containerInstanceArn"]],
+            svc.service.occupied_instances,
+        )
+        self.assertEqual(1, ecs_client.calls["list_tasks"])
+        self.assertEqual(1, ecs_client.calls["describe_tasks"])
+
+    def test_simulator_places_one_replica_per_instance(self):
+        instances = get_instances(3)
+        service = get_distinct_service(
+            desired_count=5, occupied_instances=[instances[0].arn]
+        )
+        simulator = PlacementSimulator(instances)
+
+        result = simulator.place(service)
+
+        self.assertEqual(2, result.placed_count)
+        self.assertEqual({instances[1].arn: 1, instances[2].arn: 1}, result.placements)
+        # instances used by the first call are occupied for the next one
+        self.assertEqual(0, simulator.place(service).placed_count)
+
+    def test_check_service_counts_eligible_instances(self):
+        cluster = get_cluster_of(*get_instances(3))
+        service = get_distinct_service(
+            desired_count=3,
+            occupied_instances=[cluster.container_instances[0].arn],
+        )
+
+        result = check_service(cluster=cluster, service=service)
+
+        self.assertFalse(result.success)
+        self.assertEqual(2, result.placement.placed_count)
+        self.assertIn("Only 2 of 3 replica(s) can be placed", result.message)
+
+    def test_check_service_with_enough_instances(self):
+        cluster = get_cluster_of(*get_instances(3))
+
+        for simulate in (False, True):
+            result = check_service(
+                cluster=cluster,
+                service=get_distinct_service(desired_count=3),
+                simulate=simulate,
+            )
+
+            self.assertTrue(result.success)
+            self.assertEqual(
+                {elem.arn: 1 for elem in cluster.container_instances},
+                result.placement.placements,
+            )
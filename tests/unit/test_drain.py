@@ -0,0 +1,248 @@
+import unittest
+
+from parameterized import parameterized
+
+from tests.helpers import (
+    DOCKER_API_19,
+    get_cluster_of,
+    get_ecs_service,
+    get_instance,
+    get_named_service,
+    get_stub_ecs_client,
+    get_task_definition,
+    read_json,
+)
+from willy.main import check_drain
+from willy.models import Service, Task
+from willy.placement import TaskInventory, select_instances, simulate_drain
+from willy.services import SnapshotECSClient, capture_snapshot
+
+
+def get_az_instance(arn: str, az: str, cpu: int = 512):
+    return get_instance(
+        arn,
+        cpu=cpu,
+        attributes=[DOCKER_API_19, {"name": "ecs.availability-zone", "value": az}],
+    )
+
+
+def get_task(
+    idx: int, container_instance_arn: str, service: str = None, revision: str = ""
+) -> Task:
+    return Task(
+        arn=f"task-{idx}",
+        container_instance_arn=container_instance_arn,
+        group=f"service:{service}" if service else "family:batch",
+        task_definition_arn=revision,
+    )
+
+
+CLUSTER = get_cluster_of(
+    get_az_instance("a", "eu-west-1a"),
+    get_az_instance("b", "eu-west-1b"),
+    get_az_instance("c", "eu-west-1c", cpu=0),
+)
+INVENTORY = TaskInventory(
+    [
+        get_task(0, "a", "web"),
+        get_task(1, "c", "web"),
+        get_task(2, "c", "web"),
+        get_task(3, "c"),
+        get_task(4, "a", "daemon"),
+        get_task(5, "b", "daemon"),
+        get_task(6, "c", "daemon"),
+    ]
+)
+SERVICES = [
+    get_named_service("web", 3),
+    get_named_service("daemon", 3, cpu=64, memory=64, distinct=True),
+]
+
+
+class TestDrain(unittest.TestCase):
+    def test_inventory(self):
+        self.assertEqual(
+            {"web": 2, "daemon": 1, None: 1}, dict(INVENTORY.displaced({"c"}))
+        )
+        self.assertEqual({"a", "b", "c"}, INVENTORY.instances_by_service["daemon"])
+
+    @parameterized.expand(
+        [
+            ("instance ID", {"instances": ["i-b"]}, ["b"]),
+            ("ARN", {"instances": ["a", "i-c"]}, ["a", "c"]),
+            ("availability zone", {"availability_zones": ["eu-west-1c"]}, ["c"]),
+            # the instances with the most tasks first
+            ("percent", {"percent": 34}, ["a", "c"]),
+            ("nothing", {"instances": ["i-unknown"]}, []),
+        ]
+    )
+    def test_select_instances(self, name: str, kwargs: dict, expected: list):
+        self.assertEqual(
+            expected,
+            [
+                elem.arn
+                for elem in select_instances(
+                    cluster=CLUSTER, inventory=INVENTORY, **kwargs
+                )
+            ],
+        )
+
+    def test_tasks_are_rehomed(self):
+        result = simulate_drain(
+            cluster=CLUSTER,
+            services=[SERVICES[0]],
+            inventory=INVENTORY,
+            drained=[CLUSTER.container_instances[2]],
+        )
+
+        self.assertEqual({"web": 2, "daemon": 1}, result.displaced)
+        self.assertEqual(1, result.standalone_tasks)
+        self.assertEqual(2, result.placed["web"])
+        # daemon is not one of the given services, so its task can not be re-homed
+        self.assertEqual({"daemon": 1}, result.unplaced)
+
+    def test_distinct_instance_does_not_move_onto_its_own_instances(self):
+        result = simulate_drain(
+            cluster=CLUSTER,
+            services=SERVICES,
+            inventory=INVENTORY,
+            drained=[CLUSTER.container_instances[2]],
+        )
+
+        self.assertEqual({"web": 2, "daemon": 0}, result.placed)
+        self.assertFalse(result.success)
+
+    def test_not_enough_capacity(self):
+        result = check_drain(
+            cluster=CLUSTER,
+            services=SERVICES,
+            inventory=INVENTORY,
+            drained=CLUSTER.container_instances[:2],
+        )
+
+        self.assertFalse(result.success)
+        self.assertIn("web (1 of 1 task(s))", result.message)
+        self.assertEqual(["c"], [elem.arn for elem in result.valid_instances])
+
+    def test_check_drain(self):
+        result = check_drain(
+            cluster=CLUSTER,
+            services=SERVICES,
+            inventory=TaskInventory(INVENTORY.tasks + [get_task(7, "b", "web")]),
+            drained=[CLUSTER.container_instances[1]],
+        )
+
+        self.assertFalse(result.success)
+        self.assertIn("daemon (1 of 1 task(s))", result.message)
+
+    def test_check_drain_success(self):
+        result = check_drain(
+            cluster=CLUSTER,
+            services=SERVICES,
+            inventory=TaskInventory([get_task(0, "b", "web"), get_task(1, "b")]),
+            drained=[CLUSTER.container_instances[1]],
+        )
+
+        self.assertTrue(result.success)
+        self.assertIn("All 1 task(s) of 1 service(s)", result.message)
+        self.assertIn("1 task(s) not started by a service", result.message)
+
+    def test_daemon_services_are_not_rehomed(self):
+        daemon = Service.parse_obj(
+            {
+                "services": [
+                    {
+                        "serviceName": "agent",
+                        "serviceArn": "arn:aws:ecs:eu-west-1:123456789012:service/cluster-prod/agent",
+                        "desiredCount": 3,
+                        "schedulingStrategy": "DAEMON",
+                    }
+                ]
+            }
+        )
+        daemon.task_definition = get_task_definition(cpu=512, memory=512)
+
+        result = check_drain(
+            cluster=CLUSTER,
+            services=[SERVICES[0], daemon],
+            inventory=TaskInventory(
+                [get_task(0, "c", "web"), get_task(1, "c", "agent")]
+            ),
+            drained=[CLUSTER.container_instances[2]],
+        )
+
+        self.assertTrue(daemon.is_daemon)
+        self.assertTrue(result.success)
+        self.assertEqual({"web": 1}, result.drain.displaced)
+        self.assertEqual(1, result.drain.daemon_tasks)
+        self.assertIn("1 task(s) of daemon services", result.message)
+
+    def test_tasks_are_sized_by_their_running_revision(self):
+        inventory = TaskInventory(
+            [get_task(0, "c", "web", "web:1"), get_task(1, "c", "web", "web:2")]
+        )
+
+        result = simulate_drain(
+            cluster=CLUSTER,
+            services=[SERVICES[0]],
+            inventory=inventory,
+            drained=[CLUSTER.container_instances[2]],
+            task_definitions={"web:1": get_task_definition(cpu=1024, memory=256)},
+        )
+
+        # web:2 is not known and is sized by the current task definition of the service
+        self.assertEqual({"web": 2}, result.displaced)
+        self.assertEqual({"web": 1}, result.placed)
+        self.assertEqual({"web": 1}, result.unplaced)
+
+    def test_tasks_are_fetched_and_captured(self):
+        ecs_client = get_stub_ecs_client()
+        # the last task still runs the previous revision, as during a deployment
+        previous = read_json("tests/assets/task_definition.json")
+        previous["taskDefinition"]["taskDefinitionArn"] = previous["taskDefinition"][
+            "taskDefinitionArn"
+        ].replace(":209", ":208")
+        ecs_client.task_definitions[previous["taskDefinition"]["taskDefinitionArn"]] = (
+            previous
+        )
+        revisions = [
+            "",
+            *list(ecs_client.task_definitions),
+        ]
+        ecs_client.tasks = [
+            {
+                "taskArn": f"arn:aws:ecs:eu-west-1:123456789012:task/cluster-prod/{idx}",
+                "group": "service:my-service" if idx else "family:batch",
+                "containerInstanceArn": ecs_client.container_instances[idx][
+                    "containerInstanceArn"
+                ],
+                "taskDefinitionArn": revisions[idx],
+            }
+            for idx in range(3)
+        ]
+
+        svc = get_ecs_service(
+            cluster_name="cluster-prod", ecs_client=ecs_client, service_name=None
+        )
+        svc.with_tasks = True
+
+        self.assertEqual(3, len(svc.snapshot.tasks))
+        self.assertEqual(
+            [None, "my-service", "my-service"],
+            [elem.service_name for elem in svc.snapshot.tasks],
+        )
+
+        offline = get_ecs_service(
+            cluster_name="cluster-prod",
+            ecs_client=SnapshotECSClient(
+                capture_snapshot(ecs_client=ecs_client, cluster_name="cluster-prod")
+            ),
+            service_name=None,
+        )
+        offline.with_tasks = True
+
+        self.assertEqual(svc.snapshot.tasks, offline.snapshot.tasks)
+        self.assertEqual(revisions[1:], list(svc.snapshot.task_definitions))
+        self.assertEqual(
+            svc.snapshot.task_definitions, offline.snapshot.task_definitions
+        )
@@ -0,0 +1,38 @@
+import asyncio
+import unittest
+
+from tests.helpers import get_stub_ecs_client
+from willy.services import AsyncECSService
+
+
+class TestAsyncECSService(unittest.TestCase):
+    def test_refresh_async_builds_the_same_snapshot(self):
+        ecs_client = get_stub_ecs_client(num_instances=250)
+        svc = AsyncECSService(
+            ecs_client=ecs_client,
+            cluster_name="cluster-prod",
+            service_name="my-service",
+        )
+
+        snapshot = asyncio.run(svc.refresh_async())
+
+        self.assertIs(svc.snapshot, snapshot)
+        self.assertEqual(snapshot.cluster.name, "cluster-prod")
+        self.assertEqual(snapshot.service.name, "my-service")
+        self.assertEqual(
+            [elem.arn for elem in snapshot.cluster.container_instances],
+            [elem["containerInstanceArn"] for elem in ecs_client.container_instances],
+        )
+        self.assertEqual(ecs_client.calls["describe_container_instances"], 3)
+
+    def test_sync_surface(self):
+        ecs_client = get_stub_ecs_client()
+        svc = AsyncECSService(
+            ecs_client=ecs_client,
+            cluster_name="cluster-prod",
+            service_name="my-service",
+        )
+
+        self.assertEqual(svc.service.desired_count, 2)
+        self.assertEqual(len(svc.cluster.container_instances), 3)
+        self.assertEqual(ecs_client.calls["describe_clusters"], 1)
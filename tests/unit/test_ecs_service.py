@@ -0,0 +1,150 @@
+import unittest
+from unittest import mock
+
+from tests.helpers import (
+    get_container_instance_response,
+    get_ecs_service,
+    get_stub_ecs_client,
+)
+from willy.main import check_services, will_it_fit
+from willy.models import Snapshot
+from willy.services import ECSService, ServiceNotFoundError
+
+
+class TestECSService(unittest.TestCase):
+    def test_snapshot_is_fetched_once(self):
+        ecs_client = get_stub_ecs_client()
+        svc = get_ecs_service(
+            cluster_name="cluster-prod",
+            ecs_client=ecs_client,
+            service_name="my-service",
+        )
+
+        for _ in range(4):
+            self.assertEqual(svc.cluster.name, "cluster-prod")
+            self.assertEqual(svc.service.desired_count, 2)
+
+        self.assertIsInstance(svc.snapshot, Snapshot)
+        self.assertEqual(len(svc.cluster.container_instances), 3)
+        self.assertEqual(
+            ecs_client.calls,
+            {
+                "describe_clusters": 1,
+                "list_container_instances": 1,
+                "describe_container_instances": 1,
+                "describe_services": 1,
+                "describe_task_definition": 1,
+            },
+        )
+
+    def test_refresh_reloads_the_snapshot(self):
+        ecs_client = get_stub_ecs_client()
+        svc = get_ecs_service(
+            cluster_name="cluster-prod",
+            ecs_client=ecs_client,
+            service_name="my-service",
+        )
+        first = svc.snapshot
+
+        ecs_client.container_instances.pop()
+        second = svc.refresh()
+
+        self.assertIsNot(first, second)
+        self.assertIs(svc.snapshot, second)
+        self.assertEqual(len(first.cluster.container_instances), 3)
+        self.assertEqual(len(second.cluster.container_instances), 2)
+        self.assertEqual(ecs_client.calls["describe_clusters"], 2)
+
+    def test_missing_service_raises(self):
+        svc = get_ecs_service(
+            cluster_name="cluster-prod",
+            ecs_client=get_stub_ecs_client(),
+            service_name="other-service",
+        )
+
+        with self.assertRaisesRegex(ServiceNotFoundError, "other-service"):
+            svc.snapshot
+
+    def test_missing_service_exits_the_command(self):
+        with mock.patch(
+            "willy.main.get_ecs_client", return_value=get_stub_ecs_client()
+        ), mock.patch("willy.main.get_task_definition_cache", return_value=None):
+            with self.assertRaisesRegex(SystemExit, "other-service"):
+                will_it_fit(service_name="other-service", cluster_name="cluster-prod")
+
+    def test_container_instances_are_paginated_and_batched(self):
+        ecs_client = get_stub_ecs_client(num_instances=1050, page_size=100)
+        svc = get_ecs_service(
+            cluster_name="cluster-prod",
+            ecs_client=ecs_client,
+            service_name="my-service",
+        )
+
+        instances = svc.cluster.container_instances
+
+        self.assertEqual(len(instances), 1050)
+        self.assertEqual(
+            [elem.arn for elem in instances],
+            [elem["containerInstanceArn"] for elem in ecs_client.container_instances],
+        )
+        self.assertEqual(ecs_client.calls["list_container_instances"], 11)
+        self.assertEqual(ecs_client.calls["describe_container_instances"], 11)
+
+    def test_services_are_batched_and_task_definitions_deduplicated(self):
+        ecs_client = get_stub_ecs_client()
+        template = ecs_client.services[0]
+        ecs_client.services = [
+            dict(
+                template,
+                serviceName=f"service-{idx}",
+                serviceArn=f"{template['serviceArn']}-{idx}",
+            )
+            for idx in range(25)
+        ]
+        svc = ECSService(
+            ecs_client=ecs_client, cluster_name="cluster-prod", all_services=True
+        )
+
+        results = check_services(svc)
+
+        self.assertEqual(len(svc.services), 25)
+        self.assertEqual(list(results), [f"service-{idx}" for idx in range(25)])
+        self.assertEqual(ecs_client.calls["describe_services"], 3)
+        self.assertEqual(ecs_client.calls["describe_task_definition"], 1)
+        self.assertEqual(ecs_client.calls["describe_clusters"], 1)
+        self.assertIs(svc.services[0].task_definition, svc.services[1].task_definition)
+
+    def test_refresh_instances_reuses_unchanged_instances(self):
+        ecs_client = get_stub_ecs_client(num_instances=3)
+        svc = get_ecs_service(
+            cluster_name="cluster-prod",
+            ecs_client=ecs_client,
+            service_name="my-service",
+        )
+        before = svc.cluster.container_instances
+        service = svc.service
+
+        removed = ecs_client.container_instances.pop(0)
+        ecs_client.container_instances[0] = get_container_instance_response(
+            arn=ecs_client.container_instances[0]["containerInstanceArn"],
+            instance_id=ecs_client.container_instances[0]["ec2InstanceId"],
+            cpu_remaining=512,
+            version=2,
+        )
+        ecs_client.container_instances.append(
+            get_container_instance_response(
+                arn="arn:aws:ecs:eu-west-1:123456789012:container-instance/cluster-prod/new",
+                instance_id="i-new",
+            )
+        )
+
+        after = svc.refresh_instances().cluster.container_instances
+
+        self.assertNotIn(removed["containerInstanceArn"], [elem.arn for elem in after])
+        self.assertEqual(after[0].cpu_remaining, 512)
+        self.assertEqual(after[0].version, 2)
+        self.assertIs(after[1], before[2])
+        self.assertEqual(after[2].instance_id, "i-new")
+        self.assertIs(svc.service, service)
+        self.assertEqual(ecs_client.calls["describe_clusters"], 1)
+        self.assertEqual(ecs_client.calls["describe_services"], 1)
@@ -0,0 +1,78 @@
+import unittest
+
+from tests.helpers import StubECSClient, get_stub_ecs_client
+from willy.fleet import report, scan_fleet
+from willy.models import FleetTarget
+
+
+class TestFleet(unittest.TestCase):
+    def test_parse_target(self):
+        self.assertEqual(
+            FleetTarget.parse_str("cluster-prod:eu-west-1:prod"),
+            FleetTarget(cluster="cluster-prod", region="eu-west-1", profile="prod"),
+        )
+        self.assertEqual(
+            FleetTarget.parse_str("cluster-prod"), FleetTarget(cluster="cluster-prod")
+        )
+
+    def test_scan_fleet(self):
+        clients = {
+            "cluster-prod": get_stub_ecs_client(),
+            "cluster-dev": StubECSClient(cluster_name="other-cluster"),
+        }
+        targets = [
+            FleetTarget(cluster="cluster-prod", region="eu-west-1"),
+            FleetTarget(cluster="cluster-dev", region="eu-central-1"),
+        ]
+
+        results = scan_fleet(
+            targets=targets,
+            processes=2,
+            ecs_client_factory=lambda target: clients[target.cluster],
+        )
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].target, targets[0])
+        self.assertEqual(results[0].service, "my-service")
+        self.assertEqual(results[1].target, targets[1])
+        self.assertFalse(results[1].result.success)
+        self.assertIn("does not exist", results[1].result.message)
+
+    def test_scan_fleet_service_deleted_while_scanning(self):
+        deleted = get_stub_ecs_client()
+        # the service is listed, then deleted before it is described
+        deleted.describe_services = lambda cluster, services: {
+            "services": [],
+            "failures": [{"arn": name, "reason": "MISSING"} for name in services],
+        }
+        clients = {"eu-west-1": deleted, "eu-central-1": get_stub_ecs_client()}
+        targets = [
+            FleetTarget(cluster="cluster-prod", region="eu-west-1"),
+            FleetTarget(cluster="cluster-prod", region="eu-central-1"),
+        ]
+
+        results = scan_fleet(
+            targets=targets,
+            processes=1,
+            ecs_client_factory=lambda target: clients[target.region],
+        )
+
+        self.assertEqual([targets[0], targets[1]], [elem.target for elem in results])
+        self.assertFalse(results[0].result.success)
+        self.assertIn("doesn't exist", results[0].result.message)
+        self.assertEqual("my-service", results[1].service)
+
+    def test_scan_fleet_headroom(self):
+        target = FleetTarget(cluster="cluster-prod", region="eu-west-1")
+
+        results = scan_fleet(
+            targets=[target],
+            processes=1,
+            ecs_client_factory=lambda target: get_stub_ecs_client(),
+            headroom=True,
+        )
+
+        self.assertEqual(len(results), 1)
+        self.assertIsNotNone(results[0].result.headroom)
+        self.assertIn("Headroom", report(results, headroom=True))
+        self.assertNotIn("Headroom", report(results))
@@ -0,0 +1,153 @@
+import unittest
+
+from parameterized import parameterized
+
+from tests.helpers import (
+    DOCKER_API_19,
+    get_cluster_of,
+    get_instance,
+    get_service,
+    get_task_definition,
+)
+from willy.headroom import headroom, instance_headroom
+from willy.main import check_headroom
+from willy.models import TaskDefinition
+from willy.validators import ValidationEngine
+
+
+class TestHeadroom(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("limited by CPU", 1024, 4096, 256, 256, None, 4),
+            ("limited by memory", 4096, 1024, 256, 256, None, 3),
+            ("memory must be larger", 4096, 512, 256, 512, None, 0),
+            ("limited by ports", 4096, 4096, 256, 256, 1, 1),
+            ("only memory needed", 0, 1024, 0, 256, None, 3),
+            ("nothing needed", 0, 0, 0, 0, None, None),
+            ("negative remaining", -256, 1024, 256, 256, None, 0),
+        ]
+    )
+    def test_instance_headroom(
+        self,
+        name: str,
+        cpu_remaining: int,
+        memory_remaining: int,
+        cpu: int,
+        memory: int,
+        limit,
+        expected,
+    ):
+        container_instance = get_instance(
+            "instance", cpu=cpu_remaining, memory=memory_remaining
+        )
+
+        self.assertEqual(
+            expected, instance_headroom(container_instance, cpu, memory, limit)
+        )
+
+    @parameterized.expand([("columnar", True), ("per instance", False)])
+    def test_sums_eligible_instances(self, name: str, columnar: bool):
+        cluster = get_cluster_of(
+            get_instance("cpu-bound", cpu=1024, memory=4096),
+            get_instance("memory-bound", cpu=4096, memory=600),
+            get_instance("full", cpu=128),
+            get_instance("no-attributes", attributes=[{"name": "ecs.os-type"}]),
+        )
+        service = get_service(
+            task_definition=get_task_definition(
+                cpu=256, memory=256, requires_attributes=[DOCKER_API_19]
+            ),
+            desired_count=10,
+        )
+
+        result = headroom(cluster, service, engine=ValidationEngine(columnar=columnar))
+
+        self.assertEqual({"cpu-bound": 4, "memory-bound": 2}, result.replicas)
+        self.assertEqual(6, result.additional_replicas)
+
+    @parameterized.expand([("columnar", True), ("per instance", False)])
+    def test_host_ports_allow_one_replica_per_instance(self, name: str, columnar: bool):
+        cluster = get_cluster_of(
+            get_instance("free", cpu=4096, memory=4096),
+            get_instance("taken", cpu=4096, memory=4096, ports=[8080]),
+        )
+        service = get_service(
+            task_definition=get_task_definition(cpu=256, memory=256, ports_tcp=[8080])
+        )
+
+        result = headroom(cluster, service, engine=ValidationEngine(columnar=columnar))
+
+        self.assertEqual({"free": 1}, result.replicas)
+
+    @parameterized.expand(
+        [
+            ("dynamic host port", "bridge", 0),
+            ("awsvpc", "awsvpc", 8080),
+        ]
+    )
+    def test_ports_without_a_static_host_port(
+        self, name: str, network_mode: str, host_port: int
+    ):
+        cluster = get_cluster_of(get_instance("free", cpu=4096, memory=4096))
+        task_definition = TaskDefinition.parse_obj(
+            {
+                "family": "web",
+                "networkMode": network_mode,
+                "containerDefinitions": [
+                    {
+                        "name": "web",
+                        "cpu": 256,
+                        "memory": 256,
+                        "portMappings": [
+                            {"containerPort": 8080, "hostPort": host_port}
+                        ],
+                    }
+                ],
+            }
+        )
+
+        result = headroom(cluster, get_service(task_definition=task_definition))
+
+        self.assertEqual({"free": 15}, result.replicas)
+
+    def test_distinct_instance_skips_occupied_instances(self):
+        cluster = get_cluster_of(
+            get_instance("occupied", cpu=4096, memory=4096),
+            get_instance("free", cpu=4096, memory=4096),
+        )
+        task_definition = get_task_definition(cpu=256, memory=256)
+        task_definition.distinct_instance = True
+        service = get_service(task_definition=task_definition)
+        service.occupied_instances = ["occupied"]
+
+        self.assertEqual({"free": 1}, headroom(cluster, service).replicas)
+
+    def test_unbounded(self):
+        cluster = get_cluster_of(get_instance("instance"))
+        service = get_service(task_definition=get_task_definition(cpu=0, memory=0))
+
+        result = headroom(cluster, service)
+
+        self.assertTrue(result.unbounded)
+        self.assertIsNone(result.additional_replicas)
+
+    def test_check_headroom(self):
+        cluster = get_cluster_of(get_instance("instance", cpu=1024, memory=4096))
+        service = get_service(
+            task_definition=get_task_definition(cpu=256, memory=256), desired_count=2
+        )
+
+        result = check_headroom(cluster=cluster, service=service)
+
+        self.assertTrue(result.success)
+        self.assertEqual(4, result.headroom.additional_replicas)
+        self.assertIn("can run 4 additional replica(s)", result.message)
+
+    def test_check_headroom_without_room(self):
+        cluster = get_cluster_of(get_instance("instance", cpu=128))
+        service = get_service(task_definition=get_task_definition(cpu=256, memory=256))
+
+        result = check_headroom(cluster=cluster, service=service)
+
+        self.assertFalse(result.success)
+        self.assertIn("can run 0 additional replica(s)", result.message)
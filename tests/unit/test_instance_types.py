@@ -0,0 +1,102 @@
+import unittest
+
+from parameterized import parameterized
+
+from tests.helpers import get_cluster_of, get_named_service
+from willy.instance_types import (
+    InstanceTypeCatalog,
+    UnknownInstanceTypeError,
+    load_catalog,
+)
+from willy.models import Attribute
+from willy.placement import plan_capacity
+
+
+class TestInstanceTypes(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("m5.2xlarge", 8, 32768, 4, "x86_64", 0),
+            ("t3.nano", 2, 512, 2, "x86_64", 0),
+            ("c7g.medium", 1, 2048, 2, "arm64", 0),
+            ("g5.12xlarge", 48, 196608, 15, "x86_64", 4),
+            ("p3.2xlarge", 8, 62464, 4, "x86_64", 1),
+        ]
+    )
+    def test_get(
+        self,
+        name: str,
+        vcpus: int,
+        memory: int,
+        max_enis: int,
+        architecture: str,
+        gpus: int,
+    ):
+        instance_type = load_catalog().get(name)
+
+        self.assertEqual(
+            (name, vcpus, memory, max_enis, architecture, gpus), tuple(instance_type)
+        )
+        self.assertEqual(vcpus * 1024, instance_type.ecs_cpu)
+        self.assertLess(instance_type.ecs_memory(), memory)
+
+    def test_unknown_instance_type(self):
+        with self.assertRaises(UnknownInstanceTypeError) as context:
+            load_catalog().get("m5.2xlarg")
+
+        self.assertIn("m5.2xlarge", context.exception.args[0])
+        self.assertNotIn("m5.2xlarg", load_catalog())
+
+    def test_catalog_from_table(self):
+        catalog = InstanceTypeCatalog(
+            "\nsmall.large 2 4096 3 x86_64 0\nbig.large 4 4096 3 arm64 1\n",
+            version="test",
+        )
+
+        self.assertEqual(2, len(catalog))
+        self.assertEqual(
+            ["big.large"],
+            [elem.name for elem in catalog.find(architecture="arm64")],
+        )
+        self.assertEqual(
+            ["small.large", "big.large"],
+            [elem.name for elem in catalog.find(min_memory=4096)],
+        )
+        self.assertEqual([], catalog.find(min_gpus=2))
+
+    def test_ecs_memory(self):
+        instance_type = load_catalog().get("m5.large")
+
+        self.assertEqual(
+            instance_type.ecs_memory() - 256, instance_type.ecs_memory(256)
+        )
+        self.assertEqual(0, instance_type.ecs_memory(instance_type.memory))
+
+    def test_container_instance(self):
+        container_instance = load_catalog().container_instance(
+            "m6g.xlarge", attributes=[Attribute(name="ecs.capability.efs")]
+        )
+
+        self.assertEqual(4096, container_instance.cpu_total)
+        self.assertEqual(4096, container_instance.cpu_remaining)
+        self.assertEqual(
+            load_catalog().get("m6g.xlarge").ecs_memory(),
+            container_instance.memory_total,
+        )
+        self.assertEqual(
+            [
+                ("ecs.instance-type", "m6g.xlarge"),
+                ("ecs.cpu-architecture", "arm64"),
+                ("ecs.capability.efs", None),
+            ],
+            [(elem.name, elem.value) for elem in container_instance.attributes],
+        )
+
+    def test_plan_with_instance_type(self):
+        plan = plan_capacity(
+            get_cluster_of(),
+            [get_named_service("service", 8, cpu=1024, memory=1024)],
+            load_catalog().container_instance("m5.xlarge"),
+        )
+
+        # 4 vCPUs fit four replicas of one vCPU
+        self.assertEqual(2, plan.instances)
@@ -0,0 +1,233 @@
+import time
+import unittest
+
+from parameterized import parameterized
+
+from tests.helpers import get_instances, get_service, get_task_definition
+from willy.main import check_service
+from willy.models import (
+    Attribute,
+    Cluster,
+    PlacementStrategy,
+    Service,
+    TaskDefinition,
+)
+from willy.placement import PlacementSimulator
+
+
+class TestPlacementSimulator(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("all replicas fit", 3, 512, 512, 5, 5),
+            ("limited by cpu", 3, 512, 512, 7, 6),
+            ("limited by memory", 3, 256, 1000, 7, 6),
+            # like the memory validator, more memory than the tasks need must remain
+            ("memory must be larger", 1, 256, 1024, 2, 1),
+            ("no cpu or memory needed", 2, 0, 0, 100, 100),
+        ]
+    )
+    def test_place(
+        self,
+        name: str,
+        num_nodes: int,
+        cpu: int,
+        memory: int,
+        desired_count: int,
+        expected: int,
+    ):
+        service = get_service(
+            task_definition=get_task_definition(cpu=cpu, memory=memory),
+            desired_count=desired_count,
+        )
+
+        result = PlacementSimulator(get_instances(num_nodes)).place(service)
+
+        self.assertEqual(result.placed_count, expected)
+        self.assertEqual(sum(result.placements.values()), expected)
+        self.assertEqual(result.success, expected == desired_count)
+
+    def test_replicas_are_spread(self):
+        service = get_service(
+            task_definition=get_task_definition(cpu=128, memory=128), desired_count=6
+        )
+
+        result = PlacementSimulator(get_instances(3)).place(service)
+
+        self.assertEqual(list(result.placements.values()), [2, 2, 2])
+
+    def test_static_ports_allow_one_replica_per_instance(self):
+        instances = get_instances(3)
+        instances[0] = get_instances(1, ports=[8080])[0]
+        service = get_service(
+            task_definition=get_task_definition(cpu=128, memory=128, ports_tcp=[8080]),
+            desired_count=3,
+        )
+
+        result = PlacementSimulator(instances).place(service)
+
+        self.assertEqual(result.placed_count, 2)
+        self.assertNotIn(instances[0].arn, result.placements)
+
+    def test_capacity_is_shared_between_services(self):
+        simulator = PlacementSimulator(get_instances(2))
+        service = get_service(
+            task_definition=get_task_definition(cpu=512, memory=512), desired_count=3
+        )
+
+        first = simulator.place(service)
+        second = simulator.place(service)
+
+        self.assertEqual(first.placed_count, 3)
+        self.assertEqual(second.placed_count, 1)
+
+    def test_many_replicas_on_many_instances(self):
+        service = get_service(
+            task_definition=get_task_definition(cpu=256, memory=256), desired_count=500
+        )
+        simulator = PlacementSimulator(get_instances(2000))
+
+        start = time.perf_counter()
+        result = simulator.place(service)
+
+        self.assertEqual(result.placed_count, 500)
+        self.assertLess(time.perf_counter() - start, 1)
+
+    def test_check_service_simulates_placement(self):
+        cluster = Cluster(
+            name="cluster-prod",
+            arn="arn:aws:ecs:eu-west-1:123456789012:cluster/cluster-prod",
+            container_instances=get_instances(3),
+        )
+        service = get_service(
+            task_definition=get_task_definition(cpu=512, memory=512), desired_count=6
+        )
+
+        self.assertFalse(check_service(cluster=cluster, service=service).success)
+
+        result = check_service(cluster=cluster, service=service, simulate=True)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.placement.placed_count, 6)
+        self.assertEqual(len(result.valid_instances), 3)
+
+    @parameterized.expand(
+        [
+            ("dynamic host port", "bridge", {"containerPort": 8080, "hostPort": 0}),
+            ("bridge without host port", "bridge", {"containerPort": 8080}),
+            ("awsvpc", "awsvpc", {"containerPort": 8080, "hostPort": 8080}),
+        ]
+    )
+    def test_ports_without_a_static_host_port(
+        self, name: str, network_mode: str, port_mapping: dict
+    ):
+        cluster = Cluster(
+            name="cluster-prod",
+            arn="arn:aws:ecs:eu-west-1:123456789012:cluster/cluster-prod",
+            container_instances=get_instances(1, cpu=4096, memory=8192),
+        )
+        task_definition = TaskDefinition.parse_obj(
+            {
+                "family": "web",
+                "networkMode": network_mode,
+                "containerDefinitions": [
+                    {
+                        "name": "web",
+                        "cpu": 128,
+                        "memory": 128,
+                        "portMappings": [port_mapping],
+                    }
+                ],
+            }
+        )
+        service = get_service(task_definition=task_definition, desired_count=4)
+
+        result = check_service(cluster=cluster, service=service, simulate=True)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.placement.placed_count, 4)
+
+
+class TestPlacementStrategies(unittest.TestCase):
+    def _instances_in_azs(self, azs: list):
+        instances = get_instances(len(azs))
+
+        return [
+            instance.model_copy(
+                update={
+                    "attributes": [
+                        Attribute(name="ecs.availability-zone", value=az),
+                    ]
+                }
+            )
+            for instance, az in zip(instances, azs)
+        ]
+
+    def test_service_placement_strategy_is_parsed(self):
+        service = Service.parse_obj(
+            {
+                "services": [
+                    {
+                        "serviceName": "my-service",
+                        "serviceArn": "arn:aws:ecs:eu-west-1:123456789012:service/my-service",
+                        "desiredCount": 1,
+                        "placementStrategy": [
+                            {
+                                "type": "spread",
+                                "field": "attribute:ecs.availability-zone",
+                            },
+                            {"type": "binpack", "field": "memory"},
+                        ],
+                    }
+                ]
+            }
+        )
+
+        self.assertEqual(
+            service.placement_strategy,
+            [
+                PlacementStrategy(
+                    type="spread", field="attribute:ecs.availability-zone"
+                ),
+                PlacementStrategy(type="binpack", field="memory"),
+            ],
+        )
+
+    def test_binpack_fills_the_fullest_instance_first(self):
+        instances = get_instances(3)
+        instances[1] = instances[1].model_copy(update={"memory_remaining": 1025})
+        service = get_service(
+            task_definition=get_task_definition(cpu=128, memory=256), desired_count=5
+        )
+        service.placement_strategy = [PlacementStrategy(type="binpack", field="memory")]
+
+        result = PlacementSimulator(instances).place(service)
+
+        self.assertEqual(result.placements, {instances[1].arn: 4, instances[0].arn: 1})
+
+    def test_spread_over_availability_zones(self):
+        instances = self._instances_in_azs(
+            ["eu-west-1a", "eu-west-1a", "eu-west-1a", "eu-west-1b"]
+        )
+        service = get_service(
+            task_definition=get_task_definition(cpu=128, memory=128), desired_count=4
+        )
+
+        result = PlacementSimulator(instances).place(service)
+
+        # the default strategy spreads over AZs first, then over instances within an AZ
+        self.assertEqual(result.placements[instances[3].arn], 2)
+        self.assertEqual(
+            sorted(result.placements[elem.arn] for elem in instances[:2]), [1, 1]
+        )
+
+    def test_random_is_reproducible(self):
+        service = get_service(
+            task_definition=get_task_definition(cpu=128, memory=128), desired_count=10
+        )
+        service.placement_strategy = [PlacementStrategy(type="random")]
+
+        first = PlacementSimulator(get_instances(20), seed=1).place(service)
+        second = PlacementSimulator(get_instances(20), seed=1).place(service)
+
+        self.assertEqual(first.placements, second.placements)
+        self.assertEqual(first.placed_count, 10)
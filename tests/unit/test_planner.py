@@ -0,0 +1,148 @@
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from tests.helpers import (
+    DOCKER_API_19,
+    get_cluster_of,
+    get_instance,
+    get_named_service,
+    get_service,
+)
+from willy.columnar import numpy
+from willy.main import check_capacity_plan
+from willy.models import Attribute, TaskDefinition
+from willy.placement import common_attributes, instance_shape, plan_capacity
+
+
+SHAPE = instance_shape(cpu=1024, memory=1024, attributes=[DOCKER_API_19])
+
+
+class TestPlanner(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("packs small replicas", [("small", 4, 512, 500, None, False)], 2, 2),
+            # first-fit-decreasing puts the large replicas first and fills them up with the small ones
+            (
+                "large first",
+                [
+                    ("small", 3, 256, 256, None, False),
+                    ("large", 3, 768, 256, None, False),
+                ],
+                3,
+                3,
+            ),
+            ("host ports", [("ports", 3, 128, 128, [8080], False)], 3, 3),
+            ("distinct instance", [("distinct", 3, 128, 128, None, True)], 3, 3),
+            ("memory bound", [("memory", 5, 128, 600, None, False)], 5, 3),
+            # like the memory validator, more memory than the replicas need must remain
+            ("exact memory fit", [("exact", 2, 256, 512, None, False)], 2, 1),
+        ]
+    )
+    def test_new_instances(
+        self, name: str, services: list, instances: int, lower_bound: int
+    ):
+        services = [
+            get_named_service(
+                name,
+                desired_count,
+                cpu=cpu,
+                memory=memory,
+                ports=ports,
+                distinct=distinct,
+            )
+            for name, desired_count, cpu, memory, ports, distinct in services
+        ]
+
+        # with and without the vectorized search
+        for module in (numpy, None):
+            with mock.patch("willy.placement.planner.numpy", module):
+                plan = plan_capacity(get_cluster_of(), services, SHAPE)
+
+            self.assertEqual(instances, plan.instances)
+            self.assertEqual(lower_bound, plan.lower_bound)
+            self.assertEqual(
+                {elem.name: elem.desired_count for elem in services},
+                {
+                    elem.name: sum(
+                        placement.get(elem.name, 0) for placement in plan.new_instances
+                    )
+                    for elem in services
+                },
+            )
+
+    def test_dynamic_host_ports_share_instances(self):
+        task_definition = TaskDefinition.parse_obj(
+            {
+                "family": "web",
+                "networkMode": "bridge",
+                "containerDefinitions": [
+                    {
+                        "name": "web",
+                        "cpu": 128,
+                        "memory": 128,
+                        "portMappings": [{"containerPort": 8080, "hostPort": 0}],
+                    }
+                ],
+            }
+        )
+        service = get_service(task_definition=task_definition, desired_count=4)
+
+        self.assertEqual(1, plan_capacity(get_cluster_of(), [service], SHAPE).instances)
+
+    def test_uses_free_capacity_of_the_cluster_first(self):
+        cluster = get_cluster_of(
+            get_instance("first", cpu=512, memory=4096),
+            get_instance("second", cpu=512, memory=4096),
+        )
+        service = get_named_service("service", 6)
+
+        plan = plan_capacity(cluster, [service], SHAPE)
+
+        self.assertEqual({"service": 4}, plan.existing)
+        self.assertEqual([{"service": 2}], plan.new_instances)
+
+    def test_reports_services_that_can_not_run_on_the_shape(self):
+        services = [
+            get_named_service("too-large", 1, cpu=2048),
+            get_named_service(
+                "missing-attribute",
+                1,
+                requires_attributes=[{"name": "ecs.capability.efs"}],
+            ),
+            get_named_service("fits", 2),
+        ]
+
+        plan = plan_capacity(get_cluster_of(), services, SHAPE)
+
+        self.assertFalse(plan.success)
+        self.assertEqual({"too-large", "missing-attribute"}, set(plan.unplaceable))
+        self.assertEqual([{"fits": 2}], plan.new_instances)
+
+    def test_common_attributes(self):
+        shared = {"name": "ecs.capability.efs"}
+
+        self.assertEqual(
+            [Attribute(name="ecs.capability.efs")],
+            common_attributes(
+                [
+                    get_instance("first", attributes=[shared, DOCKER_API_19]),
+                    get_instance(
+                        "second", attributes=[{"name": "ecs.os-type"}, shared]
+                    ),
+                ]
+            ),
+        )
+        self.assertEqual([], common_attributes([]))
+
+    def test_check_capacity_plan(self):
+        result = check_capacity_plan(
+            cluster=get_cluster_of(),
+            services=[get_named_service("service", 4, cpu=512, memory=500)],
+            instance=SHAPE,
+        )
+
+        self.assertTrue(result.success)
+        self.assertEqual(2, result.capacity_plan.instances)
+        self.assertIn("Add 2 container instance(s)", result.message)
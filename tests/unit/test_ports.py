@@ -0,0 +1,53 @@
+import unittest
+
+from parameterized import parameterized
+
+from tests.helpers import get_cluster, get_task_definition_from_json
+from willy.models import (
+    ContainerInstance,
+    mask_to_ports,
+    port_range_to_mask,
+    ports_to_mask,
+)
+
+
+class TestPortMasks(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("no ports", [], []),
+            ("single port", [22], [22]),
+            ("unsorted with duplicates", [8080, 22, 8080], [22, 8080]),
+            ("consecutive ports", [80, 81, 82, 85], [80, 81, 82, 85]),
+            ("lowest and highest port", [0, 65535], [0, 65535]),
+        ]
+    )
+    def test_ports_round_trip(self, name: str, ports: list, expected: list):
+        self.assertEqual(expected, mask_to_ports(ports_to_mask(ports)))
+
+    def test_range_mask_is_the_same_as_its_ports(self):
+        self.assertEqual(
+            ports_to_mask(range(1024, 5001)), port_range_to_mask(1024, 5000)
+        )
+
+    def test_container_instance_mask_covers_tcp_and_udp(self):
+        container_instance = get_cluster(ports=[22, 80]).container_instances[0]
+        container_instance = ContainerInstance.model_validate(
+            container_instance.model_dump() | {"ports_udp": [53]}
+        )
+
+        self.assertEqual([22, 53, 80], mask_to_ports(container_instance.ports_mask))
+
+    def test_container_instance_mask_is_not_serialized(self):
+        container_instance = get_cluster(ports=[22]).container_instances[0]
+
+        self.assertNotIn("ports_mask", container_instance.model_dump())
+
+    def test_task_definition_mask_from_port_ranges(self):
+        task_definition = get_task_definition_from_json(
+            "tests/assets/port_range_task_definition.json"
+        )
+
+        self.assertEqual(
+            sorted(task_definition.all_ports),
+            mask_to_ports(task_definition.ports_mask),
+        )
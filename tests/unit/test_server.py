@@ -0,0 +1,145 @@
+import json
+import threading
+import unittest
+from unittest import mock
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from tests.helpers import get_stub_ecs_client, read_json
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from willy.server import CheckServer, SnapshotStore
+
+
+class TestServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ecs_client = get_stub_ecs_client()
+        cls.store = SnapshotStore(ecs_client=cls.ecs_client, refresh_interval=3600)
+        cls.server = CheckServer(("127.0.0.1", 0), store=cls.store)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _post(self, body: dict):
+        request = Request(
+            f"http://127.0.0.1:{self.server.server_address[1]}/check",
+            data=json.dumps(body).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+
+        try:
+            with urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as exc:
+            return exc.code, json.loads(exc.read())
+
+    def test_check_service(self):
+        for _ in range(3):
+            status, body = self._post(
+                {"cluster": "cluster-prod", "service": "my-service"}
+            )
+
+            self.assertEqual(status, 200)
+            self.assertFalse(body["success"])
+            self.assertIn("my-service", body["message"])
+
+        # the snapshot is kept in memory between requests
+        self.assertEqual(self.ecs_client.calls["describe_clusters"], 1)
+
+    def test_check_task_definition(self):
+        task_definition = read_json("tests/assets/task_definition.json")
+        task_definition["taskDefinition"]["containerDefinitions"][0].update(
+            cpu=128, memory=128
+        )
+        task_definition["taskDefinition"]["requiresAttributes"] = []
+
+        status, body = self._post(
+            {
+                "cluster": "cluster-prod",
+                "task_definition": task_definition,
+                "desired_count": 2,
+            }
+        )
+
+        self.assertEqual(status, 200)
+        self.assertTrue(body["success"])
+        self.assertEqual(len(body["valid_instances"]), 3)
+
+    def test_unknown_service(self):
+        status, body = self._post({"cluster": "cluster-prod", "service": "nope"})
+
+        self.assertEqual(status, 404)
+        self.assertIn("nope", body["error"])
+
+    def test_bad_request(self):
+        status, _ = self._post({"service": "my-service"})
+
+        self.assertEqual(status, 400)
+
+    def test_unknown_cluster(self):
+        status, body = self._post({"cluster": "cluster-typo", "service": "my-service"})
+
+        self.assertEqual(status, 404)
+        self.assertIn("cluster-typo", body["error"])
+        # unknown clusters are not refreshed in the background
+        self.assertNotIn("cluster-typo", self.store.cluster_names)
+
+    def test_cluster_deleted_while_kept(self):
+        error = ClientError(
+            {"Error": {"Code": "ClusterNotFoundException", "Message": "Not found."}},
+            "ListServices",
+        )
+
+        with mock.patch.object(SnapshotStore, "get", side_effect=error):
+            status, body = self._post({"cluster": "cluster-prod", "service": "x"})
+
+        self.assertEqual(status, 404)
+        self.assertIn("ClusterNotFoundException", body["error"])
+
+    def test_unreachable_ecs(self):
+        with mock.patch.object(
+            SnapshotStore,
+            "get",
+            side_effect=EndpointConnectionError(endpoint_url="https://ecs"),
+        ):
+            status, body = self._post({"cluster": "cluster-prod", "service": "x"})
+
+        self.assertEqual(status, 502)
+        self.assertIn("ECS error", body["error"])
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def test_failed_refresh_keeps_the_thread_running(self):
+        ecs_client = get_stub_ecs_client()
+        store = SnapshotStore(ecs_client=ecs_client, refresh_interval=0.01)
+        store.get("cluster-prod")
+        refreshed = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(1)
+
+            if len(calls) == 3:
+                refreshed.set()
+
+            raise RuntimeError("throttled")
+
+        with mock.patch.object(
+            store.get("cluster-prod"), "refresh", side_effect=refresh
+        ), self.assertLogs("willy.server", level="ERROR") as logs:
+            store.start()
+
+            try:
+                self.assertTrue(refreshed.wait(5))
+                self.assertTrue(store._thread.is_alive())
+            finally:
+                store.stop()
+
+        self.assertIn("cluster-prod", logs.output[0])
+        # the snapshot fetched before the failures is still served
+        self.assertIsNotNone(store.get("cluster-prod").snapshot.cluster)
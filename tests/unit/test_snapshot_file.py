@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from tests.helpers import get_stub_ecs_client
+from willy.main import check_services
+from willy.services import (
+    ECSService,
+    SnapshotECSClient,
+    SnapshotFormatError,
+    capture_snapshot,
+    write_snapshot,
+)
+
+
+class TestSnapshotFile(unittest.TestCase):
+    def test_capture_and_replay(self):
+        ecs_client = get_stub_ecs_client(num_instances=120)
+        live = ECSService(
+            ecs_client=ecs_client, cluster_name="cluster-prod", all_services=True
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "cluster.json")
+            write_snapshot(
+                capture_snapshot(ecs_client=ecs_client, cluster_name="cluster-prod"),
+                file_path,
+            )
+
+            offline_client = SnapshotECSClient.from_file(file_path)
+
+        offline = ECSService(
+            ecs_client=offline_client,
+            cluster_name=offline_client.cluster_name,
+            service_name="my-service",
+        )
+
+        self.assertEqual(offline_client.cluster_name, "cluster-prod")
+        self.assertEqual(offline.snapshot, live.snapshot)
+        self.assertEqual(
+            check_services(offline)["my-service"], check_services(live)["my-service"]
+        )
+
+    @parameterized.expand(
+        [
+            ("newer version", {"version": 2}, "format version 2"),
+            ("no version", {}, "format version None"),
+        ]
+    )
+    def test_other_format_versions_are_rejected(
+        self, name: str, header: dict, message: str
+    ):
+        data = capture_snapshot(
+            ecs_client=get_stub_ecs_client(), cluster_name="cluster-prod"
+        )
+        del data["version"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "cluster.json")
+
+            with open(file_path, "w") as output_file:
+                json.dump({**data, **header}, output_file)
+
+            with self.assertRaisesRegex(SnapshotFormatError, message):
+                SnapshotECSClient.from_file(file_path)
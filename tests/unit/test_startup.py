@@ -0,0 +1,76 @@
+import subprocess
+import sys
+import unittest
+from typing import Dict, List
+
+from parameterized import parameterized
+
+# import time of willy.cli, in microseconds, before arguments are parsed
+STARTUP_BUDGET = 150_000
+HEAVY_MODULES = ["boto3", "botocore", "pydantic", "willy.main", "willy.validators"]
+
+
+def import_times(argv: List[str]) -> Dict[str, int]:
+    """Runs the CLI with 'python -X importtime' and returns the cumulative import time of every imported module."""
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys; sys.argv = {['willy'] + argv!r}; from willy.cli import cli; cli()",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    times = {}
+
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+
+    return times
+
+
+class TestStartup(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("help", ["--help"]),
+            ("argument error", []),
+            ("fleet help", ["fleet", "--help"]),
+            ("snapshot help", ["snapshot", "--help"]),
+            ("plan help", ["plan", "--help"]),
+            ("drain help", ["drain", "--help"]),
+        ]
+    )
+    def test_heavy_modules_are_not_imported(self, name: str, argv: List[str]):
+        times = import_times(argv)
+
+        self.assertIn("willy.cli", times)
+        self.assertEqual([], [elem for elem in HEAVY_MODULES if elem in times])
+        self.assertLess(times["willy.cli"], STARTUP_BUDGET)
+
+    def test_package_exposes_will_it_fit(self):
+        import willy
+        from willy.main import will_it_fit
+
+        self.assertIs(will_it_fit, willy.will_it_fit)
+
+        with self.assertRaises(AttributeError):
+            willy.not_there
+
+    def test_fleet_imports_boto3_on_use(self):
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, willy.fleet; print('boto3' in sys.modules)",
+            ],
+            capture_output=True,
+            text=True,
+        )
+
+        self.assertEqual("False", process.stdout.strip())
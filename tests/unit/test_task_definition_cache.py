@@ -0,0 +1,86 @@
+import json
+import tempfile
+import unittest
+
+from tests.helpers import (
+    get_stub_ecs_client,
+    get_task_definition_from_json,
+    read_json,
+)
+from willy.services import ECSService, TaskDefinitionCache
+
+
+class TestTaskDefinitionCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_task_definitions_are_reused_across_runs(self):
+        first_client = get_stub_ecs_client()
+        first = ECSService(
+            ecs_client=first_client,
+            cluster_name="cluster-prod",
+            service_name="my-service",
+            task_definition_cache=TaskDefinitionCache(self.directory.name),
+        ).service
+
+        # a new cache instance only shares the files on disk
+        second_client = get_stub_ecs_client()
+        second = ECSService(
+            ecs_client=second_client,
+            cluster_name="cluster-prod",
+            service_name="my-service",
+            task_definition_cache=TaskDefinitionCache(self.directory.name),
+        ).service
+
+        self.assertEqual(first_client.calls["describe_task_definition"], 1)
+        self.assertNotIn("describe_task_definition", second_client.calls)
+        self.assertEqual(first.task_definition, second.task_definition)
+
+    def test_only_revision_arns_are_cached(self):
+        cache = TaskDefinitionCache(self.directory.name)
+        response = read_json("tests/assets/task_definition.json")
+
+        cache.put("myapp-prod", response)
+        task_definition = cache.put(
+            response["taskDefinition"]["taskDefinitionArn"], response
+        )
+
+        self.assertIsNone(cache.get("myapp-prod"))
+        self.assertIs(cache.get(task_definition.arn), task_definition)
+        self.assertEqual(
+            TaskDefinitionCache(self.directory.name).get(task_definition.arn),
+            task_definition,
+        )
+
+    def test_responses_are_parsed_on_load(self):
+        cache = TaskDefinitionCache(self.directory.name)
+        response = read_json("tests/assets/task_definition.json")
+        response["taskDefinition"]["placementConstraints"] = [
+            {"type": "distinctInstance"}
+        ]
+        task_definition = cache.put(
+            response["taskDefinition"]["taskDefinitionArn"], response
+        )
+
+        with open(cache._path(task_definition.arn), "r") as input_file:
+            self.assertEqual(response, json.load(input_file))
+
+        self.assertTrue(
+            TaskDefinitionCache(self.directory.name)
+            .get(task_definition.arn)
+            .distinct_instance
+        )
+
+    def test_entries_of_older_versions_are_ignored(self):
+        cache = TaskDefinitionCache(self.directory.name)
+        task_definition = get_task_definition_from_json(
+            "tests/assets/task_definition.json"
+        )
+        path = cache._path(task_definition.arn)
+        path.parent.mkdir(parents=True)
+        path.write_text(task_definition.model_dump_json())
+
+        self.assertIsNone(cache.get(task_definition.arn))
@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+import unittest
+
+from tests.helpers import get_cluster, read_json
+from willy.main import check_task_definition_files
+from willy.models import TaskDefinition
+from willy.services import (
+    expand_task_definition_files,
+    read_task_definition_file,
+    read_task_definition_files,
+)
+
+REGISTER_STYLE = {
+    "family": "my-service",
+    "networkMode": "awsvpc",
+    "cpu": "256",
+    "memory": "256",
+    "containerDefinitions": [
+        {"name": "app", "portMappings": [{"containerPort": 8080}]}
+    ],
+}
+
+
+class TestTaskDefinitionFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _write(self, name: str, content) -> str:
+        file_path = os.path.join(self.directory.name, name)
+
+        with open(file_path, "w") as output_file:
+            output_file.write(
+                content if isinstance(content, str) else json.dumps(content)
+            )
+
+        return file_path
+
+    def test_reads_both_formats(self):
+        describe_style = read_json("tests/assets/task_definition.json")
+
+        self.assertEqual(
+            TaskDefinition.parse_obj(describe_style),
+            read_task_definition_file(self._write("describe.json", describe_style)),
+        )
+        self.assertEqual(
+            "my-service",
+            read_task_definition_file(
+                self._write("register.json", REGISTER_STYLE)
+            ).name,
+        )
+
+    def test_expands_globs(self):
+        second = self._write("b.json", REGISTER_STYLE)
+        first = self._write("a.json", REGISTER_STYLE)
+        self._write("c.txt", "")
+
+        self.assertEqual(
+            [first, second, "missing.json"],
+            expand_task_definition_files(
+                [
+                    os.path.join(self.directory.name, "*.json"),
+                    second,
+                    "missing.json",
+                ]
+            ),
+        )
+
+    def test_reports_unreadable_files(self):
+        file_paths = [
+            self._write(f"{idx}.json", REGISTER_STYLE) for idx in range(20)
+        ] + [self._write("broken.json", "{"), "missing.json"]
+
+        results = read_task_definition_files(file_paths)
+
+        self.assertEqual(file_paths, [file_path for file_path, _ in results])
+        self.assertTrue(
+            all(isinstance(elem, TaskDefinition) for _, elem in results[:20])
+        )
+        self.assertIn("broken.json", results[20][1])
+        self.assertIn("missing.json", results[21][1])
+
+    def test_check_task_definition_files(self):
+        fits = self._write("fits.json", REGISTER_STYLE)
+        too_big = self._write("too-big.json", dict(REGISTER_STYLE, cpu="4096"))
+        broken = self._write("broken.json", "{")
+
+        results = check_task_definition_files(
+            cluster=get_cluster(cpu=1024, memory=1024),
+            file_paths=[fits, too_big, broken],
+            desired_count=2,
+        )
+
+        self.assertTrue(results[fits].success)
+        self.assertFalse(results[too_big].success)
+        self.assertFalse(results[broken].success)
+        self.assertIn("Can not read task definition", results[broken].message)
@@ -114,3 +114,45 @@ class TestTaskDefinitionModel(unittest.TestCase):
                 self.assertEqual(tcp, expected_tcp)
             if udp:
                 self.assertEqual(udp, expected_udp)
+
+    def test_register_style_task_definition(self):
+        task_def_model = TaskDefinition.parse_obj(
+            {
+                "family": "my-service",
+                "networkMode": "awsvpc",
+                "cpu": "0.5 vCPU",
+                "memory": "1 GB",
+                "containerDefinitions": [
+                    {
+                        "name": "app",
+                        "portMappings": [
+                            {"containerPort": 8080},
+                            {"containerPort": 8125, "protocol": "udp"},
+                        ],
+                    },
+                    {"name": "sidecar"},
+                ],
+            }
+        )
+
+        self.assertEqual("my-service", task_def_model.name)
+        self.assertEqual("", task_def_model.arn)
+        self.assertEqual(512, task_def_model.total_cpu_needed)
+        self.assertEqual(1024, task_def_model.total_memory_needed)
+        self.assertEqual([8080], task_def_model.containers[0].ports_tcp)
+        self.assertEqual([8125], task_def_model.containers[0].ports_udp)
+        self.assertEqual([], task_def_model.requires_attributes)
+
+    def test_bridge_mode_without_host_port(self):
+        # a free host port is picked when the task starts
+        tcp, udp = _parse_ports({"portMappings": [{"containerPort": 8080}]}, "bridge")
+
+        self.assertEqual(([], []), (tcp, udp))
+
+    def test_task_definition_without_requires_attributes(self):
+        task_def_json = read_json("tests/assets/task_definition.json")
+        del task_def_json["taskDefinition"]["requiresAttributes"]
+
+        task_def_model = TaskDefinition.parse_obj(task_def_json)
+
+        self.assertEqual([], task_def_model.requires_attributes)
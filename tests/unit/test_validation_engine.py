@@ -0,0 +1,134 @@
+import unittest
+
+from parameterized import parameterized
+
+from tests.helpers import (
+    DOCKER_API_19,
+    get_cluster,
+    get_instance,
+    get_service,
+    get_task_definition,
+)
+from willy.exceptions import (
+    MissingECSAttributeException,
+    NoPortsAvailableException,
+    NotEnoughCPUException,
+    NotEnoughMemoryException,
+)
+from willy.models import Cluster
+from willy.validators import ValidationEngine
+
+
+class TestValidationEngine(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("not enough CPU", 128, 512, [], [], NotEnoughCPUException),
+            ("not enough memory", 512, 128, [], [], NotEnoughMemoryException),
+            ("port taken", 512, 512, [8080], [8080], NoPortsAvailableException),
+            (
+                "CPU checked before ports",
+                128,
+                512,
+                [8080],
+                [8080],
+                NotEnoughCPUException,
+            ),
+        ]
+    )
+    def test_raises_same_exception_as_validators(
+        self,
+        name: str,
+        cluster_cpu: int,
+        cluster_memory: int,
+        cluster_ports: list,
+        task_ports: list,
+        exception,
+    ):
+        cluster = get_cluster(
+            cpu=cluster_cpu,
+            memory=cluster_memory,
+            ports=cluster_ports,
+            attributes=[DOCKER_API_19],
+        )
+        service = get_service(
+            task_definition=get_task_definition(
+                cpu=256, memory=256, ports_tcp=task_ports
+            )
+        )
+
+        with self.assertRaises(exception):
+            ValidationEngine().validate(cluster=cluster, service=service)
+
+    def test_missing_attribute_raises(self):
+        cluster = get_cluster(attributes=[DOCKER_API_19])
+        service = get_service(
+            task_definition=get_task_definition(
+                cpu=256,
+                memory=256,
+                requires_attributes=[{"name": "com.amazonaws.ecs.capability.ecr-auth"}],
+            )
+        )
+
+        with self.assertRaises(MissingECSAttributeException):
+            ValidationEngine().validate(cluster=cluster, service=service)
+
+    def test_blames_the_last_validator_that_rejected_an_instance(self):
+        # the sequential validators pass one instance from CPU to memory, where it is rejected
+        cluster = Cluster(
+            name="cluster-prod",
+            arn="arn:aws:ecs:eu-west-1:123456789012:cluster/cluster-prod",
+            container_instances=[
+                get_instance("no-cpu", cpu=128),
+                get_instance("no-memory", memory=128),
+            ],
+        )
+        service = get_service(task_definition=get_task_definition(cpu=256, memory=256))
+
+        with self.assertRaises(NotEnoughMemoryException):
+            ValidationEngine().validate(cluster=cluster, service=service)
+
+    def test_records_valid_and_invalid_instances(self):
+        cluster = Cluster(
+            name="cluster-prod",
+            arn="arn:aws:ecs:eu-west-1:123456789012:cluster/cluster-prod",
+            container_instances=[
+                get_instance("fits"),
+                get_instance("no-cpu", cpu=128),
+                get_instance("no-memory", memory=128),
+                get_instance("no-ports", ports=[8080]),
+                get_instance("no-attributes", attributes=[{"name": "ecs.os-type"}]),
+            ],
+        )
+        service = get_service(
+            task_definition=get_task_definition(
+                cpu=256,
+                memory=256,
+                ports_tcp=[8080],
+                requires_attributes=[DOCKER_API_19],
+            )
+        )
+
+        result = ValidationEngine().validate(cluster=cluster, service=service)
+
+        self.assertTrue(result.success)
+        self.assertEqual(["fits"], [elem.arn for elem in result.valid_instances])
+        self.assertEqual(
+            ["no-cpu", "no-memory", "no-ports", "no-attributes"],
+            [elem["arn"] for elem in result.invalid_instances],
+        )
+        self.assertTrue(all(elem["reason"] for elem in result.invalid_instances))
+
+    def test_only_checks_given_instances(self):
+        fits = get_instance("fits")
+        cluster = Cluster(
+            name="cluster-prod",
+            arn="arn:aws:ecs:eu-west-1:123456789012:cluster/cluster-prod",
+            container_instances=[fits, get_instance("other")],
+        )
+        service = get_service(task_definition=get_task_definition(cpu=256, memory=256))
+
+        result = ValidationEngine().validate(
+            cluster=cluster, service=service, container_instances=[fits]
+        )
+
+        self.assertEqual([fits], result.valid_instances)
@@ -1 +1,8 @@
-from .main import will_it_fit
+def __getattr__(name: str):
+    # willy.main pulls in pydantic and the validators, so it is imported on first use instead of with the package
+    if name == "will_it_fit":
+        from .main import will_it_fit
+
+        return will_it_fit
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,40 @@
 import argparse
+import sys
+
+from willy.defaults import DEFAULT_MAX_AGE
+
+
+def _add_verbose_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--verbose",
+        "-V",
+        default=False,
+        required=False,
+        action=argparse.BooleanOptionalAction,
+        type=bool,
+        help="Enable verbose output, with EC2 instance information and other details.",
+    )
+
+
+def _add_fetch_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--backend",
+        default="sync",
+        choices=["sync", "async"],
+        help="How to fetch data from ECS. 'async' runs independent API calls concurrently.",
+    )
+    parser.add_argument(
+        "--cache",
+        default=True,
+        action=argparse.BooleanOptionalAction,
+        help="Reuse ECS API responses cached on disk by previous runs.",
+    )
+    parser.add_argument(
+        "--max-age",
+        default=DEFAULT_MAX_AGE,
+        type=float,
+        help="Maximum age, in seconds, of cached ECS API responses.",
+    )
 
 
 def _parse_args():
@@ -6,33 +42,446 @@ def _parse_args():
         description="Checks whether an ECS service can fit on an ECS (EC2) cluster."
     )
     parser.add_argument(
-        "-c", "--cluster", help="Name of the ECS cluster.", required=True
+        "-c",
+        "--cluster",
+        help="Name of the ECS cluster. Optional with --snapshot.",
+    )
+    services = parser.add_mutually_exclusive_group(required=True)
+    services.add_argument(
+        "-s",
+        "--service",
+        help="Name of the ECS service. Can be repeated to check multiple services in one run.",
+        action="append",
+    )
+    services.add_argument(
+        "--all-services",
+        default=False,
+        action="store_true",
+        help="Check every service on the cluster.",
+    )
+    services.add_argument(
+        "--task-definition-file",
+        action="append",
+        help="Path or glob of a task definition JSON file, as passed to register-task-definition or returned by "
+        "describe-task-definition. Can be repeated. Checks task definitions before they are deployed.",
     )
     parser.add_argument(
-        "-s", "--service", help="Name of the ECS service.", required=True
+        "--desired-count",
+        type=int,
+        help="Number of replicas to check --task-definition-file with. Defaults to 1.",
     )
+    _add_verbose_argument(parser)
+    _add_fetch_arguments(parser)
     parser.add_argument(
-        "--verbose",
-        "-V",
+        "--snapshot",
+        help="Read the cluster and services from a file created by 'willy snapshot capture' instead of ECS.",
+    )
+
+    parser.add_argument(
+        "--simulate-placement",
         default=False,
-        required=False,
-        action=argparse.BooleanOptionalAction,
-        type=bool,
-        help="Enable verbose output, with EC2 instance information and other details.",
+        action="store_true",
+        help="Spread the desired number of replicas over the container instances instead of requiring a single "
+        "container instance to fit all of them.",
+    )
+
+    parser.add_argument(
+        "--headroom",
+        default=False,
+        action="store_true",
+        help="Report how many additional replicas of each service the cluster can run right now.",
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    if not args.cluster and not args.snapshot:
+        parser.error("the following arguments are required: -c/--cluster")
+
+    if args.headroom and args.simulate_placement:
+        parser.error("--headroom can not be combined with --simulate-placement")
+
+    # services are checked with their own desired count
+    if args.desired_count is not None and not args.task_definition_file:
+        parser.error("--desired-count can only be used with --task-definition-file")
+
+    return args
+
+
+def _fleet(argv):
+    parser = argparse.ArgumentParser(
+        prog="willy fleet",
+        description="Checks whether all services fit on their ECS (EC2) clusters, across accounts and regions.",
+    )
+    parser.add_argument(
+        "-t",
+        "--target",
+        action="append",
+        default=[],
+        help="Cluster to scan, as 'cluster[:region[:profile]]'. Can be repeated.",
+    )
+    parser.add_argument(
+        "--targets-file",
+        help="File with one 'cluster[:region[:profile]]' target per line.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Number of processes that run the validators. Defaults to the number of CPUs.",
+    )
+    parser.add_argument(
+        "--headroom",
+        default=False,
+        action="store_true",
+        help="Report how many additional replicas of each service the clusters can run right now.",
+    )
+    _add_verbose_argument(parser)
+
+    args = parser.parse_args(argv)
+    targets = list(args.target)
+
+    if args.targets_file:
+        with open(args.targets_file) as input_file:
+            targets.extend(
+                line.strip()
+                for line in input_file
+                if line.strip() and not line.startswith("#")
+            )
+
+    if not targets:
+        parser.error("at least one --target or a --targets-file is required")
+
+    from willy.fleet import will_fleet_fit
+    from willy.models import FleetTarget
+
+    will_fleet_fit(
+        targets=[FleetTarget.parse_str(elem) for elem in targets],
+        verbose=args.verbose,
+        processes=args.processes,
+        headroom=args.headroom,
+    )
+
+
+def _snapshot(argv):
+    parser = argparse.ArgumentParser(
+        prog="willy snapshot",
+        description="Manages snapshots of ECS clusters for offline checks.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    capture = subparsers.add_parser(
+        "capture", help="Save a cluster and its services to a file."
+    )
+    capture.add_argument(
+        "-c", "--cluster", help="Name of the ECS cluster.", required=True
+    )
+    capture.add_argument(
+        "-s",
+        "--service",
+        action="append",
+        help="Name of the ECS service. Can be repeated. Defaults to all services on the cluster.",
+    )
+    capture.add_argument(
+        "-o", "--output", help="Path of the snapshot file.", required=True
+    )
+
+    args = parser.parse_args(argv)
+
+    from willy.main import get_ecs_client
+    from willy.services import ServiceNotFoundError, capture_snapshot, write_snapshot
+
+    try:
+        data = capture_snapshot(
+            ecs_client=get_ecs_client(cache=False),
+            cluster_name=args.cluster,
+            service_names=args.service,
+        )
+    except ServiceNotFoundError as exc:
+        sys.exit(str(exc))
+    write_snapshot(data, args.output)
+
+    print(
+        f"Saved cluster '{args.cluster}' with {len(data['containerInstances'])} container instances and "
+        f"{len(data['services'])} services to '{args.output}'."
+    )
+
+
+def _serve(argv):
+    parser = argparse.ArgumentParser(
+        prog="willy serve",
+        description="Answers 'will it fit' checks over HTTP, keeping cluster snapshots warm in memory.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", default=8080, type=int, help="Port to listen on.")
+    parser.add_argument(
+        "--refresh-interval",
+        default=30,
+        type=float,
+        help="Seconds between background refreshes of the cluster snapshots.",
+    )
+    parser.add_argument(
+        "-c",
+        "--cluster",
+        action="append",
+        help="Name of an ECS cluster to load on startup. Can be repeated.",
+    )
+    _add_verbose_argument(parser)
+
+    args = parser.parse_args(argv)
+
+    from functools import partial
+
+    from willy.main import get_ecs_client
+    from willy.server import serve
+
+    serve(
+        ecs_client_factory=partial(get_ecs_client, cache=False),
+        host=args.host,
+        port=args.port,
+        refresh_interval=args.refresh_interval,
+        cluster_names=args.cluster,
+        verbose=args.verbose,
+    )
+
+
+def _snapshot_cluster_name(file_path: str) -> str:
+    from willy.services import SnapshotECSClient, SnapshotFormatError
+
+    try:
+        return SnapshotECSClient.from_file(file_path).cluster_name
+    except SnapshotFormatError as exc:
+        sys.exit(str(exc))
+
+
+def _attribute(value: str) -> dict:
+    name, _, attribute_value = value.partition("=")
+
+    return {"name": name, "value": attribute_value or None}
+
+
+def _plan(argv):
+    parser = argparse.ArgumentParser(
+        prog="willy plan",
+        description="Computes how many container instances of a given size to add so that services fit.",
+    )
+    parser.add_argument(
+        "-c",
+        "--cluster",
+        help="Name of the ECS cluster. Optional with --snapshot.",
+    )
+    parser.add_argument(
+        "-s",
+        "--service",
+        action="append",
+        help="Name of the ECS service. Can be repeated. Defaults to all services on the cluster.",
+    )
+    parser.add_argument(
+        "--instance-type",
+        help="EC2 instance type of the container instances to add, for example m5.2xlarge. Their CPU and memory "
+        "come from the instance types bundled with willy.",
+    )
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        help="CPU units of the container instances to add, 1024 per vCPU. Instead of --instance-type.",
+    )
+    parser.add_argument(
+        "--memory",
+        type=int,
+        help="Memory, in MiB, that the container instances to add register with ECS. Instead of --instance-type.",
+    )
+    parser.add_argument(
+        "--attribute",
+        action="append",
+        type=_attribute,
+        default=[],
+        help="Attribute of the container instances to add, as 'name' or 'name=value'. Can be repeated.",
+    )
+    _add_fetch_arguments(parser)
+    parser.add_argument(
+        "--snapshot",
+        help="Read the cluster and services from a file created by 'willy snapshot capture' instead of ECS.",
+    )
+    _add_verbose_argument(parser)
+
+    args = parser.parse_args(argv)
+
+    if not args.cluster and not args.snapshot:
+        parser.error("the following arguments are required: -c/--cluster")
+
+    if args.instance_type:
+        if args.cpu or args.memory:
+            parser.error("--instance-type can not be combined with --cpu and --memory")
+
+        from willy.instance_types import UnknownInstanceTypeError, load_catalog
+
+        try:
+            load_catalog().get(args.instance_type)
+        except UnknownInstanceTypeError as exc:
+            parser.error(exc.args[0])
+
+    elif not args.cpu or not args.memory or args.cpu < 0 or args.memory < 0:
+        parser.error(
+            "either --instance-type or a positive --cpu and --memory is required"
+        )
+
+    from willy.main import will_it_plan
+    from willy.models import Attribute
+
+    cluster = args.cluster
+
+    if not cluster:
+        cluster = _snapshot_cluster_name(args.snapshot)
+
+    will_it_plan(
+        cluster_name=cluster,
+        cpu=args.cpu,
+        memory=args.memory,
+        attributes=[Attribute.parse_obj(elem) for elem in args.attribute],
+        service_names=args.service,
+        verbose=args.verbose,
+        backend=args.backend,
+        cache=args.cache,
+        max_age=args.max_age,
+        snapshot=args.snapshot,
+        instance_type=args.instance_type,
+    )
+
+
+def _drain(argv):
+    parser = argparse.ArgumentParser(
+        prog="willy drain",
+        description="Checks whether the tasks of drained container instances fit on the rest of the cluster.",
+    )
+    parser.add_argument(
+        "-c",
+        "--cluster",
+        help="Name of the ECS cluster. Optional with --snapshot.",
+    )
+    parser.add_argument(
+        "--instance",
+        action="append",
+        help="EC2 instance ID or container instance ARN to drain. Can be repeated.",
+    )
+    parser.add_argument(
+        "--az",
+        action="append",
+        help="Availability zone whose container instances are drained, for example eu-west-1a. Can be repeated.",
+    )
+    parser.add_argument(
+        "--percent",
+        type=float,
+        default=0,
+        help="Share of the container instances to drain, starting with the ones that run the most tasks.",
+    )
+    _add_fetch_arguments(parser)
+    parser.add_argument(
+        "--snapshot",
+        help="Read the cluster, services and tasks from a file created by 'willy snapshot capture' instead of ECS.",
+    )
+    _add_verbose_argument(parser)
+
+    args = parser.parse_args(argv)
+
+    if not args.cluster and not args.snapshot:
+        parser.error("the following arguments are required: -c/--cluster")
+
+    if not (args.instance or args.az or args.percent):
+        parser.error("at least one of --instance, --az or --percent is required")
+
+    if not 0 <= args.percent <= 100:
+        parser.error("--percent must be between 0 and 100")
+
+    from willy.main import will_it_drain
+
+    cluster = args.cluster
+
+    if not cluster:
+        cluster = _snapshot_cluster_name(args.snapshot)
+
+    will_it_drain(
+        cluster_name=cluster,
+        instances=args.instance,
+        availability_zones=args.az,
+        percent=args.percent,
+        verbose=args.verbose,
+        backend=args.backend,
+        cache=args.cache,
+        max_age=args.max_age,
+        snapshot=args.snapshot,
+    )
+
+
+SUBCOMMANDS = {
+    "fleet": _fleet,
+    "snapshot": _snapshot,
+    "serve": _serve,
+    "plan": _plan,
+    "drain": _drain,
+}
+
 
 def cli():
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        return SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+
     args = _parse_args()
 
     cluster = args.cluster
-    service = args.service
+    services = args.service
+
+    if not cluster:
+        cluster = _snapshot_cluster_name(args.snapshot)
+
     verbose = args.verbose
+    backend = args.backend
+
+    if args.task_definition_file:
+        from willy.main import will_task_definitions_fit
+
+        will_task_definitions_fit(
+            cluster_name=cluster,
+            task_definition_files=args.task_definition_file,
+            desired_count=args.desired_count or 1,
+            verbose=verbose,
+            backend=backend,
+            cache=args.cache,
+            max_age=args.max_age,
+            snapshot=args.snapshot,
+            simulate=args.simulate_placement,
+            headroom=args.headroom,
+        )
+
+    elif services and len(services) == 1:
+        from willy.main import will_it_fit
+
+        will_it_fit(
+            cluster_name=cluster,
+            service_name=services[0],
+            verbose=verbose,
+            backend=backend,
+            cache=args.cache,
+            max_age=args.max_age,
+            snapshot=args.snapshot,
+            simulate=args.simulate_placement,
+            headroom=args.headroom,
+        )
+
+    else:
+        from willy.main import will_they_fit
 
-    from willy.main import will_it_fit
+        will_they_fit(
+            cluster_name=cluster,
+            service_names=services,
+            verbose=verbose,
+            backend=backend,
+            cache=args.cache,
+            max_age=args.max_age,
+            snapshot=args.snapshot,
+            simulate=args.simulate_placement,
+            headroom=args.headroom,
+        )
 
-    will_it_fit(cluster_name=cluster, service_name=service, verbose=verbose)
 
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,51 @@
+from typing import List
+
+from willy.models import Cluster, ContainerInstance
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def columnar_available() -> bool:
+    return numpy is not None
+
+
+class ColumnarCluster:
+    """Container instance resources as NumPy arrays, one element per container instance.
+
+    Built once per cluster so that resource checks for many services are array comparisons instead of
+    attribute reads on every ContainerInstance.
+    """
+
+    def __init__(self, container_instances: List[ContainerInstance]):
+        if numpy is None:
+            raise RuntimeError(
+                "NumPy is required for the columnar cluster view. Install it with 'pip install willy[fast]'."
+            )
+
+        self.container_instances = list(container_instances)
+        self.arns = [elem.arn for elem in self.container_instances]
+        size = len(self.container_instances)
+        self.cpu_remaining = self._column("cpu_remaining", size)
+        self.cpu_total = self._column("cpu_total", size)
+        self.memory_remaining = self._column("memory_remaining", size)
+        self.memory_total = self._column("memory_total", size)
+
+    def _column(self, field: str, size: int):
+        return numpy.fromiter(
+            (getattr(elem, field) for elem in self.container_instances),
+            dtype=numpy.int64,
+            count=size,
+        )
+
+    @classmethod
+    def from_cluster(cls, cluster: Cluster) -> "ColumnarCluster":
+        return cls(cluster.container_instances)
+
+    def __len__(self) -> int:
+        return len(self.container_instances)
+
+    def select(self, mask) -> List[ContainerInstance]:
+        return [self.container_instances[idx] for idx in numpy.flatnonzero(mask)]
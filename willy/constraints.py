@@ -0,0 +1,345 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+# memberOf placement constraints are written in the cluster query language:
+# https://docs.aws.amazon.com/AmazonECS/latest/developerguide/cluster-query-language.html
+#
+# an expression is compiled once into a tree of predicates and evaluated against the facts of every container
+# instance, for example {"attribute:ecs.instance-type": "t3.small", "ec2InstanceId": "i-0123456789"}
+
+COMPILE_CACHE_SIZE = 1024
+
+OPERATORS = {
+    "==": "==",
+    "equals": "==",
+    "!=": "!=",
+    "not_equals": "!=",
+    ">": ">",
+    "greater_than": ">",
+    ">=": ">=",
+    "greater_than_equal": ">=",
+    "<": "<",
+    "less_than": "<",
+    "<=": "<=",
+    "less_than_equal": "<=",
+    "exists": "exists",
+    "!exists": "!exists",
+    "not_exists": "!exists",
+    "in": "in",
+    "!in": "not_in",
+    "not_in": "not_in",
+    "=~": "=~",
+    "matches": "=~",
+    "!~": "!~",
+    "not_matches": "!~",
+}
+UNARY_OPERATORS = {"exists", "!exists"}
+LIST_OPERATORS = {"in", "not_in"}
+# subjects that willy knows for every container instance, other subjects (task:group, agentConnected, ...) can not
+# be evaluated from a snapshot and are assumed to be satisfied
+ATTRIBUTE_SUBJECT = "attribute:"
+INSTANCE_ID_SUBJECT = "ec2InstanceId"
+
+TOKEN_REGEX = re.compile(
+    r"""\s*(?:
+        (?P<string>'[^']*'|"[^"]*")
+        |(?P<symbol>&&|\|\||==|!=|>=|<=|=~|!~|!exists|!in|[()\[\],<>])
+        |(?P<word>[^\s()\[\],=!<>~&|'"]+)
+    )""",
+    re.VERBOSE,
+)
+
+
+class InvalidExpressionError(ValueError):
+    pass
+
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+
+
+def _tokenize(expression: str) -> List[Token]:
+    tokens = []
+    position = 0
+    expression = expression.strip()
+
+    while position < len(expression):
+        match = TOKEN_REGEX.match(expression, position)
+
+        if not match or match.end() == position:
+            raise InvalidExpressionError(
+                f"Unexpected character '{expression[position]}' at position {position} of '{expression}'."
+            )
+
+        kind = match.lastgroup
+        value = match.group(kind)
+
+        if kind == "string":
+            value = value[1:-1]
+
+        tokens.append(Token(kind=kind, value=value))
+        position = match.end()
+
+    return tokens
+
+
+def _as_number(value: Optional[str]):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Comparison(NamedTuple):
+    subject: str
+    operator: str
+    values: Tuple[str, ...] = ()
+
+    @property
+    def known(self) -> bool:
+        return (
+            self.subject.startswith(ATTRIBUTE_SUBJECT)
+            or self.subject == INSTANCE_ID_SUBJECT
+        )
+
+    def matches(self, facts: Dict[str, Optional[str]]) -> bool:
+        if not self.known:
+            return True
+
+        exists = self.subject in facts
+        value = facts.get(self.subject)
+
+        if self.operator == "exists":
+            return exists
+        if self.operator == "!exists":
+            return not exists
+        if self.operator == "in":
+            return exists and value in self.values
+        if self.operator == "not_in":
+            return value not in self.values
+        if self.operator == "==":
+            return exists and value == self.values[0]
+        if self.operator == "!=":
+            return value != self.values[0]
+        if self.operator in ("=~", "!~"):
+            matched = (
+                exists and value is not None and bool(self._pattern.fullmatch(value))
+            )
+
+            return matched if self.operator == "=~" else not matched
+
+        if value is None:
+            return False
+
+        # >, >=, < and <= compare numbers when both sides are numbers, otherwise strings (dates, versions)
+        left, right = _as_number(value), _as_number(self.values[0])
+
+        if left is None or right is None:
+            left, right = value, self.values[0]
+
+        return {
+            ">": left > right,
+            ">=": left >= right,
+            "<": left < right,
+            "<=": left <= right,
+        }[self.operator]
+
+    @property
+    def _pattern(self):
+        return _compile_pattern(self.values[0])
+
+    def positions(self, index) -> Set[int]:
+        if self.known and self.subject.startswith(ATTRIBUTE_SUBJECT):
+            name = self.subject[len(ATTRIBUTE_SUBJECT) :]
+
+            if self.operator == "exists":
+                return index.with_name(name)
+            if self.operator == "in":
+                return set().union(
+                    *(index.with_value(name, value) for value in self.values)
+                )
+            if self.operator == "==":
+                return index.with_value(name, self.values[0])
+
+        return {
+            position for position in index.all if self.matches(index.facts[position])
+        }
+
+
+class And(NamedTuple):
+    left: "Predicate"
+    right: "Predicate"
+
+    def matches(self, facts: Dict[str, Optional[str]]) -> bool:
+        return self.left.matches(facts) and self.right.matches(facts)
+
+    def positions(self, index) -> Set[int]:
+        return self.left.positions(index) & self.right.positions(index)
+
+
+class Or(NamedTuple):
+    left: "Predicate"
+    right: "Predicate"
+
+    def matches(self, facts: Dict[str, Optional[str]]) -> bool:
+        return self.left.matches(facts) or self.right.matches(facts)
+
+    def positions(self, index) -> Set[int]:
+        return self.left.positions(index) | self.right.positions(index)
+
+
+Predicate = Union[Comparison, And, Or]
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile_pattern(pattern: str):
+    try:
+        return re.compile(pattern)
+    except re.error:
+        # not a valid regular expression, so only '*' is treated as a wildcard
+        return re.compile(".*".join(re.escape(elem) for elem in pattern.split("*")))
+
+
+class _Parser:
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def _peek(self) -> Optional[Token]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self) -> Token:
+        token = self._peek()
+
+        if token is None:
+            raise InvalidExpressionError(
+                f"Unexpected end of expression '{self.expression}'."
+            )
+
+        self.position += 1
+
+        return token
+
+    def _expect(self, value: str):
+        token = self._next()
+
+        if token.value != value:
+            raise InvalidExpressionError(
+                f"Expected '{value}' but found '{token.value}' in '{self.expression}'."
+            )
+
+    def _accept(self, *values: str) -> bool:
+        token = self._peek()
+
+        if token is not None and token.kind != "string" and token.value in values:
+            self.position += 1
+            return True
+
+        return False
+
+    def parse(self):
+        predicate = self._or()
+
+        if self._peek() is not None:
+            raise InvalidExpressionError(
+                f"Unexpected '{self._peek().value}' in '{self.expression}'."
+            )
+
+        return predicate
+
+    def _or(self):
+        predicate = self._and()
+
+        while self._accept("||", "or"):
+            predicate = Or(predicate, self._and())
+
+        return predicate
+
+    def _and(self):
+        predicate = self._term()
+
+        while self._accept("&&", "and"):
+            predicate = And(predicate, self._term())
+
+        return predicate
+
+    def _term(self):
+        if self._accept("("):
+            predicate = self._or()
+            self._expect(")")
+
+            return predicate
+
+        subject = self._next()
+
+        if subject.kind != "word":
+            raise InvalidExpressionError(
+                f"Expected a subject but found '{subject.value}' in '{self.expression}'."
+            )
+
+        token = self._next()
+        operator = OPERATORS.get(token.value) if token.kind != "string" else None
+
+        # 'not in' is accepted next to 'not_in'
+        if token.value == "not" and self._accept("in"):
+            operator = "not_in"
+
+        if operator is None:
+            raise InvalidExpressionError(
+                f"Unknown operator '{token.value}' in '{self.expression}'."
+            )
+
+        if operator in UNARY_OPERATORS:
+            return Comparison(subject=subject.value, operator=operator)
+
+        if operator in LIST_OPERATORS:
+            return Comparison(
+                subject=subject.value, operator=operator, values=self._list()
+            )
+
+        return Comparison(
+            subject=subject.value, operator=operator, values=(self._value(),)
+        )
+
+    def _value(self) -> str:
+        token = self._next()
+
+        if token.kind == "symbol":
+            raise InvalidExpressionError(
+                f"Expected a value but found '{token.value}' in '{self.expression}'."
+            )
+
+        return token.value
+
+    def _list(self) -> Tuple[str, ...]:
+        # a single value without brackets is a list of one
+        if not self._accept("["):
+            return (self._value(),)
+
+        values = [self._value()]
+
+        while self._accept(","):
+            values.append(self._value())
+
+        self._expect("]")
+
+        return tuple(values)
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def compile_expression(expression: str) -> Predicate:
+    """Compiles a cluster query language expression into a predicate, once per expression string."""
+    return _Parser(expression).parse()
+
+
+def instance_facts(container_instance) -> Dict[str, Optional[str]]:
+    facts = {
+        f"{ATTRIBUTE_SUBJECT}{attribute.name}": attribute.value
+        for attribute in container_instance.attributes
+    }
+    facts[INSTANCE_ID_SUBJECT] = container_instance.instance_id
+
+    return facts
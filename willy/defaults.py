@@ -0,0 +1,5 @@
+# defaults shared by the command line and the modules that use them; this module must stay free of imports, so
+# that `willy --help` does not load the rest of willy
+
+# seconds that cached ECS API responses are reused for
+DEFAULT_MAX_AGE = 60
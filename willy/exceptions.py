@@ -60,3 +60,14 @@ class NoPortsAvailableException(BaseException):
         invalid_instances: List[ContainerInstance] = None,
     ):
         super().__init__(message, verbose_message, valid_instances, invalid_instances)
+
+
+class PlacementConstraintException(BaseException):
+    def __init__(
+        self,
+        message: str,
+        verbose_message: str = "",
+        valid_instances: List[ContainerInstance] = None,
+        invalid_instances: List[ContainerInstance] = None,
+    ):
+        super().__init__(message, verbose_message, valid_instances, invalid_instances)
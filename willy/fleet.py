@@ -0,0 +1,188 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from sys import exit
+from typing import Callable, List, Optional, Tuple
+
+from willy.main import check_headroom, check_service
+from willy.models import Cluster, FleetResult, FleetTarget, Service, ValidatorResult
+from willy.services import ECSService, ServiceNotFoundError, TaskDefinitionCache
+from willy.validators import ValidationEngine
+
+# services of one cluster are sent to the process pool in chunks so that the cluster is pickled once per chunk
+SERVICES_PER_CHUNK = 25
+
+
+def _ecs_client(target: FleetTarget):
+    # boto3 takes longer to import than the rest of willy together, so it is imported on first use
+    import boto3
+
+    session = boto3.session.Session(
+        profile_name=target.profile, region_name=target.region
+    )
+
+    return session.client("ecs")
+
+
+def _get_snapshot(
+    target: FleetTarget,
+    ecs_client_factory: Callable,
+    task_definition_cache: Optional[TaskDefinitionCache],
+):
+    ecs_service = ECSService(
+        ecs_client=ecs_client_factory(target),
+        cluster_name=target.cluster,
+        all_services=True,
+        task_definition_cache=task_definition_cache,
+    )
+
+    return ecs_service.snapshot
+
+
+def _check_services(
+    cluster: Cluster, services: List[Service], headroom: bool = False
+) -> List[Tuple[str, ValidatorResult]]:
+    engine = ValidationEngine()
+    check = check_headroom if headroom else check_service
+
+    return [
+        (service.name, check(cluster=cluster, service=service, engine=engine))
+        for service in services
+    ]
+
+
+def _failed(target: FleetTarget, message: str) -> FleetResult:
+    return FleetResult(
+        target=target,
+        service="",
+        result=ValidatorResult(success=False, message=message, verbose_message=message),
+    )
+
+
+def scan_fleet(
+    targets: List[FleetTarget],
+    max_workers: int = 8,
+    processes: Optional[int] = None,
+    ecs_client_factory: Callable = _ecs_client,
+    task_definition_cache: Optional[TaskDefinitionCache] = None,
+    headroom: bool = False,
+) -> List[FleetResult]:
+    """Checks every service of every target cluster.
+
+    Snapshots are fetched concurrently in threads (the work is I/O bound), the validators then run in a
+    process pool across cores. Results are returned in target order, services in the order ECS lists them.
+    With `headroom`, every service is checked for how many additional replicas fit instead.
+    """
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    results: List[FleetResult] = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        fetched = [
+            (
+                target,
+                executor.submit(
+                    _get_snapshot, target, ecs_client_factory, task_definition_cache
+                ),
+            )
+            for target in targets
+        ]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        checks = []
+
+        for target, future in fetched:
+            try:
+                snapshot = future.result()
+            except (BotoCoreError, ClientError, ServiceNotFoundError) as exc:
+                checks.append((target, None, str(exc)))
+                continue
+
+            if snapshot.cluster is None:
+                checks.append(
+                    (target, None, f"Cluster '{target.cluster}' does not exist.")
+                )
+                continue
+
+            for idx in range(0, len(snapshot.services), SERVICES_PER_CHUNK):
+                checks.append(
+                    (
+                        target,
+                        executor.submit(
+                            _check_services,
+                            snapshot.cluster,
+                            snapshot.services[idx : idx + SERVICES_PER_CHUNK],
+                            headroom,
+                        ),
+                        None,
+                    )
+                )
+
+        for target, future, error in checks:
+            if future is None:
+                results.append(_failed(target, error))
+                continue
+
+            results.extend(
+                FleetResult(target=target, service=service, result=result)
+                for service, result in future.result()
+            )
+
+    return results
+
+
+def _headroom(result: ValidatorResult) -> str:
+    if result.headroom is None:
+        return ""
+
+    return (
+        "any" if result.headroom.unbounded else str(result.headroom.additional_replicas)
+    )
+
+
+def report(
+    results: List[FleetResult], verbose: bool = False, headroom: bool = False
+) -> str:
+    headroom_header = f" {'Headroom':>8} |" if headroom else ""
+    headroom_line = f" {'-' * 8} |" if headroom else ""
+    table = f"""
+{'Cluster':>30} | {'Region':>15} | {'Service':>40} | {'Fits':>5} |{headroom_header}
+{'-' * 30} | {'-' * 15} | {'-' * 40} | {'-' * 5} |{headroom_line}
+"""
+    messages = ""
+
+    for elem in results:
+        table += (
+            f"{elem.target.cluster:>30} | {elem.target.region or '':>15} | {elem.service:>40} | "
+            f"{'yes' if elem.result.success else 'no':>5} |"
+        )
+        table += f" {_headroom(elem.result):>8} |\n" if headroom else "\n"
+
+        if not elem.result.success or verbose:
+            messages += f"\n[{elem.target}] {elem.result.verbose_message if verbose else elem.result.message}\n"
+
+    return f"{table}{messages}"
+
+
+def will_fleet_fit(
+    targets: List[FleetTarget],
+    verbose: bool = False,
+    processes: Optional[int] = None,
+    headroom: bool = False,
+):
+    results = scan_fleet(
+        targets=targets,
+        processes=processes,
+        task_definition_cache=TaskDefinitionCache(),
+        headroom=headroom,
+    )
+    failed = [elem for elem in results if not elem.result.success]
+
+    print(report(results, verbose=verbose, headroom=headroom))
+
+    if failed:
+        exit(
+            f"{len(results) - len(failed)} of {len(results)} services across {len(targets)} clusters can be scheduled."
+        )
+
+    print(
+        f"{len(results)} of {len(results)} services across {len(targets)} clusters can be scheduled."
+    )
@@ -0,0 +1,111 @@
+from typing import List, Optional
+
+from willy.columnar import numpy
+from willy.models import Cluster, ContainerInstance, HeadroomResult, Service
+from willy.validators import (
+    AttributesValidator,
+    NetworkValidator,
+    PlacementConstraintsValidator,
+    ValidationEngine,
+)
+
+# validators that decide whether a container instance can run the service at all; how many replicas fit is
+# computed from the remaining CPU and memory
+ELIGIBILITY_VALIDATORS = [
+    NetworkValidator,
+    AttributesValidator,
+    PlacementConstraintsValidator,
+]
+
+
+def _replicas_limit(service: Service) -> Optional[int]:
+    # static host ports can be bound by one task per instance, distinctInstance allows one task per instance
+    return 1 if service.host_ports_mask or service.requires_distinct_instance else None
+
+
+def instance_headroom(
+    container_instance: ContainerInstance, cpu: int, memory: int, limit: Optional[int]
+) -> Optional[int]:
+    """Returns how many replicas that need `cpu` and `memory` fit on the container instance, None if unbounded.
+
+    CPU is checked with >= and memory with >, like the CPU and memory validators do.
+    """
+    replicas = [] if limit is None else [limit]
+
+    if cpu:
+        replicas.append(container_instance.cpu_remaining // cpu)
+
+    if memory:
+        replicas.append((container_instance.memory_remaining - 1) // memory)
+
+    return max(min(replicas), 0) if replicas else None
+
+
+def headroom(
+    cluster: Cluster, service: Service, engine: Optional[ValidationEngine] = None
+) -> HeadroomResult:
+    """Computes how many more replicas of the service the cluster can run right now.
+
+    Every container instance that passes the eligibility validators contributes the minimum of its CPU, memory
+    and port limits, so the answer comes from one pass over the cluster instead of validating increasing
+    desired counts. With NumPy installed the per-instance limits are computed on the columnar view.
+    """
+    engine = engine or ValidationEngine()
+    container_instances = cluster.container_instances
+    occupied = set(service.occupied_instances)
+    eligible = [
+        accepted and container_instance.arn not in occupied
+        for accepted, container_instance in zip(
+            engine.accepted(
+                cluster=cluster,
+                service=service.model_copy(update={"desired_count": 1}),
+                validators=ELIGIBILITY_VALIDATORS,
+            ),
+            container_instances,
+        )
+    ]
+
+    task_definition = service.task_definition
+    cpu = task_definition.total_cpu_needed if task_definition else 0
+    memory = task_definition.total_memory_needed if task_definition else 0
+    limit = _replicas_limit(service)
+
+    if not cpu and not memory and limit is None:
+        return HeadroomResult(unbounded=any(eligible))
+
+    columns = engine.columns(container_instances)
+
+    if columns is None:
+        per_instance = [
+            instance_headroom(container_instance, cpu, memory, limit) if ok else 0
+            for ok, container_instance in zip(eligible, container_instances)
+        ]
+    else:
+        per_instance = _columnar_headroom(columns, eligible, cpu, memory, limit)
+
+    return HeadroomResult(
+        replicas={
+            container_instance.arn: replicas
+            for container_instance, replicas in zip(container_instances, per_instance)
+            if replicas
+        }
+    )
+
+
+def _columnar_headroom(
+    columns, eligible: List[bool], cpu: int, memory: int, limit: Optional[int]
+) -> List[int]:
+    replicas = numpy.full(len(columns), numpy.iinfo(numpy.int64).max)
+
+    if limit is not None:
+        replicas = numpy.minimum(replicas, limit)
+
+    if cpu:
+        replicas = numpy.minimum(replicas, columns.cpu_remaining // cpu)
+
+    if memory:
+        replicas = numpy.minimum(replicas, (columns.memory_remaining - 1) // memory)
+
+    return numpy.where(
+        numpy.array(eligible, dtype=bool), numpy.maximum(replicas, 0), 0
+    ).tolist()
@@ -0,0 +1,360 @@
+from array import array
+from difflib import get_close_matches
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+from willy.models import Attribute, ContainerInstance
+
+# bump with every change to _CATALOG
+CATALOG_VERSION = "2024.06.1"
+ARCHITECTURES = ("x86_64", "arm64")
+
+# the operating system keeps part of the memory of an instance, so ECS registers less than the instance type
+# has; estimated from the registered memory of instances that run the ECS-optimized AMI
+OS_RESERVED_MEMORY_RATIO = 0.03
+OS_RESERVED_MEMORY_MIB = 256
+
+# name, vCPUs, memory (MiB), maximum network interfaces, architecture, GPUs
+_CATALOG = """
+t3.nano           2     512  2 x86_64 0
+t3.micro          2    1024  2 x86_64 0
+t3.small          2    2048  3 x86_64 0
+t3.medium         2    4096  3 x86_64 0
+t3.large          2    8192  3 x86_64 0
+t3.xlarge         4   16384  4 x86_64 0
+t3.2xlarge        8   32768  4 x86_64 0
+t3a.nano          2     512  2 x86_64 0
+t3a.micro         2    1024  2 x86_64 0
+t3a.small         2    2048  3 x86_64 0
+t3a.medium        2    4096  3 x86_64 0
+t3a.large         2    8192  3 x86_64 0
+t3a.xlarge        4   16384  4 x86_64 0
+t3a.2xlarge       8   32768  4 x86_64 0
+t4g.nano          2     512  2 arm64  0
+t4g.micro         2    1024  2 arm64  0
+t4g.small         2    2048  3 arm64  0
+t4g.medium        2    4096  3 arm64  0
+t4g.large         2    8192  3 arm64  0
+t4g.xlarge        4   16384  4 arm64  0
+t4g.2xlarge       8   32768  4 arm64  0
+m5.large          2    8192  3 x86_64 0
+m5.xlarge         4   16384  4 x86_64 0
+m5.2xlarge        8   32768  4 x86_64 0
+m5.4xlarge       16   65536  8 x86_64 0
+m5.8xlarge       32  131072  8 x86_64 0
+m5.12xlarge      48  196608  8 x86_64 0
+m5.16xlarge      64  262144 15 x86_64 0
+m5.24xlarge      96  393216 15 x86_64 0
+m5a.large         2    8192  3 x86_64 0
+m5a.xlarge        4   16384  4 x86_64 0
+m5a.2xlarge       8   32768  4 x86_64 0
+m5a.4xlarge      16   65536  8 x86_64 0
+m5a.8xlarge      32  131072  8 x86_64 0
+m5a.12xlarge     48  196608  8 x86_64 0
+m5a.16xlarge     64  262144 15 x86_64 0
+m5a.24xlarge     96  393216 15 x86_64 0
+m6i.large         2    8192  3 x86_64 0
+m6i.xlarge        4   16384  4 x86_64 0
+m6i.2xlarge       8   32768  4 x86_64 0
+m6i.4xlarge      16   65536  8 x86_64 0
+m6i.8xlarge      32  131072  8 x86_64 0
+m6i.12xlarge     48  196608  8 x86_64 0
+m6i.16xlarge     64  262144 15 x86_64 0
+m6i.24xlarge     96  393216 15 x86_64 0
+m6i.32xlarge    128  524288 15 x86_64 0
+m6a.large         2    8192  3 x86_64 0
+m6a.xlarge        4   16384  4 x86_64 0
+m6a.2xlarge       8   32768  4 x86_64 0
+m6a.4xlarge      16   65536  8 x86_64 0
+m6a.8xlarge      32  131072  8 x86_64 0
+m6a.12xlarge     48  196608  8 x86_64 0
+m6a.16xlarge     64  262144 15 x86_64 0
+m6a.24xlarge     96  393216 15 x86_64 0
+m6a.32xlarge    128  524288 15 x86_64 0
+m7i.large         2    8192  3 x86_64 0
+m7i.xlarge        4   16384  4 x86_64 0
+m7i.2xlarge       8   32768  4 x86_64 0
+m7i.4xlarge      16   65536  8 x86_64 0
+m7i.8xlarge      32  131072  8 x86_64 0
+m7i.12xlarge     48  196608  8 x86_64 0
+m7i.16xlarge     64  262144 15 x86_64 0
+m7i.24xlarge     96  393216 15 x86_64 0
+m6g.medium        1    4096  2 arm64  0
+m6g.large         2    8192  3 arm64  0
+m6g.xlarge        4   16384  4 arm64  0
+m6g.2xlarge       8   32768  4 arm64  0
+m6g.4xlarge      16   65536  8 arm64  0
+m6g.8xlarge      32  131072  8 arm64  0
+m6g.12xlarge     48  196608  8 arm64  0
+m6g.16xlarge     64  262144 15 arm64  0
+m7g.medium        1    4096  2 arm64  0
+m7g.large         2    8192  3 arm64  0
+m7g.xlarge        4   16384  4 arm64  0
+m7g.2xlarge       8   32768  4 arm64  0
+m7g.4xlarge      16   65536  8 arm64  0
+m7g.8xlarge      32  131072  8 arm64  0
+m7g.12xlarge     48  196608  8 arm64  0
+m7g.16xlarge     64  262144 15 arm64  0
+c5.large          2    4096  3 x86_64 0
+c5.xlarge         4    8192  4 x86_64 0
+c5.2xlarge        8   16384  4 x86_64 0
+c5.4xlarge       16   32768  8 x86_64 0
+c5.9xlarge       36   73728  8 x86_64 0
+c5.12xlarge      48   98304  8 x86_64 0
+c5.18xlarge      72  147456 15 x86_64 0
+c5.24xlarge      96  196608 15 x86_64 0
+c5a.large         2    4096  3 x86_64 0
+c5a.xlarge        4    8192  4 x86_64 0
+c5a.2xlarge       8   16384  4 x86_64 0
+c5a.4xlarge      16   32768  8 x86_64 0
+c5a.8xlarge      32   65536  8 x86_64 0
+c5a.12xlarge     48   98304  8 x86_64 0
+c5a.16xlarge     64  131072 15 x86_64 0
+c5a.24xlarge     96  196608 15 x86_64 0
+c6i.large         2    4096  3 x86_64 0
+c6i.xlarge        4    8192  4 x86_64 0
+c6i.2xlarge       8   16384  4 x86_64 0
+c6i.4xlarge      16   32768  8 x86_64 0
+c6i.8xlarge      32   65536  8 x86_64 0
+c6i.12xlarge     48   98304  8 x86_64 0
+c6i.16xlarge     64  131072 15 x86_64 0
+c6i.24xlarge     96  196608 15 x86_64 0
+c6i.32xlarge    128  262144 15 x86_64 0
+c7i.large         2    4096  3 x86_64 0
+c7i.xlarge        4    8192  4 x86_64 0
+c7i.2xlarge       8   16384  4 x86_64 0
+c7i.4xlarge      16   32768  8 x86_64 0
+c7i.8xlarge      32   65536  8 x86_64 0
+c7i.12xlarge     48   98304  8 x86_64 0
+c7i.16xlarge     64  131072 15 x86_64 0
+c7i.24xlarge     96  196608 15 x86_64 0
+c6g.medium        1    2048  2 arm64  0
+c6g.large         2    4096  3 arm64  0
+c6g.xlarge        4    8192  4 arm64  0
+c6g.2xlarge       8   16384  4 arm64  0
+c6g.4xlarge      16   32768  8 arm64  0
+c6g.8xlarge      32   65536  8 arm64  0
+c6g.12xlarge     48   98304  8 arm64  0
+c6g.16xlarge     64  131072 15 arm64  0
+c7g.medium        1    2048  2 arm64  0
+c7g.large         2    4096  3 arm64  0
+c7g.xlarge        4    8192  4 arm64  0
+c7g.2xlarge       8   16384  4 arm64  0
+c7g.4xlarge      16   32768  8 arm64  0
+c7g.8xlarge      32   65536  8 arm64  0
+c7g.12xlarge     48   98304  8 arm64  0
+c7g.16xlarge     64  131072 15 arm64  0
+r5.large          2   16384  3 x86_64 0
+r5.xlarge         4   32768  4 x86_64 0
+r5.2xlarge        8   65536  4 x86_64 0
+r5.4xlarge       16  131072  8 x86_64 0
+r5.8xlarge       32  262144  8 x86_64 0
+r5.12xlarge      48  393216  8 x86_64 0
+r5.16xlarge      64  524288 15 x86_64 0
+r5.24xlarge      96  786432 15 x86_64 0
+r5a.large         2   16384  3 x86_64 0
+r5a.xlarge        4   32768  4 x86_64 0
+r5a.2xlarge       8   65536  4 x86_64 0
+r5a.4xlarge      16  131072  8 x86_64 0
+r5a.8xlarge      32  262144  8 x86_64 0
+r5a.12xlarge     48  393216  8 x86_64 0
+r5a.16xlarge     64  524288 15 x86_64 0
+r5a.24xlarge     96  786432 15 x86_64 0
+r6i.large         2   16384  3 x86_64 0
+r6i.xlarge        4   32768  4 x86_64 0
+r6i.2xlarge       8   65536  4 x86_64 0
+r6i.4xlarge      16  131072  8 x86_64 0
+r6i.8xlarge      32  262144  8 x86_64 0
+r6i.12xlarge     48  393216  8 x86_64 0
+r6i.16xlarge     64  524288 15 x86_64 0
+r6i.24xlarge     96  786432 15 x86_64 0
+r6i.32xlarge    128 1048576 15 x86_64 0
+r7i.large         2   16384  3 x86_64 0
+r7i.xlarge        4   32768  4 x86_64 0
+r7i.2xlarge       8   65536  4 x86_64 0
+r7i.4xlarge      16  131072  8 x86_64 0
+r7i.8xlarge      32  262144  8 x86_64 0
+r7i.12xlarge     48  393216  8 x86_64 0
+r7i.16xlarge     64  524288 15 x86_64 0
+r7i.24xlarge     96  786432 15 x86_64 0
+r6g.medium        1    8192  2 arm64  0
+r6g.large         2   16384  3 arm64  0
+r6g.xlarge        4   32768  4 arm64  0
+r6g.2xlarge       8   65536  4 arm64  0
+r6g.4xlarge      16  131072  8 arm64  0
+r6g.8xlarge      32  262144  8 arm64  0
+r6g.12xlarge     48  393216  8 arm64  0
+r6g.16xlarge     64  524288 15 arm64  0
+r7g.medium        1    8192  2 arm64  0
+r7g.large         2   16384  3 arm64  0
+r7g.xlarge        4   32768  4 arm64  0
+r7g.2xlarge       8   65536  4 arm64  0
+r7g.4xlarge      16  131072  8 arm64  0
+r7g.8xlarge      32  262144  8 arm64  0
+r7g.12xlarge     48  393216  8 arm64  0
+r7g.16xlarge     64  524288 15 arm64  0
+g4dn.xlarge       4   16384  3 x86_64 1
+g4dn.2xlarge      8   32768  3 x86_64 1
+g4dn.4xlarge     16   65536  3 x86_64 1
+g4dn.8xlarge     32  131072  4 x86_64 1
+g4dn.12xlarge    48  196608  8 x86_64 4
+g4dn.16xlarge    64  262144  4 x86_64 1
+g5.xlarge         4   16384  4 x86_64 1
+g5.2xlarge        8   32768  4 x86_64 1
+g5.4xlarge       16   65536  8 x86_64 1
+g5.8xlarge       32  131072  8 x86_64 1
+g5.12xlarge      48  196608 15 x86_64 4
+g5.16xlarge      64  262144  8 x86_64 1
+g5.24xlarge      96  393216 15 x86_64 4
+g5.48xlarge     192  786432  7 x86_64 8
+p3.2xlarge        8   62464  4 x86_64 1
+p3.8xlarge       32  249856  8 x86_64 4
+p3.16xlarge      64  499712  8 x86_64 8
+"""
+
+
+class UnknownInstanceTypeError(KeyError):
+    pass
+
+
+class InstanceType(NamedTuple):
+    name: str
+    vcpus: int
+    memory: int
+    max_enis: int
+    architecture: str
+    gpus: int
+
+    @property
+    def ecs_cpu(self) -> int:
+        """CPU units the container instance registers with ECS."""
+        return self.vcpus * 1024
+
+    def ecs_memory(self, reserved_memory: int = 0) -> int:
+        """Memory, in MiB, the container instance registers with ECS with ECS_RESERVED_MEMORY set to
+        `reserved_memory`."""
+        available = (
+            int(self.memory * (1 - OS_RESERVED_MEMORY_RATIO)) - OS_RESERVED_MEMORY_MIB
+        )
+
+        return max(available - reserved_memory, 0)
+
+
+class InstanceTypeCatalog:
+    """EC2 instance types bundled with willy, so no EC2 or pricing API calls are needed.
+
+    Every field is kept in its own array, one element per instance type, and instance types are looked up by
+    their position in the name index.
+    """
+
+    def __init__(self, table: str = _CATALOG, version: str = CATALOG_VERSION):
+        self.version = version
+        self.names: List[str] = []
+        self.vcpus = array("H")
+        self.memory = array("I")
+        self.max_enis = array("B")
+        self.architectures = array("B")
+        self.gpus = array("B")
+
+        for line in table.splitlines():
+            if not line.strip():
+                continue
+
+            name, vcpus, memory, max_enis, architecture, gpus = line.split()
+            self.names.append(name)
+            self.vcpus.append(int(vcpus))
+            self.memory.append(int(memory))
+            self.max_enis.append(int(max_enis))
+            self.architectures.append(ARCHITECTURES.index(architecture))
+            self.gpus.append(int(gpus))
+
+        self._index: Dict[str, int] = {name: idx for idx, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def _at(self, idx: int) -> InstanceType:
+        return InstanceType(
+            name=self.names[idx],
+            vcpus=self.vcpus[idx],
+            memory=self.memory[idx],
+            max_enis=self.max_enis[idx],
+            architecture=ARCHITECTURES[self.architectures[idx]],
+            gpus=self.gpus[idx],
+        )
+
+    def get(self, name: str) -> InstanceType:
+        try:
+            return self._at(self._index[name])
+        except KeyError:
+            suggestions = get_close_matches(name, self.names, n=3)
+            hint = f" Did you mean {', '.join(suggestions)}?" if suggestions else ""
+
+            raise UnknownInstanceTypeError(
+                f"Instance type '{name}' is not in the catalog (version {self.version}).{hint}"
+            ) from None
+
+    def find(
+        self,
+        min_vcpus: int = 0,
+        min_memory: int = 0,
+        architecture: Optional[str] = None,
+        min_gpus: int = 0,
+    ) -> List[InstanceType]:
+        """Returns the instance types with at least `min_vcpus`, `min_memory` MiB and `min_gpus`, smallest first."""
+        architecture_code = (
+            None if architecture is None else ARCHITECTURES.index(architecture)
+        )
+        found = [
+            idx
+            for idx in range(len(self.names))
+            if self.vcpus[idx] >= min_vcpus
+            and self.memory[idx] >= min_memory
+            and self.gpus[idx] >= min_gpus
+            and (
+                architecture_code is None
+                or self.architectures[idx] == architecture_code
+            )
+        ]
+
+        return [
+            self._at(idx)
+            for idx in sorted(
+                found, key=lambda idx: (self.vcpus[idx], self.memory[idx])
+            )
+        ]
+
+    def container_instance(
+        self,
+        name: str,
+        arn: Optional[str] = None,
+        attributes: Optional[List[Attribute]] = None,
+        reserved_memory: int = 0,
+    ) -> ContainerInstance:
+        """Returns an empty container instance of the instance type, as it would register with ECS."""
+        instance_type = self.get(name)
+        arn = arn or f"{name}-planned"
+
+        return ContainerInstance(
+            arn=arn,
+            instance_id=arn,
+            cpu_remaining=instance_type.ecs_cpu,
+            cpu_total=instance_type.ecs_cpu,
+            memory_remaining=instance_type.ecs_memory(reserved_memory),
+            memory_total=instance_type.ecs_memory(reserved_memory),
+            attributes=[
+                Attribute(name="ecs.instance-type", value=name),
+                Attribute(
+                    name="ecs.cpu-architecture", value=instance_type.architecture
+                ),
+                *(attributes or []),
+            ],
+        )
+
+
+@lru_cache(maxsize=None)
+def load_catalog() -> InstanceTypeCatalog:
+    return InstanceTypeCatalog()
@@ -1,24 +1,196 @@
+import configparser
+import os
 from sys import exit
-
-import boto3
+from typing import Dict, List, Mapping, Optional
 
 from willy.exceptions import (
     NotEnoughCPUException,
     NotEnoughMemoryException,
     MissingECSAttributeException,
     NoPortsAvailableException,
+    PlacementConstraintException,
+)
+from willy.headroom import headroom as compute_headroom
+from willy.instance_types import load_catalog
+from willy.models import (
+    Attribute,
+    Cluster,
+    ContainerInstance,
+    PlacementResult,
+    Service,
+    Snapshot,
+    TaskDefinition,
+    ValidatorResult,
+)
+from willy.placement import (
+    PlacementSimulator,
+    TaskInventory,
+    common_attributes,
+    instance_shape,
+    plan_capacity,
+    select_instances,
+    simulate_drain,
 )
-from willy.models import ValidatorResult
-from willy.services import ECSService
-from willy.validators import (
-    CPUValidator,
-    MemoryValidator,
-    AttributesValidator,
-    NetworkValidator,
+from willy.services import (
+    ECSService,
+    AsyncECSService,
+    CachedECSClient,
+    ResponseCache,
+    ServiceNotFoundError,
+    SnapshotECSClient,
+    SnapshotFormatError,
+    TaskDefinitionCache,
+    expand_task_definition_files,
+    read_task_definition_files,
 )
+from willy.services.cache import DEFAULT_MAX_AGE
+from willy.validators import ValidationEngine
+
+
+BACKENDS = {"sync": ECSService, "async": AsyncECSService}
+
+
+def _config_region(profile: str, environ: Mapping[str, str]) -> str:
+    config = configparser.ConfigParser()
+    config.read(os.path.expanduser(environ.get("AWS_CONFIG_FILE", "~/.aws/config")))
+    section = profile if profile == "default" else f"profile {profile}"
+
+    return config.get(section, "region", fallback="")
+
+
+def cache_namespace(environ: Mapping[str, str] = os.environ) -> str:
+    # built from the configuration boto3 reads, not from resolved credentials: resolving the credentials of
+    # assume-role, SSO and credential-process profiles calls STS or SSO, which a warm run must not do; accounts
+    # used through environment variables all use the 'default' profile, so their static access key is included
+    profile = (
+        environ.get("AWS_PROFILE") or environ.get("AWS_DEFAULT_PROFILE") or "default"
+    )
+    region = environ.get("AWS_DEFAULT_REGION") or _config_region(profile, environ)
+    access_key = environ.get("AWS_ACCESS_KEY_ID") or "-"
+
+    return f"{profile}/{region}/{access_key}"
+
+
+def _boto3_ecs_client():
+    # boto3 takes longer to import than the rest of willy together and a snapshot or a warm cache does not need it
+    import boto3
+
+    return boto3.session.Session().client("ecs")
+
+
+def get_ecs_client(
+    cache: bool = True, max_age: float = DEFAULT_MAX_AGE, snapshot: Optional[str] = None
+):
+    if snapshot:
+        try:
+            return SnapshotECSClient.from_file(snapshot)
+        except SnapshotFormatError as exc:
+            exit(str(exc))
+
+    if not cache:
+        return _boto3_ecs_client()
+
+    return CachedECSClient(
+        ecs_client_factory=_boto3_ecs_client,
+        cache=ResponseCache(max_age=max_age),
+        namespace=cache_namespace(),
+    )
+
+
+def _fetch_snapshot(ecs_service: ECSService) -> Snapshot:
+    # a service deleted between listing and describing it ends the command with a message instead of a traceback
+    try:
+        return ecs_service.snapshot
+    except ServiceNotFoundError as exc:
+        exit(str(exc))
+
+
+def get_task_definition_cache(
+    cache: bool = True, snapshot: Optional[str] = None
+) -> Optional[TaskDefinitionCache]:
+    return TaskDefinitionCache() if cache and not snapshot else None
+
+
+def _simulate_placement(
+    cluster: Cluster, service: Service, container_instances: List[ContainerInstance]
+) -> ValidatorResult:
+    placement = PlacementSimulator(cluster.container_instances).place(
+        service, container_instances=container_instances
+    )
+    placed_on = [
+        elem for elem in container_instances if elem.arn in placement.placements
+    ]
+
+    table = f"""
+{'Instance ID':>19} | {'Replicas':>15} | {'CPU remaining':>15} | {'Memory remaining':>15} |
+{'-'*19:>19} | {'-'*15:>15} | {'-'*15:>15} | {'-'*16:>16} |
+"""
+
+    for instance in placed_on:
+        table += f"{instance.instance_id:>19} | {placement.placements[instance.arn]:>15} | {instance.cpu_remaining:>15} | {instance.memory_remaining:>16} |\n"
+
+    if placement.success:
+        message = (
+            f"Service '{service.name}' can be scheduled on the '{cluster.name}' cluster. "
+            f"All {placement.desired_count} replica(s) can be placed."
+        )
+    else:
+        message = (
+            f"Service '{service.name}' can not run on the '{cluster.name}' cluster. Only "
+            f"{placement.placed_count} of {placement.desired_count} replica(s) can be placed."
+        )
+
+    return ValidatorResult(
+        success=placement.success,
+        valid_instances=placed_on,
+        message=message,
+        verbose_message=f"{message}\n\nPlacement of the replicas of service '{service.name}':\n{table}",
+        placement=placement,
+    )
+
+
+def _check_distinct_instance(
+    cluster: Cluster, service: Service, container_instances: List[ContainerInstance]
+) -> ValidatorResult:
+    # one replica per instance, and none on instances that already run a task of the service
+    occupied = set(service.occupied_instances)
+    eligible = [elem for elem in container_instances if elem.arn not in occupied]
+    placed_count = min(service.desired_count, len(eligible))
+    placement = PlacementResult(
+        desired_count=service.desired_count,
+        placed_count=placed_count,
+        placements={elem.arn: 1 for elem in eligible[:placed_count]},
+    )
 
+    if placement.success:
+        message = (
+            f"Service '{service.name}' can be scheduled on the '{cluster.name}' cluster. "
+            f"All {placement.desired_count} replica(s) can be placed on distinct container instances."
+        )
+    else:
+        message = (
+            f"Service '{service.name}' can not run on the '{cluster.name}' cluster. Only "
+            f"{placement.placed_count} of {placement.desired_count} replica(s) can be placed, one per "
+            f"container instance ({len(occupied)} instance(s) already run a task of the service)."
+        )
 
-def will_it_fit(service_name: str, cluster_name: str, verbose: bool = False):
+    instance_ids = "\n".join(elem.instance_id for elem in eligible)
+
+    return ValidatorResult(
+        success=placement.success,
+        valid_instances=eligible,
+        message=message,
+        verbose_message=f"{message}\n\nContainer instances that can run one replica of service '{service.name}':\n{instance_ids}",
+        placement=placement,
+    )
+
+
+def check_service(
+    cluster: Cluster,
+    service: Service,
+    simulate: bool = False,
+    engine: Optional[ValidationEngine] = None,
+) -> ValidatorResult:
     # red validacija https://aws.amazon.com/blogs/compute/amazon-ecs-task-placement/
     # cpu - ovde desired count
     # memory - ovde desired count
@@ -28,46 +200,488 @@ def will_it_fit(service_name: str, cluster_name: str, verbose: bool = False):
     # custom-attributes
     # placement constraints - distinctInstance i memberOf
 
-    ecs_client = boto3.client("ecs")
-    ecs_service = ECSService(
-        ecs_client=ecs_client, cluster_name=cluster_name, service_name=service_name
+    # when simulating, the validators find the instances that can run one replica and
+    # the simulator spreads all replicas over them; with distinctInstance every replica
+    # needs an instance of its own, so instances are also checked for one replica
+    validated_service = (
+        service.model_copy(update={"desired_count": 1})
+        if simulate or service.requires_distinct_instance
+        else service
     )
 
-    validators = [CPUValidator, MemoryValidator, NetworkValidator, AttributesValidator]
-    result: ValidatorResult = ValidatorResult()
-    valid_instances = ecs_service.cluster.container_instances
-
     try:
-        for validator in validators:
-            valid_instances = [
-                elem for elem in valid_instances if elem not in result.invalid_instances
-            ]
-
-            result = validator().validate(
-                cluster=ecs_service.cluster,
-                service=ecs_service.service,
-                container_instances=valid_instances,
-            )
+        result = (engine or ValidationEngine()).validate(
+            cluster=cluster,
+            service=validated_service,
+            container_instances=cluster.container_instances,
+        )
 
-        message = f"Service '{service_name}' can be scheduled on the '{cluster_name}' cluster."
+    except (
+        NotEnoughCPUException,
+        NotEnoughMemoryException,
+        MissingECSAttributeException,
+        NoPortsAvailableException,
+        PlacementConstraintException,
+    ) as exc:
+        return ValidatorResult(
+            success=False,
+            valid_instances=exc.valid_instances,
+            invalid_instances=exc.invalid_instances,
+            message=exc.message,
+            verbose_message=exc.verbose_message,
+        )
+
+    if not result.success:
+        return result
+
+    valid_instances = result.valid_instances
+
+    if simulate:
+        return _simulate_placement(
+            cluster=cluster,
+            service=service,
+            container_instances=valid_instances,
+        )
 
-        if verbose:
-            table = f"""
+    if service.requires_distinct_instance:
+        return _check_distinct_instance(
+            cluster=cluster,
+            service=service,
+            container_instances=valid_instances,
+        )
+
+    message = (
+        f"Service '{service.name}' can be scheduled on the '{cluster.name}' cluster."
+    )
+
+    table = f"""
 {'Instance ID':>19} | {'CPU remaining':>15} | {'CPU total':>15} | {'Memory remaining':>15} | {'Memory total':>15} |
 {'-'*19:>19} | {'-'*15:>15} | {'-'*15:>15} | {'-'*16:>16} | {'-'*15:>15} |
 """
 
-            for instance in valid_instances:
-                table += f"{instance.instance_id:>15} | {instance.cpu_remaining:>15} | {instance.cpu_total: >15} | {instance.memory_remaining:>15}  | {instance.memory_total: >15} |\n"
+    for instance in valid_instances:
+        table += f"{instance.instance_id:>15} | {instance.cpu_remaining:>15} | {instance.cpu_total: >15} | {instance.memory_remaining:>15}  | {instance.memory_total: >15} |\n"
 
-            message += f"\n\nContainer instances on which service '{service_name}' can be scheduled:\n{table}"
+    return ValidatorResult(
+        success=True,
+        valid_instances=valid_instances,
+        invalid_instances=result.invalid_instances,
+        message=message,
+        verbose_message=f"{message}\n\nContainer instances on which service '{service.name}' can be scheduled:\n{table}",
+    )
 
-        print(message)
 
-    except (
-        NotEnoughCPUException,
-        NotEnoughMemoryException,
-        MissingECSAttributeException,
-        NoPortsAvailableException,
-    ) as exc:
-        exit(f"{exc.verbose_message}")
+def check_headroom(
+    cluster: Cluster, service: Service, engine: Optional[ValidationEngine] = None
+) -> ValidatorResult:
+    headroom = compute_headroom(cluster=cluster, service=service, engine=engine)
+    additional_replicas = headroom.additional_replicas
+
+    if headroom.unbounded:
+        message = (
+            f"Service '{service.name}' needs no CPU, memory or host ports; the '{cluster.name}' cluster can run "
+            f"any number of additional replicas."
+        )
+    else:
+        message = (
+            f"The '{cluster.name}' cluster can run {additional_replicas} additional replica(s) of service "
+            f"'{service.name}' (desired count {service.desired_count})."
+        )
+
+    table = f"""
+{'Instance ID':>19} | {'Replicas':>15} | {'CPU remaining':>15} | {'Memory remaining':>15} |
+{'-'*19:>19} | {'-'*15:>15} | {'-'*15:>15} | {'-'*16:>16} |
+"""
+
+    for instance in cluster.container_instances:
+        if instance.arn in headroom.replicas:
+            table += f"{instance.instance_id:>19} | {headroom.replicas[instance.arn]:>15} | {instance.cpu_remaining:>15} | {instance.memory_remaining:>16} |\n"
+
+    return ValidatorResult(
+        success=headroom.unbounded or additional_replicas > 0,
+        valid_instances=[
+            elem
+            for elem in cluster.container_instances
+            if elem.arn in headroom.replicas
+        ],
+        message=message,
+        verbose_message=f"{message}\n\nAdditional replicas of service '{service.name}' per container instance:\n{table}",
+        headroom=headroom,
+    )
+
+
+def check_services(
+    ecs_service: ECSService, simulate: bool = False, headroom: bool = False
+) -> Dict[str, ValidatorResult]:
+    snapshot = ecs_service.snapshot
+    # one engine, so the columnar view of the cluster is built once for all services
+    engine = ValidationEngine()
+
+    if headroom:
+        return {
+            service.name: check_headroom(
+                cluster=snapshot.cluster, service=service, engine=engine
+            )
+            for service in snapshot.services
+        }
+
+    return {
+        service.name: check_service(
+            cluster=snapshot.cluster, service=service, simulate=simulate, engine=engine
+        )
+        for service in snapshot.services
+    }
+
+
+def will_it_fit(
+    service_name: str,
+    cluster_name: str,
+    verbose: bool = False,
+    backend: str = "sync",
+    cache: bool = True,
+    max_age: float = DEFAULT_MAX_AGE,
+    snapshot: Optional[str] = None,
+    simulate: bool = False,
+    headroom: bool = False,
+):
+    ecs_client = get_ecs_client(cache=cache, max_age=max_age, snapshot=snapshot)
+    ecs_service = BACKENDS[backend](
+        ecs_client=ecs_client,
+        cluster_name=cluster_name,
+        service_name=service_name,
+        task_definition_cache=get_task_definition_cache(cache=cache, snapshot=snapshot),
+    )
+
+    snapshot = _fetch_snapshot(ecs_service)
+
+    if headroom:
+        result = check_headroom(cluster=snapshot.cluster, service=snapshot.service)
+    else:
+        result = check_service(
+            cluster=snapshot.cluster, service=snapshot.service, simulate=simulate
+        )
+
+    if not result.success:
+        exit(f"{result.verbose_message}")
+
+    print(result.verbose_message if verbose else result.message)
+
+
+def will_they_fit(
+    cluster_name: str,
+    service_names: Optional[List[str]] = None,
+    verbose: bool = False,
+    backend: str = "sync",
+    cache: bool = True,
+    max_age: float = DEFAULT_MAX_AGE,
+    snapshot: Optional[str] = None,
+    simulate: bool = False,
+    headroom: bool = False,
+):
+    ecs_client = get_ecs_client(cache=cache, max_age=max_age, snapshot=snapshot)
+    ecs_service = BACKENDS[backend](
+        ecs_client=ecs_client,
+        cluster_name=cluster_name,
+        service_names=service_names,
+        all_services=service_names is None,
+        task_definition_cache=get_task_definition_cache(cache=cache, snapshot=snapshot),
+    )
+
+    _fetch_snapshot(ecs_service)
+    results = check_services(ecs_service, simulate=simulate, headroom=headroom)
+
+    _report(results, cluster_name=cluster_name, verbose=verbose)
+
+
+def _report(results: Dict[str, ValidatorResult], cluster_name: str, verbose: bool):
+    for result in results.values():
+        print(result.verbose_message if verbose else result.message)
+
+    failed = [name for name, result in results.items() if not result.success]
+    summary = (
+        f"{len(results) - len(failed)} of {len(results)} services can be scheduled on the "
+        f"'{cluster_name}' cluster."
+    )
+
+    if failed:
+        exit(f"{summary} Services that can not be scheduled: {', '.join(failed)}")
+
+    print(summary)
+
+
+def check_task_definition_files(
+    cluster: Cluster,
+    file_paths: List[str],
+    desired_count: int = 1,
+    simulate: bool = False,
+    headroom: bool = False,
+) -> Dict[str, ValidatorResult]:
+    """Checks task definitions that have not been registered yet, each as a service named after its file."""
+    # one engine, so the columnar view of the cluster is built once for all files
+    engine = ValidationEngine()
+    results = {}
+
+    for file_path, task_definition in read_task_definition_files(file_paths):
+        if isinstance(task_definition, str):
+            results[file_path] = ValidatorResult(
+                success=False, message=task_definition, verbose_message=task_definition
+            )
+            continue
+
+        service = Service(
+            name=file_path,
+            arn=task_definition.arn,
+            desired_count=desired_count,
+            task_definition=task_definition,
+        )
+        results[file_path] = (
+            check_headroom(cluster=cluster, service=service, engine=engine)
+            if headroom
+            else check_service(
+                cluster=cluster, service=service, simulate=simulate, engine=engine
+            )
+        )
+
+    return results
+
+
+def will_task_definitions_fit(
+    cluster_name: str,
+    task_definition_files: List[str],
+    desired_count: int = 1,
+    verbose: bool = False,
+    backend: str = "sync",
+    cache: bool = True,
+    max_age: float = DEFAULT_MAX_AGE,
+    snapshot: Optional[str] = None,
+    simulate: bool = False,
+    headroom: bool = False,
+):
+    ecs_client = get_ecs_client(cache=cache, max_age=max_age, snapshot=snapshot)
+    # only the cluster and its container instances are needed
+    ecs_service = BACKENDS[backend](
+        ecs_client=ecs_client,
+        cluster_name=cluster_name,
+        service_names=[],
+    )
+
+    cluster = _fetch_snapshot(ecs_service).cluster
+
+    if cluster is None:
+        exit(f"Cluster '{cluster_name}' does not exist.")
+
+    results = check_task_definition_files(
+        cluster=cluster,
+        file_paths=expand_task_definition_files(task_definition_files),
+        desired_count=desired_count,
+        simulate=simulate,
+        headroom=headroom,
+    )
+
+    _report(results, cluster_name=cluster_name, verbose=verbose)
+
+
+def check_capacity_plan(
+    cluster: Cluster,
+    services: List[Service],
+    instance: ContainerInstance,
+    engine: Optional[ValidationEngine] = None,
+) -> ValidatorResult:
+    plan = plan_capacity(
+        cluster=cluster, services=services, instance=instance, engine=engine
+    )
+    shape = f"{instance.cpu_total} CPU units and {instance.memory_total} MiB of memory"
+    placeable = len(services) - len(plan.unplaceable)
+    lines = []
+
+    if plan.instances:
+        lines.append(
+            f"Add {plan.instances} container instance(s) with {shape} to the '{cluster.name}' cluster to run all "
+            f"replicas of {placeable} service(s). No placement needs fewer than {plan.lower_bound}."
+        )
+    elif placeable:
+        lines.append(
+            f"The '{cluster.name}' cluster can run all replicas of {placeable} service(s) without new container "
+            f"instances."
+        )
+
+    lines.extend(
+        f"Service '{name}' can not run on a container instance with {shape}: {reason}"
+        for name, reason in plan.unplaceable.items()
+    )
+    message = "\n".join(lines)
+
+    table = f"""
+{'Service':>40} | {'On existing':>15} | {'On new':>15} |
+{'-'*40:>40} | {'-'*15:>15} | {'-'*15:>15} |
+"""
+
+    for service in services:
+        new = sum(elem.get(service.name, 0) for elem in plan.new_instances)
+        table += f"{service.name:>40} | {plan.existing.get(service.name, 0):>15} | {new:>15} |\n"
+
+    return ValidatorResult(
+        success=plan.success,
+        message=message,
+        verbose_message=f"{message}\n\nReplicas per service:\n{table}",
+        capacity_plan=plan,
+    )
+
+
+def will_it_plan(
+    cluster_name: str,
+    cpu: Optional[int] = None,
+    memory: Optional[int] = None,
+    attributes: Optional[List[Attribute]] = None,
+    service_names: Optional[List[str]] = None,
+    verbose: bool = False,
+    backend: str = "sync",
+    cache: bool = True,
+    max_age: float = DEFAULT_MAX_AGE,
+    snapshot: Optional[str] = None,
+    instance_type: Optional[str] = None,
+):
+    instance = (
+        load_catalog().container_instance(instance_type)
+        if instance_type
+        else instance_shape(cpu=cpu, memory=memory)
+    )
+    ecs_client = get_ecs_client(cache=cache, max_age=max_age, snapshot=snapshot)
+    ecs_service = BACKENDS[backend](
+        ecs_client=ecs_client,
+        cluster_name=cluster_name,
+        service_names=service_names,
+        all_services=service_names is None,
+        task_definition_cache=get_task_definition_cache(cache=cache, snapshot=snapshot),
+    )
+
+    snapshot = _fetch_snapshot(ecs_service)
+    # new instances register the same capabilities as the ones in the cluster, unless given otherwise
+    attributes = instance.attributes + (attributes or [])
+    names = {elem.name for elem in attributes}
+    attributes = [
+        elem
+        for elem in common_attributes(snapshot.cluster.container_instances)
+        if elem.name not in names
+    ] + attributes
+    result = check_capacity_plan(
+        cluster=snapshot.cluster,
+        services=snapshot.services,
+        instance=instance.model_copy(update={"attributes": attributes}),
+    )
+
+    if not result.success:
+        exit(f"{result.verbose_message}")
+
+    print(result.verbose_message if verbose else result.message)
+
+
+def check_drain(
+    cluster: Cluster,
+    services: List[Service],
+    inventory: TaskInventory,
+    drained: List[ContainerInstance],
+    engine: Optional[ValidationEngine] = None,
+    task_definitions: Optional[Dict[str, TaskDefinition]] = None,
+) -> ValidatorResult:
+    drain = simulate_drain(
+        cluster=cluster,
+        services=services,
+        inventory=inventory,
+        drained=drained,
+        engine=engine,
+        task_definitions=task_definitions,
+    )
+    unplaced = drain.unplaced
+    instance_ids = ", ".join(elem.instance_id for elem in drained)
+
+    if drain.success:
+        message = (
+            f"All {sum(drain.displaced.values())} task(s) of {len(drain.displaced)} service(s) on {len(drained)} "
+            f"drained container instance(s) ({instance_ids}) can be placed on the rest of the '{cluster.name}' "
+            f"cluster."
+        )
+    else:
+        message = (
+            f"Draining {len(drained)} container instance(s) ({instance_ids}) of the '{cluster.name}' cluster leaves "
+            f"{len(unplaced)} service(s) without room for all their tasks: "
+            + ", ".join(
+                f"{name} ({count} of {drain.displaced[name]} task(s))"
+                for name, count in unplaced.items()
+            )
+            + "."
+        )
+
+    if drain.standalone_tasks:
+        message += f" {drain.standalone_tasks} task(s) not started by a service will be stopped."
+
+    if drain.daemon_tasks:
+        message += f" {drain.daemon_tasks} task(s) of daemon services stop with their container instances."
+
+    table = f"""
+{'Service':>40} | {'Displaced':>15} | {'Placed':>15} |
+{'-'*40:>40} | {'-'*15:>15} | {'-'*15:>15} |
+"""
+
+    for name, count in drain.displaced.items():
+        table += f"{name:>40} | {count:>15} | {drain.placed.get(name, 0):>15} |\n"
+
+    return ValidatorResult(
+        success=drain.success,
+        valid_instances=[
+            elem
+            for elem in cluster.container_instances
+            if elem.arn not in drain.drained
+        ],
+        invalid_instances=drained,
+        message=message,
+        verbose_message=f"{message}\n\nTasks of the drained container instances per service:\n{table}",
+        drain=drain,
+    )
+
+
+def will_it_drain(
+    cluster_name: str,
+    instances: Optional[List[str]] = None,
+    availability_zones: Optional[List[str]] = None,
+    percent: float = 0,
+    verbose: bool = False,
+    backend: str = "sync",
+    cache: bool = True,
+    max_age: float = DEFAULT_MAX_AGE,
+    snapshot: Optional[str] = None,
+):
+    ecs_client = get_ecs_client(cache=cache, max_age=max_age, snapshot=snapshot)
+    ecs_service = BACKENDS[backend](
+        ecs_client=ecs_client,
+        cluster_name=cluster_name,
+        all_services=True,
+        task_definition_cache=get_task_definition_cache(cache=cache, snapshot=snapshot),
+        with_tasks=True,
+    )
+
+    snapshot = _fetch_snapshot(ecs_service)
+    inventory = TaskInventory(snapshot.tasks)
+    drained = select_instances(
+        cluster=snapshot.cluster,
+        inventory=inventory,
+        instances=instances,
+        availability_zones=availability_zones,
+        percent=percent,
+    )
+
+    if not drained:
+        exit(f"No container instances of the '{cluster_name}' cluster match.")
+
+    result = check_drain(
+        cluster=snapshot.cluster,
+        services=snapshot.services,
+        inventory=inventory,
+        drained=drained,
+        task_definitions=snapshot.task_definitions,
+    )
+
+    if not result.success:
+        exit(f"{result.verbose_message}")
+
+    print(result.verbose_message if verbose else result.message)
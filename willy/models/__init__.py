@@ -9,3 +9,14 @@ from .task_definition import (
     _parse_ports,
 )
 from .validator_result import ValidatorResult
+from .ports import ports_to_mask, mask_to_ports, port_range_to_mask
+from .task import Task
+from .snapshot import Snapshot
+from .fleet import FleetTarget, FleetResult
+from .placement import (
+    CapacityPlan,
+    DrainResult,
+    PlacementResult,
+    PlacementStrategy,
+)
+from .headroom import HeadroomResult
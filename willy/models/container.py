@@ -1,6 +1,8 @@
 from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+
+from .ports import ports_to_mask
 
 
 class Container(BaseModel):
@@ -10,6 +12,14 @@ class Container(BaseModel):
     ports_tcp: List[int] = []
     ports_udp: List[int] = []
     portMappings: List[dict[str, int]] = []
+    # requested TCP and UDP host ports as a bitset, computed from ports_tcp and ports_udp
+    ports_mask: int = Field(default=0, exclude=True, repr=False)
+
+    @model_validator(mode="after")
+    def _set_ports_mask(self):
+        self.ports_mask = ports_to_mask(self.ports_tcp + self.ports_udp)
+
+        return self
 
     @property
     def all_ports(self) -> List[int]:
@@ -1,8 +1,9 @@
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 from .attribute import Attribute
+from .ports import ports_to_mask
 
 
 class ContainerInstance(BaseModel):
@@ -15,10 +16,23 @@ class ContainerInstance(BaseModel):
     attributes: List[Attribute]
     ports_tcp: Optional[List[int]] = []
     ports_udp: Optional[List[int]] = []
+    version: int = 0
+    # used TCP and UDP host ports as a bitset, computed from ports_tcp and ports_udp
+    ports_mask: int = Field(default=0, exclude=True, repr=False)
 
     class Config:
         frozen = True
 
+    @model_validator(mode="after")
+    def _set_ports_mask(self):
+        object.__setattr__(
+            self,
+            "ports_mask",
+            ports_to_mask((self.ports_tcp or []) + (self.ports_udp or [])),
+        )
+
+        return self
+
     def __contains__(self, key):
         return key == self.arn
 
@@ -37,6 +51,7 @@ class ContainerInstance(BaseModel):
                     attributes=elem["attributes"],
                     ports_tcp=elem["remainingResources"][2]["stringSetValue"],
                     ports_udp=elem["remainingResources"][3]["stringSetValue"],
+                    version=elem.get("version", 0),
                 )
             )
 
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .validator_result import ValidatorResult
+
+
+class FleetTarget(BaseModel):
+    cluster: str
+    region: Optional[str] = None
+    profile: Optional[str] = None
+
+    class Config:
+        frozen = True
+
+    def __str__(self) -> str:
+        return ":".join(
+            elem for elem in (self.cluster, self.region, self.profile) if elem
+        )
+
+    @classmethod
+    def parse_str(cls, value: str):
+        # cluster[:region[:profile]]
+        cluster, region, profile = (value.split(":") + [None, None])[:3]
+
+        return FleetTarget(
+            cluster=cluster, region=region or None, profile=profile or None
+        )
+
+
+class FleetResult(BaseModel):
+    target: FleetTarget
+    service: str
+    result: ValidatorResult
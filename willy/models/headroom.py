@@ -0,0 +1,14 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class HeadroomResult(BaseModel):
+    # container instance ARN -> number of additional replicas that fit on it, only instances with room
+    replicas: Dict[str, int] = {}
+    # a replica that needs no CPU, memory or host ports fits on an eligible instance any number of times
+    unbounded: bool = False
+
+    @property
+    def additional_replicas(self) -> Optional[int]:
+        return None if self.unbounded else sum(self.replicas.values())
@@ -0,0 +1,66 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class PlacementResult(BaseModel):
+    desired_count: int
+    placed_count: int = 0
+    # container instance ARN -> number of replicas placed on it
+    placements: Dict[str, int] = {}
+
+    @property
+    def success(self) -> bool:
+        return self.placed_count >= self.desired_count
+
+
+class CapacityPlan(BaseModel):
+    # container instances of the planned shape to add
+    instances: int = 0
+    # no packing of the replicas that did not fit on the cluster needs fewer instances
+    lower_bound: int = 0
+    # replicas placed on the existing container instances, by service name
+    existing: Dict[str, int] = {}
+    # replicas on every new container instance, by service name
+    new_instances: List[Dict[str, int]] = []
+    # services that can not run on the planned shape at all, with the reason
+    unplaceable: Dict[str, str] = {}
+
+    @property
+    def success(self) -> bool:
+        return not self.unplaceable
+
+
+class DrainResult(BaseModel):
+    # ARNs of the container instances that are drained
+    drained: List[str] = []
+    # tasks on the drained container instances, by service name
+    displaced: Dict[str, int] = {}
+    # displaced tasks that fit on the remaining container instances, by service name
+    placed: Dict[str, int] = {}
+    # tasks on the drained container instances that were not started by a service and are not restarted
+    standalone_tasks: int = 0
+    # tasks of DAEMON services on the drained container instances, which stop with their instance
+    daemon_tasks: int = 0
+
+    @property
+    def unplaced(self) -> Dict[str, int]:
+        return {
+            name: count - self.placed.get(name, 0)
+            for name, count in self.displaced.items()
+            if count > self.placed.get(name, 0)
+        }
+
+    @property
+    def success(self) -> bool:
+        return not self.unplaced
+
+
+class PlacementStrategy(BaseModel):
+    # binpack, spread or random
+    type: str
+    # cpu or memory for binpack; instanceId, host or attribute:<name> for spread
+    field: Optional[str] = None
+
+    class Config:
+        frozen = True
@@ -0,0 +1,40 @@
+from typing import Iterable, List
+
+# host ports are stored as bitsets: bit N is set when port N is used or requested, so checking whether a task's
+# ports are free on a container instance is a single AND, no matter how many ports or port ranges there are
+
+
+def port_range_to_mask(start: int, end: int) -> int:
+    return ((1 << (end - start + 1)) - 1) << start
+
+
+def ports_to_mask(ports: Iterable[int]) -> int:
+    mask = 0
+    ports = sorted(set(int(port) for port in ports))
+
+    if not ports:
+        return mask
+
+    # consecutive ports, for example from a containerPortRange, are set as one range
+    start = end = ports[0]
+
+    for port in ports[1:]:
+        if port == end + 1:
+            end = port
+            continue
+
+        mask |= port_range_to_mask(start, end)
+        start = end = port
+
+    return mask | port_range_to_mask(start, end)
+
+
+def mask_to_ports(mask: int) -> List[int]:
+    ports = []
+
+    while mask:
+        lowest = mask & -mask
+        ports.append(lowest.bit_length() - 1)
+        mask ^= lowest
+
+    return ports
@@ -3,7 +3,8 @@ from typing import List, Optional
 from pydantic import BaseModel
 
 from .attribute import Attribute
-from .task_definition import TaskDefinition
+from .placement import PlacementStrategy
+from .task_definition import TaskDefinition, _has_distinct_instance
 
 
 class Service(BaseModel):
@@ -13,7 +14,14 @@ class Service(BaseModel):
     desired_count: int = 1
     # requires_attributes: Optional[List[Dict[str, str]]]
     # placement_constraints: Optional[List[Dict[str, str]]]
-    # placement_strategy: Optional[List[Dict[str, str]]]
+    placement_strategy: List[PlacementStrategy] = []
+    # memberOf expressions set on the service, next to the ones of its task definition
+    constraint_expressions: List[str] = []
+    distinct_instance: bool = False
+    # ARNs of the container instances that already run a task of the service
+    occupied_instances: List[str] = []
+    # REPLICA or DAEMON; a daemon service runs one task on every container instance
+    scheduling_strategy: str = "REPLICA"
 
     def _parse_dict(self):
         _service = self["services"][0]
@@ -22,6 +30,16 @@ class Service(BaseModel):
             name=_service["serviceName"],
             arn=_service["serviceArn"],
             desired_count=_service["desiredCount"],
+            placement_strategy=_service.get("placementStrategy", []),
+            constraint_expressions=[
+                elem["expression"]
+                for elem in _service.get("placementConstraints", [])
+                if elem.get("type") == "memberOf" and elem.get("expression")
+            ],
+            distinct_instance=_has_distinct_instance(
+                _service.get("placementConstraints", [])
+            ),
+            scheduling_strategy=_service.get("schedulingStrategy", "REPLICA"),
         )
 
     @classmethod
@@ -48,6 +66,32 @@ class Service(BaseModel):
     def all_ports(self) -> List[int]:
         return self.task_definition.all_ports if self.task_definition else []
 
+    @property
+    def ports_mask(self) -> int:
+        return self.task_definition.ports_mask if self.task_definition else 0
+
+    @property
+    def host_ports_mask(self) -> int:
+        return self.task_definition.host_ports_mask if self.task_definition else 0
+
+    @property
+    def all_constraint_expressions(self) -> List[str]:
+        task_definition_expressions = (
+            self.task_definition.constraint_expressions if self.task_definition else []
+        )
+
+        return task_definition_expressions + self.constraint_expressions
+
+    @property
+    def is_daemon(self) -> bool:
+        return self.scheduling_strategy == "DAEMON"
+
+    @property
+    def requires_distinct_instance(self) -> bool:
+        return self.distinct_instance or bool(
+            self.task_definition and self.task_definition.distinct_instance
+        )
+
     @property
     def requires_attributes(self) -> List[Attribute]:
         return (
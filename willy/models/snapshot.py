@@ -0,0 +1,26 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from .cluster import Cluster
+from .service import Service
+from .task import Task
+from .task_definition import TaskDefinition
+
+
+class Snapshot(BaseModel):
+    """Point-in-time state of a cluster and its services, fetched once and shared by all validators."""
+
+    cluster: Optional[Cluster] = None
+    services: List[Service] = []
+    # running tasks of the cluster, only fetched when needed
+    tasks: List[Task] = []
+    # task definitions the running tasks were started from, by revision ARN, fetched along with the tasks
+    task_definitions: Dict[str, TaskDefinition] = {}
+
+    class Config:
+        frozen = True
+
+    @property
+    def service(self) -> Optional[Service]:
+        return self.services[0] if self.services else None
@@ -0,0 +1,32 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class Task(BaseModel):
+    arn: str
+    container_instance_arn: Optional[str] = None
+    # 'service:<service name>' for tasks started by a service
+    group: str = ""
+    task_definition_arn: str = ""
+
+    class Config:
+        frozen = True
+
+    @property
+    def service_name(self) -> Optional[str]:
+        return (
+            self.group.split(":", 1)[1] if self.group.startswith("service:") else None
+        )
+
+    def _parse_dict(self):
+        return Task(
+            arn=self["taskArn"],
+            container_instance_arn=self.get("containerInstanceArn"),
+            group=self.get("group", ""),
+            task_definition_arn=self.get("taskDefinitionArn", ""),
+        )
+
+    @classmethod
+    def parse_obj(cls, obj):
+        return cls._parse_dict(obj)
@@ -2,6 +2,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel
 
+from willy.constraints import Comparison, InvalidExpressionError, compile_expression
+
 from .attribute import Attribute
 from .container import Container
 
@@ -14,35 +16,103 @@ def _port_range_to_range(port_range: str):
     return range(int(start), int(end) + 1)
 
 
-def _parse_ports(container: dict) -> (List[int], List[int]):
+def _mapping_ports(mapping: dict, network_mode: str) -> List[int]:
+    try:
+        host_port = int(mapping["hostPort"])
+    except KeyError:
+        pass
+    else:
+        # a host port of 0 is dynamic, a free port from the ephemeral range is picked when the task starts
+        return [host_port] if host_port else []
+
+    try:
+        return [elem for elem in _port_range_to_range(mapping["containerPortRange"])]
+    except KeyError:
+        pass
+
+    # task definitions that are not registered yet leave out the host port; with awsvpc and host networking it is
+    # the container port, with bridge networking a free port is picked when the task starts
+    if network_mode in ("awsvpc", "host") and "containerPort" in mapping:
+        return [int(mapping["containerPort"])]
+
+    return []
+
+
+def _parse_ports(
+    container: dict, network_mode: str = "bridge"
+) -> (List[int], List[int]):
     ports_tcp = []
     ports_udp = []
 
-    for mapping in container.get("portMappings"):  # TODO: this can also be a range
-        if mapping.get("protocol") == "tcp":
-            try:
-                ports_tcp.append(int(mapping["hostPort"]))
-            except KeyError:
-                ports_tcp.extend(
-                    [
-                        elem
-                        for elem in _port_range_to_range(mapping["containerPortRange"])
-                    ]
-                )
+    for mapping in container.get("portMappings", []):  # TODO: this can also be a range
+        # register_task_definition defaults the protocol to tcp
+        if mapping.get("protocol", "tcp") == "tcp":
+            ports_tcp.extend(_mapping_ports(mapping, network_mode))
         elif mapping.get("protocol") == "udp":
-            try:
-                ports_udp.append(int(mapping["hostPort"]))
-            except KeyError:
-                ports_udp.extend(
-                    [
-                        elem
-                        for elem in _port_range_to_range(mapping["containerPortRange"])
-                    ]
-                )
+            ports_udp.extend(_mapping_ports(mapping, network_mode))
 
     return ports_tcp, ports_udp
 
 
+def _constraint_attributes(expression: str) -> Optional[List[Attribute]]:
+    # memberOf expressions on a single attribute with == or 'in' are checked like required attributes, anything
+    # else is evaluated as an expression; required attributes are compared by name and value, so 'exists' is too
+    try:
+        predicate = compile_expression(expression)
+    except InvalidExpressionError:
+        return None
+
+    if not isinstance(predicate, Comparison) or not predicate.subject.startswith(
+        "attribute:"
+    ):
+        return None
+
+    name = predicate.subject.replace("attribute:", "", 1)
+
+    if predicate.operator in ("==", "in"):
+        return [
+            Attribute(name=name, value=value, raw=expression)
+            for value in predicate.values
+        ]
+
+    return None
+
+
+def _parse_placement_constraints(
+    placement_constraints: List[dict],
+) -> (List[Attribute], List[str]):
+    attributes = []
+    expressions = []
+
+    for constraint in placement_constraints:
+        expression = constraint.get("expression")
+
+        # distinctInstance constraints have no expression
+        if constraint.get("type", "memberOf") != "memberOf" or not expression:
+            continue
+
+        constraint_attributes = _constraint_attributes(expression)
+
+        if constraint_attributes is None:
+            expressions.append(expression)
+        else:
+            attributes.extend(constraint_attributes)
+
+    return attributes, expressions
+
+
+def _parse_units(value, unit: str) -> int:
+    # register_task_definition also accepts task CPU and memory with a unit, for example "1 vCPU" or "2 GB"
+    if isinstance(value, str) and value.strip().lower().endswith(unit):
+        return int(float(value.strip()[: -len(unit)]) * 1024)
+
+    return int(value)
+
+
+def _has_distinct_instance(placement_constraints: List[dict]) -> bool:
+    return any(elem.get("type") == "distinctInstance" for elem in placement_constraints)
+
+
 class TaskDefinition(BaseModel):
     name: str
     arn: str
@@ -52,6 +122,11 @@ class TaskDefinition(BaseModel):
     placement_constraints: Optional[List[Attribute]]
     # compatibilities: List
     requires_attributes: Optional[List[Attribute]]
+    # memberOf expressions that can not be checked as required attributes, for example with !=, =~ or 'and'
+    constraint_expressions: List[str] = []
+    # every task runs on a different container instance
+    distinct_instance: bool = False
+    network_mode: str = "bridge"
     # ports: List[int] = []
 
     # For containers in a task with the awsvpc network mode, the hostPortRange is set to the same value as the
@@ -62,11 +137,14 @@ class TaskDefinition(BaseModel):
 
     def _parse_dict(self):
         containers = []
-        cpu = self.get("taskDefinition").get("cpu", 0)
-        memory = self.get("taskDefinition").get("memory", 0)
+        task_definition = self["taskDefinition"]
+        cpu = _parse_units(task_definition.get("cpu", 0), "vcpu")
+        memory = _parse_units(task_definition.get("memory", 0), "gb")
+
+        network_mode = task_definition.get("networkMode", "bridge")
 
-        for cont in self["taskDefinition"]["containerDefinitions"]:
-            ports_tcp, ports_udp = _parse_ports(cont)
+        for cont in task_definition["containerDefinitions"]:
+            ports_tcp, ports_udp = _parse_ports(cont, network_mode)
 
             container: Container = Container(
                 cpu=cont.get("cpu", 0),
@@ -78,45 +156,43 @@ class TaskDefinition(BaseModel):
 
             containers.append(container)
 
-        try:
-            attributes = [
-                Attribute.parse_obj(elem)
-                for elem in self["taskDefinition"]["requiresAttributes"]
-            ]
-
-            attributes_from_constraints = []
-
-            for constraint in self["taskDefinition"]["placementConstraints"]:
-                if "[" in constraint.get("expression") and "]" in constraint.get(
-                    "expression"
-                ):
-                    attributes_from_constraints.extend(
-                        Attribute.parse_multiple(constraint.get("expression"))
-                    )
-                else:
-                    attributes_from_constraints.append(Attribute.parse_obj(constraint))
-
-            # found_attributes = attributes + attributes_from_constraints
-            attributes.extend(
-                attr for attr in attributes_from_constraints if attr not in attributes
+        attributes = [
+            Attribute.parse_obj(elem)
+            for elem in task_definition.get("requiresAttributes", [])
+        ]
+        attributes_from_constraints, constraint_expressions = (
+            _parse_placement_constraints(
+                task_definition.get("placementConstraints", [])
             )
+        )
+        attributes.extend(
+            attr for attr in attributes_from_constraints if attr not in attributes
+        )
 
-        except KeyError:
-            found_attributes = []
+        # task definitions that have not been registered yet have a family but no ARN
+        arn = task_definition.get("taskDefinitionArn", "")
 
         return TaskDefinition(
-            name=self["taskDefinition"]["taskDefinitionArn"].split("/")[1],
-            arn=self["taskDefinition"]["taskDefinitionArn"],
+            name=arn.split("/")[1] if arn else task_definition["family"],
+            arn=arn,
             containers=containers,
             requires_attributes=attributes,
             placement_constraints=attributes_from_constraints,
-            ports=[elem.all_ports for elem in containers][0],
+            constraint_expressions=constraint_expressions,
+            distinct_instance=_has_distinct_instance(
+                task_definition.get("placementConstraints", [])
+            ),
             cpu=cpu,
             memory=memory,
+            network_mode=network_mode,
         )
 
     @classmethod
     def parse_obj(cls, obj):
+        # the input of register_task_definition is the task definition itself, describe_task_definition wraps it
+        if "taskDefinition" not in obj:
+            obj = {"taskDefinition": obj}
+
         return cls._parse_dict(obj)
 
     @property
@@ -145,3 +221,20 @@ class TaskDefinition(BaseModel):
             all_ports += container.all_ports
 
         return list(set(all_ports))
+
+    @property
+    def ports_mask(self) -> int:
+        ports_mask = 0
+
+        for container in self.containers:
+            ports_mask |= container.ports_mask
+
+        return ports_mask
+
+    @property
+    def host_ports_mask(self) -> int:
+        """Ports bound on the container instance itself, which one task per instance can use.
+
+        Tasks with the awsvpc network mode get a network interface of their own and never share host ports.
+        """
+        return 0 if self.network_mode == "awsvpc" else self.ports_mask
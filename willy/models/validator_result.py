@@ -1,7 +1,10 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
+from .headroom import HeadroomResult
+from .placement import CapacityPlan, DrainResult, PlacementResult
+
 
 class ValidatorResult(BaseModel):
     success: bool = False
@@ -9,3 +12,7 @@ class ValidatorResult(BaseModel):
     invalid_instances: List = []
     message: str = ""
     verbose_message: str = ""
+    placement: Optional[PlacementResult] = None
+    headroom: Optional[HeadroomResult] = None
+    capacity_plan: Optional[CapacityPlan] = None
+    drain: Optional[DrainResult] = None
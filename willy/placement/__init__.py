@@ -0,0 +1,8 @@
+from .simulator import DEFAULT_PLACEMENT_STRATEGY, PlacementSimulator, TaskShape
+from .planner import (
+    common_attributes,
+    first_fit_decreasing,
+    instance_shape,
+    plan_capacity,
+)
+from .drain import TaskInventory, select_instances, simulate_drain
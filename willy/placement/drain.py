@@ -0,0 +1,179 @@
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+
+from willy.headroom import ELIGIBILITY_VALIDATORS
+from willy.models import (
+    Cluster,
+    ContainerInstance,
+    DrainResult,
+    Service,
+    Task,
+    TaskDefinition,
+)
+from willy.validators import ValidationEngine
+
+from .simulator import PlacementSimulator, TaskShape
+
+
+class TaskInventory:
+    """Running tasks of a cluster, grouped by container instance and by service.
+
+    Built once per snapshot, so any number of drain scenarios can be evaluated without going through the tasks
+    again.
+    """
+
+    def __init__(self, tasks: List[Task]):
+        self.tasks = list(tasks)
+        self.by_instance: Dict[str, List[Task]] = defaultdict(list)
+        # container instances that run a task of the service, by service name
+        self.instances_by_service: Dict[str, Set[str]] = defaultdict(set)
+
+        for task in self.tasks:
+            if not task.container_instance_arn:
+                continue
+
+            self.by_instance[task.container_instance_arn].append(task)
+
+            if task.service_name:
+                self.instances_by_service[task.service_name].add(
+                    task.container_instance_arn
+                )
+
+    def tasks_on(self, container_instance_arn: str) -> List[Task]:
+        return self.by_instance.get(container_instance_arn, [])
+
+    def displaced(self, drained: Set[str]) -> Counter:
+        """Returns the number of tasks on the drained container instances by service name, None for standalone
+        tasks."""
+        return Counter(
+            task.service_name for arn in drained for task in self.tasks_on(arn)
+        )
+
+    def displaced_revisions(self, drained: Set[str]) -> Counter:
+        """Returns the number of service tasks on the drained container instances by service name and the task
+        definition revision they run."""
+        return Counter(
+            (task.service_name, task.task_definition_arn)
+            for arn in drained
+            for task in self.tasks_on(arn)
+            if task.service_name
+        )
+
+
+def select_instances(
+    cluster: Cluster,
+    inventory: TaskInventory,
+    instances: Optional[List[str]] = None,
+    availability_zones: Optional[List[str]] = None,
+    percent: float = 0,
+) -> List[ContainerInstance]:
+    """Returns the container instances to drain, in cluster order.
+
+    `instances` are EC2 instance IDs or container instance ARNs. `percent` selects that share of the container
+    instances, rounded up, starting with the ones that run the most tasks.
+    """
+    wanted = set(instances or [])
+    zones = set(availability_zones or [])
+    selected = {
+        elem.arn
+        for elem in cluster.container_instances
+        if elem.instance_id in wanted
+        or elem.arn in wanted
+        or any(
+            attribute.name == "ecs.availability-zone" and attribute.value in zones
+            for attribute in elem.attributes
+        )
+    }
+
+    if percent:
+        busiest = sorted(
+            cluster.container_instances,
+            key=lambda elem: len(inventory.tasks_on(elem.arn)),
+            reverse=True,
+        )
+        selected.update(
+            elem.arn
+            for elem in busiest[
+                : math.ceil(len(cluster.container_instances) * percent / 100)
+            ]
+        )
+
+    return [elem for elem in cluster.container_instances if elem.arn in selected]
+
+
+def simulate_drain(
+    cluster: Cluster,
+    services: List[Service],
+    inventory: TaskInventory,
+    drained: List[ContainerInstance],
+    engine: Optional[ValidationEngine] = None,
+    task_definitions: Optional[Dict[str, TaskDefinition]] = None,
+) -> DrainResult:
+    """Re-homes the tasks of the drained container instances onto the free capacity of the others.
+
+    Tasks are sized by the task definition revision they run, looked up in `task_definitions`, and by the current
+    task definition of their service when the revision is not known. Tasks of DAEMON services stop with their
+    instance and are only counted.
+
+    Services are placed largest task first, all into one placement simulator, so they compete for the same free
+    capacity. Which container instances can run a service at all is decided on the whole cluster, so the engine's
+    indexes are built once and shared by every service and scenario; the drained instances are left out
+    afterwards. A service with a distinctInstance constraint is not placed on instances that run one of its tasks.
+    """
+    engine = engine or ValidationEngine()
+    task_definitions = task_definitions or {}
+    drained_arns = {elem.arn for elem in drained}
+    displaced = inventory.displaced(drained_arns)
+    by_name = {elem.name: elem for elem in services}
+    daemons = {name for name, elem in by_name.items() if elem.is_daemon}
+    simulator = PlacementSimulator(cluster.container_instances)
+    result = DrainResult(
+        drained=[elem.arn for elem in drained],
+        standalone_tasks=displaced.pop(None, 0),
+        daemon_tasks=sum(displaced.pop(name, 0) for name in daemons),
+        displaced=dict(displaced),
+    )
+
+    replicas: List[tuple] = []
+
+    for (name, revision), count in inventory.displaced_revisions(drained_arns).items():
+        if name not in by_name or name in daemons:
+            continue
+
+        service = by_name[name].model_copy(
+            update={
+                "desired_count": 1,
+                "occupied_instances": sorted(
+                    inventory.instances_by_service[name] - drained_arns
+                ),
+                "task_definition": task_definitions.get(
+                    revision, by_name[name].task_definition
+                ),
+            }
+        )
+        replicas.append((TaskShape.from_service(service), name, service, count))
+
+    for _, name, service, count in sorted(
+        replicas, key=lambda elem: elem[:2], reverse=True
+    ):
+        eligible = [
+            container_instance
+            for accepted, container_instance in zip(
+                engine.accepted(
+                    cluster=cluster,
+                    service=service,
+                    validators=ELIGIBILITY_VALIDATORS,
+                ),
+                cluster.container_instances,
+            )
+            if accepted and container_instance.arn not in drained_arns
+        ]
+        result.placed[name] = (
+            result.placed.get(name, 0)
+            + simulator.place(
+                service, count=count, container_instances=eligible
+            ).placed_count
+        )
+
+    return result
@@ -0,0 +1,239 @@
+import math
+from typing import Dict, List, NamedTuple, Optional
+
+from willy.columnar import numpy
+from willy.headroom import ELIGIBILITY_VALIDATORS
+from willy.models import (
+    Attribute,
+    CapacityPlan,
+    Cluster,
+    ContainerInstance,
+    Service,
+)
+from willy.validators import ValidationEngine
+from willy.validators.engine import DEFAULT_VALIDATORS
+
+from .simulator import PlacementSimulator, TaskShape
+
+PLANNED_INSTANCE_ARN = "planned"
+
+
+class _Replica(NamedTuple):
+    size: float
+    service: str
+    shape: TaskShape
+    distinct: bool
+
+
+def instance_shape(
+    cpu: int, memory: int, attributes: Optional[List[Attribute]] = None
+) -> ContainerInstance:
+    """Returns an empty container instance with `cpu` CPU units and `memory` MiB to plan with."""
+    return ContainerInstance(
+        arn=PLANNED_INSTANCE_ARN,
+        instance_id=PLANNED_INSTANCE_ARN,
+        cpu_remaining=cpu,
+        cpu_total=cpu,
+        memory_remaining=memory,
+        memory_total=memory,
+        attributes=attributes or [],
+    )
+
+
+def common_attributes(
+    container_instances: List[ContainerInstance],
+) -> List[Attribute]:
+    """Returns the attributes, such as ECS agent capabilities, that every container instance has."""
+    if not container_instances:
+        return []
+
+    common = set.intersection(
+        *[
+            {(attribute.name, attribute.value) for attribute in elem.attributes}
+            for elem in container_instances
+        ]
+    )
+
+    return [
+        attribute
+        for attribute in container_instances[0].attributes
+        if (attribute.name, attribute.value) in common
+    ]
+
+
+def _size(shape: TaskShape, instance: ContainerInstance) -> float:
+    # the share of the instance a replica takes in its scarcest resource
+    return max(
+        shape.cpu / instance.cpu_total if instance.cpu_total else 0,
+        shape.memory / instance.memory_total if instance.memory_total else 0,
+    )
+
+
+def _rejection(
+    cluster: Cluster, service: Service, instance: ContainerInstance
+) -> Optional[str]:
+    # the reason a single replica can not run on an empty instance of the shape
+    single = service.model_copy(update={"desired_count": 1})
+
+    for validator in DEFAULT_VALIDATORS:
+        reason = validator().check_instance(
+            cluster=cluster, service=single, container_instance=instance
+        )
+
+        if reason:
+            return reason
+
+    return None
+
+
+def _instances_needed(needed: int, per_instance: int) -> int:
+    return math.ceil(needed / per_instance) if per_instance else 0
+
+
+def lower_bound(replicas: List[_Replica], instance: ContainerInstance) -> int:
+    """No packing of the replicas on instances of the shape needs fewer instances than this."""
+    if not replicas:
+        return 0
+
+    bound = max(
+        _instances_needed(sum(elem.shape.cpu for elem in replicas), instance.cpu_total),
+        _instances_needed(
+            sum(elem.shape.memory for elem in replicas), instance.memory_total
+        ),
+    )
+
+    # replicas of a service with host ports or distinctInstance need an instance each
+    per_instance: Dict[str, int] = {}
+
+    for elem in replicas:
+        if elem.shape.ports or elem.distinct:
+            per_instance[elem.service] = per_instance.get(elem.service, 0) + 1
+
+    return max([bound, *per_instance.values()])
+
+
+def first_fit_decreasing(
+    replicas: List[_Replica], instance: ContainerInstance
+) -> List[Dict[str, int]]:
+    """Packs the replicas, largest first, onto the first new instance they fit on, opening instances as needed.
+
+    Free CPU and memory of the open instances are kept in arrays, so finding the instances a replica fits on is
+    one vectorized comparison when NumPy is installed. CPU is compared with >= and memory with >, like the CPU
+    and memory validators do. Host ports and distinctInstance are then checked on those
+    instances only.
+    """
+    size = len(replicas)
+    cpu_left = [instance.cpu_total] * size
+    memory_left = [instance.memory_total] * size
+
+    if numpy is not None:
+        cpu_left = numpy.array(cpu_left, dtype=numpy.int64)
+        memory_left = numpy.array(memory_left, dtype=numpy.int64)
+
+    ports_used: List[int] = []
+    placements: List[Dict[str, int]] = []
+
+    for replica in sorted(replicas, key=lambda elem: elem.size, reverse=True):
+        shape = replica.shape
+
+        if numpy is not None:
+            fitting = numpy.flatnonzero(
+                (cpu_left[: len(placements)] >= shape.cpu)
+                & (memory_left[: len(placements)] > shape.memory)
+            ).tolist()
+        else:
+            fitting = [
+                idx
+                for idx in range(len(placements))
+                if cpu_left[idx] >= shape.cpu and memory_left[idx] > shape.memory
+            ]
+
+        idx = next(
+            (
+                idx
+                for idx in fitting
+                if not ports_used[idx] & shape.ports
+                and not (replica.distinct and replica.service in placements[idx])
+            ),
+            len(placements),
+        )
+
+        if idx == len(placements):
+            ports_used.append(0)
+            placements.append({})
+
+        cpu_left[idx] -= shape.cpu
+        memory_left[idx] -= shape.memory
+        ports_used[idx] |= shape.ports
+        placements[idx][replica.service] = placements[idx].get(replica.service, 0) + 1
+
+    return placements
+
+
+def plan_capacity(
+    cluster: Cluster,
+    services: List[Service],
+    instance: ContainerInstance,
+    engine: Optional[ValidationEngine] = None,
+) -> CapacityPlan:
+    """Computes how many container instances like `instance` to add so that all replicas of the services run.
+
+    Replicas are first placed on the free capacity of the cluster with the placement simulator, larger services
+    first. The rest is packed onto new instances with first-fit-decreasing. Services that can not run on an empty
+    instance of the shape, because of its attributes or size, are reported instead of planned.
+    """
+    engine = engine or ValidationEngine()
+    simulator = PlacementSimulator(cluster.container_instances)
+    plan = CapacityPlan()
+    replicas: List[_Replica] = []
+
+    for service in sorted(
+        services,
+        key=lambda elem: _size(TaskShape.from_service(elem), instance),
+        reverse=True,
+    ):
+        eligible = [
+            container_instance
+            for accepted, container_instance in zip(
+                engine.accepted(
+                    cluster=cluster,
+                    service=service.model_copy(update={"desired_count": 1}),
+                    validators=ELIGIBILITY_VALIDATORS,
+                ),
+                cluster.container_instances,
+            )
+            if accepted
+        ]
+        placed_count = simulator.place(
+            service, container_instances=eligible
+        ).placed_count
+        plan.existing[service.name] = placed_count
+        remaining = service.desired_count - placed_count
+
+        if remaining <= 0:
+            continue
+
+        reason = _rejection(cluster, service, instance)
+
+        if reason:
+            plan.unplaceable[service.name] = reason
+            continue
+
+        shape = TaskShape.from_service(service)
+        replicas.extend(
+            [
+                _Replica(
+                    size=_size(shape, instance),
+                    service=service.name,
+                    shape=shape,
+                    distinct=service.requires_distinct_instance,
+                )
+            ]
+            * remaining
+        )
+
+    plan.new_instances = first_fit_decreasing(replicas, instance)
+    plan.instances = len(plan.new_instances)
+    plan.lower_bound = lower_bound(replicas, instance)
+
+    return plan
@@ -0,0 +1,216 @@
+import heapq
+import random
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from willy.models import (
+    ContainerInstance,
+    PlacementResult,
+    PlacementStrategy,
+    Service,
+)
+
+UNLIMITED = float("inf")
+
+# what the ECS service scheduler does for services without a placement strategy
+DEFAULT_PLACEMENT_STRATEGY = [
+    PlacementStrategy(type="spread", field="attribute:ecs.availability-zone"),
+    PlacementStrategy(type="spread", field="instanceId"),
+]
+
+
+class TaskShape(NamedTuple):
+    cpu: int
+    memory: int
+    # requested static host ports as a bitset
+    ports: int
+
+    @classmethod
+    def from_service(cls, service: Service):
+        return cls(
+            cpu=service.task_definition.total_cpu_needed,
+            memory=service.task_definition.total_memory_needed,
+            ports=service.host_ports_mask,
+        )
+
+
+def _is_instance_spread(strategy: PlacementStrategy) -> bool:
+    return strategy.type == "spread" and (strategy.field or "").lower() in (
+        "instanceid",
+        "host",
+    )
+
+
+def _attribute_value(container_instance: ContainerInstance, field: str):
+    name = field.replace("attribute:", "", 1)
+
+    for attribute in container_instance.attributes:
+        if attribute.name == name:
+            return attribute.value
+
+    return None
+
+
+class PlacementSimulator:
+    """Places the replicas of services one by one onto container instances.
+
+    Remaining CPU, memory and used host ports are tracked per instance and decremented on every placement, so
+    one simulator can place several services against the same free capacity.
+    """
+
+    def __init__(self, container_instances: List[ContainerInstance], seed: int = 0):
+        self.container_instances = container_instances
+        self.cpu_remaining = [ci.cpu_remaining for ci in container_instances]
+        self.memory_remaining = [ci.memory_remaining for ci in container_instances]
+        self.ports_used = [ci.ports_mask for ci in container_instances]
+        self._index = {ci.arn: idx for idx, ci in enumerate(container_instances)}
+        # instances that run a task of a service with a distinctInstance constraint, by service name
+        self._occupied: Dict[str, Set[int]] = {}
+        self._random = random.Random(seed)
+
+    def capacity(self, idx: int, shape: TaskShape) -> float:
+        """Number of additional tasks of `shape` that fit on the instance at `idx`.
+
+        CPU is checked with >= and memory with >, like the CPU and memory validators do.
+        """
+        capacity = min(
+            self.cpu_remaining[idx] // shape.cpu if shape.cpu else UNLIMITED,
+            (
+                (self.memory_remaining[idx] - 1) // shape.memory
+                if shape.memory
+                else UNLIMITED
+            ),
+        )
+
+        # a static host port can be bound by one task per instance only
+        if shape.ports:
+            capacity = min(capacity, 0 if self.ports_used[idx] & shape.ports else 1)
+
+        return max(capacity, 0)
+
+    def _place_one(self, idx: int, shape: TaskShape):
+        self.cpu_remaining[idx] -= shape.cpu
+        self.memory_remaining[idx] -= shape.memory
+        self.ports_used[idx] |= shape.ports
+
+    def _instance_key(
+        self, idx: int, strategies: List[PlacementStrategy], placed: Dict[int, int]
+    ) -> tuple:
+        # smaller keys are preferred; later strategies break ties of earlier ones, the instance order breaks the rest
+        key = []
+
+        for strategy in strategies:
+            if strategy.type == "binpack":
+                key.append(
+                    self.memory_remaining[idx]
+                    if strategy.field == "memory"
+                    else self.cpu_remaining[idx]
+                )
+            elif strategy.type == "random":
+                key.append(self._random.random())
+            elif _is_instance_spread(strategy):
+                key.append(placed.get(idx, 0))
+
+        return (*key, idx)
+
+    def place(
+        self,
+        service: Service,
+        count: Optional[int] = None,
+        container_instances: Optional[List[ContainerInstance]] = None,
+        strategies: Optional[List[PlacementStrategy]] = None,
+    ) -> PlacementResult:
+        """Places `count` (by default `desired_count`) replicas of `service`.
+
+        Only `container_instances` (by default all instances of the simulator) are considered, which lets the
+        caller exclude instances that fail other checks, such as attributes. Instances are chosen with
+        `strategies`, by default the placement strategy of the service:
+
+        * a leading spread on an attribute groups the instances into one bucket per attribute value and always
+          places into the bucket with the fewest replicas so far (a heap of buckets);
+        * within a bucket, every instance is kept in a heap keyed on the remaining strategies: remaining CPU or
+          memory for binpack, replicas placed for spread on instanceId/host and a random number for random.
+
+        Only the instance that received a replica changes its key, so each placement costs O(log n). A spread on
+        an attribute that is not the first strategy is not emulated.
+
+        A service with a distinctInstance constraint gets at most one replica per instance and none on instances
+        that already run one of its tasks, either in ECS (`occupied_instances`) or from an earlier `place` call.
+        """
+        count = service.desired_count if count is None else count
+        shape = TaskShape.from_service(service)
+        strategies = (
+            strategies or service.placement_strategy or DEFAULT_PLACEMENT_STRATEGY
+        )
+        candidates = (
+            range(len(self.container_instances))
+            if container_instances is None
+            else [self._index[ci.arn] for ci in container_instances]
+        )
+        result = PlacementResult(desired_count=count)
+
+        bucket_field = None
+
+        if (
+            strategies[0].type == "spread"
+            and strategies[0].field
+            and not _is_instance_spread(strategies[0])
+        ):
+            bucket_field, strategies = strategies[0].field, strategies[1:]
+
+        distinct = service.requires_distinct_instance
+        occupied = (
+            self._occupied.setdefault(
+                service.name,
+                {
+                    self._index[arn]
+                    for arn in service.occupied_instances
+                    if arn in self._index
+                },
+            )
+            if distinct
+            else set()
+        )
+
+        placed: Dict[int, int] = {}
+        buckets: Dict[object, list] = {}
+
+        for idx in candidates:
+            if idx not in occupied and self.capacity(idx, shape) > 0:
+                value = (
+                    _attribute_value(self.container_instances[idx], bucket_field)
+                    if bucket_field
+                    else None
+                )
+                buckets.setdefault(value, []).append(
+                    (self._instance_key(idx, strategies, placed), idx)
+                )
+
+        for instances in buckets.values():
+            heapq.heapify(instances)
+
+        # (replicas placed in the bucket, first-seen order, bucket value)
+        bucket_heap = [(0, order, value) for order, value in enumerate(buckets)]
+
+        while result.placed_count < count and bucket_heap:
+            bucket_count, order, value = heapq.heappop(bucket_heap)
+            instances = buckets[value]
+
+            _, idx = heapq.heappop(instances)
+            self._place_one(idx, shape)
+            placed[idx] = placed.get(idx, 0) + 1
+
+            arn = self.container_instances[idx].arn
+            result.placements[arn] = result.placements.get(arn, 0) + 1
+            result.placed_count += 1
+
+            if distinct:
+                occupied.add(idx)
+            elif self.capacity(idx, shape) > 0:
+                heapq.heappush(
+                    instances, (self._instance_key(idx, strategies, placed), idx)
+                )
+
+            if instances:
+                heapq.heappush(bucket_heap, (bucket_count + 1, order, value))
+
+        return result
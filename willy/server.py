@@ -0,0 +1,215 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from willy.main import check_service
+from willy.models import Service, TaskDefinition
+from willy.services import ECSService, ServiceNotFoundError, TaskDefinitionCache
+
+DEFAULT_REFRESH_INTERVAL = 30
+# ECS errors that mean the requested resource does not exist, everything else is reported as a bad gateway
+NOT_FOUND_ERROR_CODES = {"ClusterNotFoundException", "ServiceNotFoundException"}
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """Keeps a snapshot of every cluster that has been checked, refreshed in the background."""
+
+    def __init__(
+        self,
+        ecs_client,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        task_definition_cache: Optional[TaskDefinitionCache] = None,
+    ):
+        self.ecs_client = ecs_client
+        self.refresh_interval = refresh_interval
+        self.task_definition_cache = task_definition_cache
+        self._ecs_services: Dict[str, ECSService] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, cluster_name: str) -> ECSService:
+        """Returns the kept ECSService of the cluster, fetching it on the first request.
+
+        A cluster is only kept, and refreshed in the background, once it has been fetched and exists, so
+        requests for unknown clusters do not end up in the refresh loop. Errors of the first fetch are raised.
+        """
+        with self._lock:
+            ecs_service = self._ecs_services.get(cluster_name)
+
+        if ecs_service is not None:
+            return ecs_service
+
+        ecs_service = ECSService(
+            ecs_client=self.ecs_client,
+            cluster_name=cluster_name,
+            all_services=True,
+            task_definition_cache=self.task_definition_cache,
+        )
+
+        if ecs_service.refresh().cluster is None:
+            return ecs_service
+
+        # concurrent first reads may fetch the cluster twice, the first one to finish is kept
+        with self._lock:
+            return self._ecs_services.setdefault(cluster_name, ecs_service)
+
+    @property
+    def cluster_names(self) -> List[str]:
+        with self._lock:
+            return list(self._ecs_services)
+
+    def refresh_all(self):
+        with self._lock:
+            ecs_services = list(self._ecs_services.values())
+
+        for ecs_service in ecs_services:
+            # a failed refresh keeps the previous snapshot of the cluster and does not stop the others
+            try:
+                ecs_service.refresh()
+            except Exception:
+                logger.exception(
+                    "Refreshing the '%s' cluster failed", ecs_service.cluster_name
+                )
+
+    def _run(self):
+        while not self._stopped.wait(self.refresh_interval):
+            self.refresh_all()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+
+def _check(store: SnapshotStore, body: dict) -> Tuple[int, dict]:
+    if not body.get("cluster"):
+        return 400, {"error": "'cluster' is required."}
+
+    snapshot = store.get(body["cluster"]).snapshot
+
+    if snapshot.cluster is None:
+        return 404, {"error": f"Cluster '{body['cluster']}' does not exist."}
+
+    if body.get("task_definition"):
+        task_definition = TaskDefinition.parse_obj(body["task_definition"])
+        service = Service(
+            name=task_definition.name,
+            arn=task_definition.arn,
+            desired_count=body.get("desired_count", 1),
+            task_definition=task_definition,
+        )
+
+    elif body.get("service"):
+        service = next(
+            (elem for elem in snapshot.services if elem.name == body["service"]), None
+        )
+
+        if service is None:
+            return 404, {"error": f"Service named '{body['service']}' doesn't exist."}
+
+    else:
+        return 400, {"error": "One of 'service' or 'task_definition' is required."}
+
+    result = check_service(cluster=snapshot.cluster, service=service)
+
+    return 200, result.model_dump(mode="json")
+
+
+class _CheckHandler(BaseHTTPRequestHandler):
+    server: "CheckServer"
+
+    def _respond(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path != "/healthz":
+            return self._respond(404, {"error": f"'{self.path}' not found."})
+
+        self._respond(200, {"clusters": self.server.store.cluster_names})
+
+    def do_POST(self):
+        if self.path != "/check":
+            return self._respond(404, {"error": f"'{self.path}' not found."})
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._respond(400, {"error": "Request body is not valid JSON."})
+
+        try:
+            self._respond(*_check(self.server.store, body))
+        except ClientError as exc:
+            status = (
+                404
+                if exc.response.get("Error", {}).get("Code") in NOT_FOUND_ERROR_CODES
+                else 502
+            )
+            self._respond(status, {"error": f"ECS error: {exc}"})
+        except ServiceNotFoundError as exc:
+            self._respond(404, {"error": str(exc)})
+        except BotoCoreError as exc:
+            self._respond(502, {"error": f"ECS error: {exc}"})
+        except (KeyError, TypeError, ValueError) as exc:
+            self._respond(400, {"error": f"Invalid request: {exc}"})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class CheckServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, address: Tuple[str, int], store: SnapshotStore, verbose: bool = False
+    ):
+        super().__init__(address, _CheckHandler)
+        self.store = store
+        self.verbose = verbose
+
+
+def serve(
+    ecs_client_factory: Callable,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    cluster_names: Optional[List[str]] = None,
+    verbose: bool = False,
+):
+    store = SnapshotStore(
+        ecs_client=ecs_client_factory(),
+        refresh_interval=refresh_interval,
+        task_definition_cache=TaskDefinitionCache(),
+    )
+
+    for cluster_name in cluster_names or []:
+        store.get(cluster_name)
+
+    store.start()
+    server = CheckServer((host, port), store=store, verbose=verbose)
+
+    print(f"Listening on http://{host}:{server.server_address[1]}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.stop()
+        server.server_close()
@@ -1 +1,15 @@
-from .ecs import ECSService
+from .ecs import ECSService, ServiceNotFoundError
+from .ecs_async import AsyncECSService
+from .cache import CachedECSClient, ResponseCache
+from .snapshot_file import (
+    SnapshotECSClient,
+    SnapshotFormatError,
+    capture_snapshot,
+    write_snapshot,
+)
+from .task_definition_cache import TaskDefinitionCache
+from .task_definition_file import (
+    expand_task_definition_files,
+    read_task_definition_file,
+    read_task_definition_files,
+)
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Optional, Union
+
+from willy.defaults import DEFAULT_MAX_AGE
+
+CACHED_OPERATIONS = {
+    "describe_clusters",
+    "list_container_instances",
+    "describe_container_instances",
+    "list_services",
+    "describe_services",
+    "describe_task_definition",
+    "list_tasks",
+    "describe_tasks",
+}
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# the cache directory is scanned on the first write and then after every this many writes
+DEFAULT_EVICT_EVERY = 500
+
+
+def _default_cache_dir() -> Path:
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "willy"
+
+
+class ResponseCache:
+    """Raw ECS API responses stored as JSON files, one file per request.
+
+    Entries older than `max_age` seconds are ignored and removed. On the first write and after every
+    `evict_every` writes, the oldest entries are evicted until the cache holds at most `max_entries` files and
+    `max_bytes` bytes, so a cold run does not scan the directory once per response.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        evict_every: int = DEFAULT_EVICT_EVERY,
+    ):
+        self.directory = Path(directory) if directory else _default_cache_dir()
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._puts = 0
+        self._lock = Lock()
+
+    @staticmethod
+    def key(namespace: str, operation: str, kwargs: dict) -> str:
+        return hashlib.sha256(
+            json.dumps([namespace, operation, kwargs], sort_keys=True).encode()
+        ).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                return None
+
+            with open(path, "r") as input_file:
+                return json.load(input_file)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, response: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # a temporary file per write, so threads writing the same key do not clobber each other's file
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.directory, prefix=f".{key}.", suffix=".tmp"
+        )
+
+        try:
+            # datetimes (e.g. registeredAt) are not needed by willy and are stored as strings
+            with os.fdopen(fd, "w") as output_file:
+                json.dump(response, output_file, default=str)
+
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            evict = self._puts % self.evict_every == 0
+            self._puts += 1
+
+        if evict:
+            self.evict()
+
+    def evict(self):
+        entries = []
+
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        now = time.time()
+        total_bytes = sum(size for _, size, _ in entries)
+
+        for idx, (mtime, size, path) in enumerate(entries):
+            remaining = len(entries) - idx
+
+            if (
+                now - mtime <= self.max_age
+                and remaining <= self.max_entries
+                and total_bytes <= self.max_bytes
+            ):
+                break
+
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+
+    def clear(self):
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+class CachedECSClient:
+    """Wraps a boto3 ECS client and serves the read-only calls willy makes from a ResponseCache.
+
+    The client is built by `ecs_client_factory` on the first call the cache can not answer, so a run served
+    entirely from the cache does not import boto3. `namespace` separates the entries of different accounts and
+    regions; the cluster, service and other request parameters are part of every cache key.
+    """
+
+    def __init__(
+        self,
+        ecs_client_factory: Callable[[], Any],
+        cache: ResponseCache,
+        namespace: str,
+    ):
+        self.ecs_client_factory = ecs_client_factory
+        self.cache = cache
+        self.namespace = namespace
+        self._ecs_client = None
+        self._lock = Lock()
+
+    @property
+    def ecs_client(self):
+        # the async backend calls the client from worker threads, only one of them builds it
+        with self._lock:
+            if self._ecs_client is None:
+                self._ecs_client = self.ecs_client_factory()
+
+        return self._ecs_client
+
+    def __getattr__(self, name: str):
+        if name not in CACHED_OPERATIONS:
+            return getattr(self.ecs_client, name)
+
+        def call(**kwargs):
+            key = self.cache.key(self.namespace, name, kwargs)
+            response = self.cache.get(key)
+
+            if response is None:
+                response = getattr(self.ecs_client, name)(**kwargs)
+                self.cache.put(key, response)
+
+            return response
+
+        return call
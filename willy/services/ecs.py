@@ -1,22 +1,86 @@
-from sys import exit
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
 
-import boto3
+from willy.models import (
+    Cluster,
+    TaskDefinition,
+    ContainerInstance,
+    Service,
+    Snapshot,
+    Task,
+)
 
-from willy.models import Cluster, TaskDefinition, ContainerInstance, Service
+if TYPE_CHECKING:
+    import boto3
+
+LIST_CONTAINER_INSTANCES_PAGE_SIZE = 100
+DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE = 100
+LIST_SERVICES_PAGE_SIZE = 100
+DESCRIBE_SERVICES_BATCH_SIZE = 10
+LIST_TASKS_PAGE_SIZE = 100
+DESCRIBE_TASKS_BATCH_SIZE = 100
+MAX_WORKERS = 8
+
+
+class ServiceNotFoundError(LookupError):
+    """A service that was asked for, or listed a moment earlier, is not returned by describe_services."""
+
+
+def _parse_container_instance(ci: dict) -> ContainerInstance:
+    return ContainerInstance(
+        arn=ci.get("containerInstanceArn"),
+        cpu_remaining=ci.get("remainingResources")[0].get("integerValue"),
+        memory_remaining=ci.get("remainingResources")[1].get("integerValue"),
+        cpu_total=ci.get("registeredResources")[0].get("integerValue"),
+        memory_total=ci.get("registeredResources")[1].get("integerValue"),
+        instance_id=ci.get("ec2InstanceId"),
+        attributes=ci.get("attributes"),
+        version=ci.get("version", 0),
+    )
+
+
+def _batched(items: List, size: int) -> List[List]:
+    return [items[idx : idx + size] for idx in range(0, len(items), size)]
 
 
 class ECSService:
     def __init__(
         self,
-        ecs_client: boto3.Session.client,
+        ecs_client: "boto3.Session.client",
         cluster_name: str,
-        service_name: str,
+        service_name: Optional[str] = None,
+        max_workers: int = MAX_WORKERS,
+        service_names: Optional[List[str]] = None,
+        all_services: bool = False,
+        task_definition_cache=None,
+        with_tasks: bool = False,
     ):
         self.cluster_name = cluster_name
         self.service_name = service_name
+        self.service_names = (
+            service_names
+            if service_names is not None
+            else [service_name] if service_name else []
+        )
+        self.all_services = all_services
+        self.task_definition_cache = task_definition_cache
+        # fetch every running task of the cluster along with the snapshot
+        self.with_tasks = with_tasks
 
         self.ecs_client = ecs_client
+        self.max_workers = max_workers
+        self._snapshot: Optional[Snapshot] = None
+
+    def _map(self, func: Callable, items: List) -> List:
+        if len(items) <= 1:
+            return [func(item) for item in items]
+
+        # boto3 clients are thread-safe; map() keeps the results in the order of the items
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(items))
+        ) as executor:
+            return list(executor.map(func, items))
 
     def _get_cluster_info(self) -> Cluster:
         response = self.ecs_client.describe_clusters(clusters=[self.cluster_name])
@@ -24,63 +88,303 @@ class ECSService:
 
         return cluster
 
-    def _get_service_info(self) -> Service:
+    def _list_service_arns(self) -> List[str]:
+        arns: List[str] = []
+        kwargs = dict(cluster=self.cluster_name, maxResults=LIST_SERVICES_PAGE_SIZE)
+
+        while True:
+            response = self.ecs_client.list_services(**kwargs)
+            arns.extend(response.get("serviceArns", []))
+
+            if not response.get("nextToken"):
+                return arns
+
+            kwargs["nextToken"] = response["nextToken"]
+
+    def _describe_services(self, service_names: List[str]) -> List[dict]:
         response = self.ecs_client.describe_services(
-            cluster=self.cluster_name, services=[self.service_name]
+            cluster=self.cluster_name, services=service_names
+        )
+
+        if len(response.get("services")) != len(service_names):
+            found = [elem["serviceName"] for elem in response.get("services")]
+            missing = [
+                name
+                for name in service_names
+                if name not in found and name.split("/")[-1] not in found
+            ]
+
+            raise ServiceNotFoundError(
+                f"Service named '{', '.join(missing)}' doesn't exist."
+            )
+
+        return response.get("services")
+
+    def _get_services_info(self) -> List[Service]:
+        service_names = (
+            self._list_service_arns() if self.all_services else self.service_names
+        )
+
+        described = [
+            elem
+            for batch in self._map(
+                self._describe_services,
+                _batched(service_names, DESCRIBE_SERVICES_BATCH_SIZE),
+            )
+            for elem in batch
+        ]
+
+        # many services share a task definition revision, so each one is described only once
+        task_definition_arns = list(
+            dict.fromkeys(elem["taskDefinition"] for elem in described)
+        )
+        task_definitions = dict(
+            zip(
+                task_definition_arns,
+                self._map(self._get_task_definition, task_definition_arns),
+            )
+        )
+
+        services = []
+
+        for elem in described:
+            service: Service = Service.parse_obj({"services": [elem]})
+            service.task_definition = task_definitions[elem["taskDefinition"]]
+            services.append(service)
+
+        # only services that place one task per instance need to know where their tasks run
+        distinct_services = [
+            elem for elem in services if elem.requires_distinct_instance
+        ]
+
+        for service, occupied_instances in zip(
+            distinct_services,
+            self._map(
+                self._get_occupied_instances,
+                [elem.name for elem in distinct_services],
+            ),
+        ):
+            service.occupied_instances = occupied_instances
+
+        return services
+
+    def _list_task_arns(self, service_name: Optional[str] = None) -> List[str]:
+        arns: List[str] = []
+        kwargs = dict(
+            cluster=self.cluster_name,
+            desiredStatus="RUNNING",
+            maxResults=LIST_TASKS_PAGE_SIZE,
+        )
+
+        if service_name:
+            kwargs["serviceName"] = service_name
+
+        while True:
+            response = self.ecs_client.list_tasks(**kwargs)
+            arns.extend(response.get("taskArns", []))
+
+            if not response.get("nextToken"):
+                return arns
+
+            kwargs["nextToken"] = response["nextToken"]
+
+    def _describe_tasks(self, task_arns: List[str]) -> List[dict]:
+        return [
+            elem
+            for batch in _batched(task_arns, DESCRIBE_TASKS_BATCH_SIZE)
+            for elem in self.ecs_client.describe_tasks(
+                cluster=self.cluster_name, tasks=batch
+            ).get("tasks", [])
+        ]
+
+    def _get_occupied_instances(self, service_name: str) -> List[str]:
+        return list(
+            dict.fromkeys(
+                elem["containerInstanceArn"]
+                for elem in self._describe_tasks(self._list_task_arns(service_name))
+                if elem.get("containerInstanceArn")
+            )
         )
-        if len(response.get("services")) == 0:
-            exit(f"Service named '{self.service_name}' doesn't exist.")
 
-        service: Service = Service.parse_obj(response)
+    def _get_tasks(self) -> List[Task]:
+        batches = _batched(self._list_task_arns(), DESCRIBE_TASKS_BATCH_SIZE)
+
+        return [
+            Task.parse_obj(elem)
+            for batch in self._map(self._describe_tasks, batches)
+            for elem in batch
+        ]
+
+    def _get_running_task_definitions(
+        self, services: List[Service], tasks: List[Task]
+    ) -> Dict[str, TaskDefinition]:
+        # tasks run the current task definition of their service, except during a deployment
+        task_definitions = {
+            elem.task_definition.arn: elem.task_definition
+            for elem in services
+            if elem.task_definition
+        }
+        missing = list(
+            dict.fromkeys(
+                elem.task_definition_arn
+                for elem in tasks
+                if elem.service_name
+                and elem.task_definition_arn
+                and elem.task_definition_arn not in task_definitions
+            )
+        )
+        task_definitions.update(
+            zip(missing, self._map(self._get_task_definition, missing))
+        )
+
+        return task_definitions
+
+    def _get_task_definition(self, task_definition_arn: str) -> TaskDefinition:
+        if self.task_definition_cache:
+            task_definition = self.task_definition_cache.get(task_definition_arn)
+
+            if task_definition is not None:
+                return task_definition
 
         task_def_response = self.ecs_client.describe_task_definition(
-            taskDefinition=response["services"][0]["taskDefinition"]
+            taskDefinition=task_definition_arn
         )
-        task_definition: TaskDefinition = TaskDefinition.parse_obj(task_def_response)
 
-        service.task_definition = task_definition
+        if self.task_definition_cache:
+            return self.task_definition_cache.put(
+                task_definition_arn, task_def_response
+            )
 
-        return service
+        return TaskDefinition.parse_obj(task_def_response)
 
-    def _get_instances_info(self) -> List[ContainerInstance]:
-        container_instances: List = []
+    def _list_container_instance_arns(self) -> List[str]:
+        arns: List[str] = []
+        kwargs = dict(
+            cluster=self.cluster_name,
+            status="ACTIVE",
+            maxResults=LIST_CONTAINER_INSTANCES_PAGE_SIZE,
+        )
 
-        instances = self.ecs_client.list_container_instances(
-            cluster=self.cluster_name, status="ACTIVE"
-        ).get("containerInstanceArns")
+        while True:
+            response = self.ecs_client.list_container_instances(**kwargs)
+            arns.extend(response.get("containerInstanceArns", []))
 
-        if not instances:
-            return container_instances
+            if not response.get("nextToken"):
+                return arns
 
+            kwargs["nextToken"] = response["nextToken"]
+
+    def _describe_container_instances(
+        self,
+        arns: List[str],
+        known: Optional[Dict[str, ContainerInstance]] = None,
+    ) -> List[ContainerInstance]:
         response = self.ecs_client.describe_container_instances(
             cluster=self.cluster_name,
-            containerInstances=instances,
+            containerInstances=arns,
         )
 
+        container_instances = []
+
         for ci in response.get("containerInstances", []):
-            container_instance = ContainerInstance(
-                arn=ci.get("containerInstanceArn"),
-                cpu_remaining=ci.get("remainingResources")[0].get("integerValue"),
-                memory_remaining=ci.get("remainingResources")[1].get("integerValue"),
-                cpu_total=ci.get("registeredResources")[0].get("integerValue"),
-                memory_total=ci.get("registeredResources")[1].get("integerValue"),
-                instance_id=ci.get("ec2InstanceId"),
-                attributes=ci.get("attributes"),
-            )
+            previous = (known or {}).get(ci.get("containerInstanceArn"))
 
-            container_instances.append(container_instance)
+            # ECS increments the version whenever resources, attributes or the status of an instance change
+            if previous is not None and previous.version == ci.get("version"):
+                container_instances.append(previous)
+            else:
+                container_instances.append(_parse_container_instance(ci))
 
         return container_instances
 
-    @property
-    def cluster(self) -> Cluster:
+    def _get_instances_info(
+        self, known: Optional[Dict[str, ContainerInstance]] = None
+    ) -> List[ContainerInstance]:
+        batches = _batched(
+            self._list_container_instance_arns(),
+            DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE,
+        )
+
+        return [
+            ci
+            for batch in self._map(
+                partial(self._describe_container_instances, known=known), batches
+            )
+            for ci in batch
+        ]
+
+    def refresh(self) -> Snapshot:
+        """Fetches the cluster, its container instances, the services and their task definitions from ECS.
+
+        The result replaces the current snapshot; until this is called again, every read of `cluster`,
+        `service`, `services` and `snapshot` is served from memory.
+        """
         cluster = self._get_cluster_info()
 
-        if cluster:
-            cluster.container_instances = self._get_instances_info()
+        if cluster is None:
+            # ECS fails every other call for a cluster that does not exist
+            self._snapshot = Snapshot()
 
-        return cluster
+            return self._snapshot
+
+        cluster.container_instances = self._get_instances_info()
+        services = self._get_services_info()
+        tasks = self._get_tasks() if self.with_tasks else []
+
+        self._snapshot = Snapshot(
+            cluster=cluster,
+            services=services,
+            tasks=tasks,
+            task_definitions=(
+                self._get_running_task_definitions(services, tasks)
+                if self.with_tasks
+                else {}
+            ),
+        )
+
+        return self._snapshot
+
+    def refresh_instances(self) -> Snapshot:
+        """Refreshes only the container instances of the current snapshot.
+
+        Deregistered instances are dropped and new ones are added. Instances whose version did not change keep
+        their existing ContainerInstance object, along with anything computed from it. The cluster and the
+        services are taken from the current snapshot.
+        """
+        if self._snapshot is None or self._snapshot.cluster is None:
+            return self.refresh()
+
+        cluster = self._snapshot.cluster
+        known = {ci.arn: ci for ci in cluster.container_instances}
+
+        self._snapshot = Snapshot(
+            cluster=Cluster(
+                name=cluster.name,
+                arn=cluster.arn,
+                container_instances=self._get_instances_info(known=known),
+            ),
+            services=self._snapshot.services,
+            tasks=self._snapshot.tasks,
+            task_definitions=self._snapshot.task_definitions,
+        )
+
+        return self._snapshot
+
+    @property
+    def snapshot(self) -> Snapshot:
+        if self._snapshot is None:
+            return self.refresh()
+
+        return self._snapshot
+
+    @property
+    def cluster(self) -> Cluster:
+        return self.snapshot.cluster
 
     @property
     def service(self) -> Service:
-        return self._get_service_info()
+        return self.snapshot.service
+
+    @property
+    def services(self) -> List[Service]:
+        return self.snapshot.services
@@ -0,0 +1,79 @@
+import asyncio
+from typing import List
+
+from willy.models import ContainerInstance, Snapshot
+from willy.services.ecs import (
+    DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE,
+    ECSService,
+    _batched,
+)
+
+
+class AsyncECSService(ECSService):
+    """ECSService that overlaps the independent ECS calls on an asyncio event loop.
+
+    boto3 is blocking, so every call is offloaded to a worker thread. The cluster, the services (with their task
+    definitions) and the container instance listing run concurrently; the describe_container_instances batches
+    fan out as soon as the ARNs are known, bounded by `max_workers`.
+
+    Code that already runs an event loop should `await refresh_async()`; the synchronous `refresh()`,
+    `snapshot`, `cluster`, `service` and `services` behave exactly like the ones on ECSService.
+    """
+
+    async def _get_instances_info_async(self) -> List[ContainerInstance]:
+        arns = await asyncio.to_thread(self._list_container_instance_arns)
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def describe(batch: List[str]) -> List[ContainerInstance]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._describe_container_instances, batch
+                )
+
+        described = await asyncio.gather(
+            *(
+                describe(batch)
+                for batch in _batched(arns, DESCRIBE_CONTAINER_INSTANCES_BATCH_SIZE)
+            )
+        )
+
+        return [ci for batch in described for ci in batch]
+
+    async def refresh_async(self) -> Snapshot:
+        cluster, services, container_instances, tasks = await asyncio.gather(
+            asyncio.to_thread(self._get_cluster_info),
+            asyncio.to_thread(self._get_services_info),
+            self._get_instances_info_async(),
+            asyncio.to_thread(self._get_tasks if self.with_tasks else list),
+            return_exceptions=True,
+        )
+
+        if isinstance(cluster, BaseException):
+            raise cluster
+
+        # listing the instances, services and tasks of a cluster that does not exist fails, which only matters if
+        # the cluster exists
+        if cluster:
+            for result in (container_instances, services, tasks):
+                if isinstance(result, BaseException):
+                    raise result
+
+            cluster.container_instances = container_instances
+
+        self._snapshot = Snapshot(
+            cluster=cluster,
+            services=services if cluster else [],
+            tasks=tasks if cluster else [],
+            task_definitions=(
+                await asyncio.to_thread(
+                    self._get_running_task_definitions, services, tasks
+                )
+                if cluster and self.with_tasks
+                else {}
+            ),
+        )
+
+        return self._snapshot
+
+    def refresh(self) -> Snapshot:
+        return asyncio.run(self.refresh_async())
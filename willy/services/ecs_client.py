@@ -1,5 +1,3 @@
-import boto3
-
 ECS_CLIENT = None
 
 
@@ -10,6 +8,8 @@ def get_ecs_client():
         return ECS_CLIENT
 
     else:
+        import boto3
+
         session = boto3.session.Session()
         ECS_CLIENT = session.client("ecs")
 
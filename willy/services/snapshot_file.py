@@ -0,0 +1,198 @@
+import json
+from datetime import datetime, timezone
+from threading import Lock
+from typing import List, Optional
+
+from willy.services.ecs import ECSService
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class SnapshotFormatError(ValueError):
+    """The snapshot file was written in a format version this version of willy can not read."""
+
+
+class SnapshotECSClient:
+    """Serves the ECS calls willy makes from a snapshot file instead of the ECS API.
+
+    The file holds the raw `clusters`, `containerInstances`, `services`, `taskDefinitions` and `tasks` returned by
+    the describe_* calls, see `capture_snapshot`.
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+        self._container_instances = {
+            elem["containerInstanceArn"]: elem
+            for elem in data.get("containerInstances", [])
+        }
+        self._services = {
+            elem["serviceName"]: elem for elem in data.get("services", [])
+        }
+        self._services.update(
+            {elem["serviceArn"]: elem for elem in data.get("services", [])}
+        )
+        self._task_definitions = {
+            elem["taskDefinitionArn"]: elem for elem in data.get("taskDefinitions", [])
+        }
+        # the running tasks of the cluster
+        self._tasks = {elem["taskArn"]: elem for elem in data.get("tasks", [])}
+
+    @classmethod
+    def from_file(cls, file_path: str):
+        with open(file_path, "r") as input_file:
+            data = json.load(input_file)
+
+        version = data.get("version")
+
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotFormatError(
+                f"Snapshot file '{file_path}' has format version {version}, this version of willy reads version "
+                f"{SNAPSHOT_FORMAT_VERSION}. Capture the cluster again with 'willy snapshot capture'."
+            )
+
+        return cls(data)
+
+    @property
+    def cluster_name(self) -> Optional[str]:
+        clusters = self.data.get("clusters", [])
+
+        return clusters[0]["clusterName"] if clusters else None
+
+    def describe_clusters(self, clusters: List[str], **kwargs) -> dict:
+        found = [
+            elem
+            for elem in self.data.get("clusters", [])
+            if elem["clusterName"] in clusters or elem["clusterArn"] in clusters
+        ]
+
+        return {
+            "clusters": found,
+            "failures": [
+                {"arn": name, "reason": "MISSING"} for name in clusters if not found
+            ],
+        }
+
+    def list_container_instances(self, **kwargs) -> dict:
+        return {"containerInstanceArns": list(self._container_instances)}
+
+    def describe_container_instances(self, containerInstances: List[str], **kwargs):
+        return {
+            "containerInstances": [
+                self._container_instances[arn]
+                for arn in containerInstances
+                if arn in self._container_instances
+            ],
+            "failures": [],
+        }
+
+    def list_services(self, **kwargs) -> dict:
+        return {"serviceArns": [elem["serviceArn"] for elem in self.data["services"]]}
+
+    def describe_services(self, services: List[str], **kwargs) -> dict:
+        return {
+            "services": [
+                self._services[name] for name in services if name in self._services
+            ],
+            "failures": [
+                {"arn": name, "reason": "MISSING"}
+                for name in services
+                if name not in self._services
+            ],
+        }
+
+    def describe_task_definition(self, taskDefinition: str, **kwargs) -> dict:
+        return {"taskDefinition": self._task_definitions[taskDefinition]}
+
+    def list_tasks(self, serviceName: Optional[str] = None, **kwargs) -> dict:
+        group = f"service:{serviceName.split('/')[-1]}" if serviceName else None
+
+        return {
+            "taskArns": [
+                arn
+                for arn, elem in self._tasks.items()
+                if group is None or elem.get("group") == group
+            ]
+        }
+
+    def describe_tasks(self, tasks: List[str], **kwargs) -> dict:
+        return {
+            "tasks": [self._tasks[arn] for arn in tasks if arn in self._tasks],
+            "failures": [],
+        }
+
+
+class _RecordingECSClient:
+    def __init__(self, ecs_client):
+        self.ecs_client = ecs_client
+        self.data = {
+            "clusters": [],
+            "containerInstances": [],
+            "services": [],
+            "taskDefinitions": [],
+            "tasks": [],
+        }
+        self._lock = Lock()
+
+    def __getattr__(self, name: str):
+        return getattr(self.ecs_client, name)
+
+    def _record(self, key: str, elements: List[dict]):
+        with self._lock:
+            self.data[key].extend(elements)
+
+    def describe_clusters(self, **kwargs) -> dict:
+        response = self.ecs_client.describe_clusters(**kwargs)
+        self._record("clusters", response.get("clusters", []))
+
+        return response
+
+    def describe_container_instances(self, **kwargs) -> dict:
+        response = self.ecs_client.describe_container_instances(**kwargs)
+        self._record("containerInstances", response.get("containerInstances", []))
+
+        return response
+
+    def describe_services(self, **kwargs) -> dict:
+        response = self.ecs_client.describe_services(**kwargs)
+        self._record("services", response.get("services", []))
+
+        return response
+
+    def describe_task_definition(self, **kwargs) -> dict:
+        response = self.ecs_client.describe_task_definition(**kwargs)
+        self._record("taskDefinitions", [response["taskDefinition"]])
+
+        return response
+
+    def describe_tasks(self, **kwargs) -> dict:
+        response = self.ecs_client.describe_tasks(**kwargs)
+        self._record("tasks", response.get("tasks", []))
+
+        return response
+
+
+def capture_snapshot(
+    ecs_client, cluster_name: str, service_names: Optional[List[str]] = None
+) -> dict:
+    """Fetches a cluster and its services (all of them if `service_names` is None) into a snapshot dict."""
+    recorder = _RecordingECSClient(ecs_client)
+
+    ECSService(
+        ecs_client=recorder,
+        cluster_name=cluster_name,
+        service_names=service_names,
+        all_services=service_names is None,
+        with_tasks=True,
+    ).refresh()
+
+    return {
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "capturedAt": datetime.now(timezone.utc).isoformat(),
+        **recorder.data,
+    }
+
+
+def write_snapshot(data: dict, file_path: str):
+    with open(file_path, "w") as output_file:
+        # datetimes (e.g. registeredAt) are not needed by willy and are stored as strings
+        json.dump(data, output_file, default=str, indent=2)
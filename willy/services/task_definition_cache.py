@@ -0,0 +1,88 @@
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Union
+
+from willy.models import TaskDefinition
+from willy.services.cache import _default_cache_dir
+
+# a task definition revision can not change after it is registered, so only full revision ARNs are cached
+REVISION_ARN_REGEX = r"^arn:aws[\w-]*:ecs:[\w-]+:\d+:task-definition/[\w-]+:\d+$"
+
+
+def _is_revision_arn(task_definition_arn: str) -> bool:
+    return bool(re.match(REVISION_ARN_REGEX, task_definition_arn))
+
+
+class TaskDefinitionCache:
+    """Task definitions keyed by their revision ARN, parsed in memory and as raw describe_task_definition
+    responses on disk.
+
+    Entries never expire because a task definition revision is immutable. The responses are parsed when they are
+    loaded, so features added to the TaskDefinition model later also apply to revisions cached before.
+    """
+
+    def __init__(self, directory: Union[str, Path, None] = None):
+        self.directory = (
+            Path(directory) if directory else _default_cache_dir() / "task-definitions"
+        )
+        self._task_definitions: Dict[str, TaskDefinition] = {}
+        self._lock = Lock()
+
+    def _path(self, task_definition_arn: str) -> Path:
+        family_revision = task_definition_arn.split("/")[-1].replace(":", "@")
+        account_region = "-".join(task_definition_arn.split(":")[3:5])
+
+        return self.directory / account_region / f"{family_revision}.json"
+
+    def get(self, task_definition_arn: str) -> Optional[TaskDefinition]:
+        if not _is_revision_arn(task_definition_arn):
+            return None
+
+        task_definition = self._task_definitions.get(task_definition_arn)
+
+        if task_definition is not None:
+            return task_definition
+
+        try:
+            with open(self._path(task_definition_arn), "r") as input_file:
+                task_definition = TaskDefinition.parse_obj(json.load(input_file))
+        # entries written by older versions of willy hold a parsed model instead of the response
+        except (FileNotFoundError, KeyError, TypeError, ValueError):
+            return None
+
+        with self._lock:
+            self._task_definitions[task_definition_arn] = task_definition
+
+        return task_definition
+
+    def put(self, task_definition_arn: str, response: dict) -> TaskDefinition:
+        """Parses a describe_task_definition response, caches it and returns the task definition."""
+        task_definition = TaskDefinition.parse_obj(response)
+
+        if not _is_revision_arn(task_definition_arn):
+            return task_definition
+
+        with self._lock:
+            self._task_definitions[task_definition_arn] = task_definition
+
+        path = self._path(task_definition_arn)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+
+        try:
+            # datetimes (e.g. registeredAt) are not needed by willy and are stored as strings
+            with os.fdopen(fd, "w") as output_file:
+                json.dump(response, output_file, default=str)
+
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        return task_definition
@@ -0,0 +1,50 @@
+import glob
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Union
+
+from willy.models import TaskDefinition
+
+MAX_WORKERS = 16
+
+
+def expand_task_definition_files(patterns: List[str]) -> List[str]:
+    """Returns the files matching the paths or glob patterns, in order and without duplicates.
+
+    Patterns that match nothing are returned as they are, so reading them reports the missing file.
+    """
+    paths = []
+
+    for pattern in patterns:
+        paths.extend(sorted(glob.glob(pattern, recursive=True)) or [pattern])
+
+    return list(dict.fromkeys(paths))
+
+
+def read_task_definition_file(file_path: str) -> TaskDefinition:
+    """Reads a task definition file with the input of register_task_definition or the output of
+    describe_task_definition."""
+    with open(file_path, "r") as input_file:
+        return TaskDefinition.parse_obj(json.load(input_file))
+
+
+def _read(file_path: str) -> Tuple[str, Union[TaskDefinition, str]]:
+    try:
+        return file_path, read_task_definition_file(file_path)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        return file_path, f"Can not read task definition from '{file_path}': {exc}"
+
+
+def read_task_definition_files(
+    file_paths: List[str], max_workers: int = MAX_WORKERS
+) -> List[Tuple[str, Union[TaskDefinition, str]]]:
+    """Reads the task definition files concurrently.
+
+    Returns the path and either the task definition or the reason it could not be read, in the order of the paths,
+    so one broken file does not stop the others from being checked.
+    """
+    if len(file_paths) <= 1:
+        return [_read(file_path) for file_path in file_paths]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+        return list(executor.map(_read, file_paths))
@@ -3,3 +3,5 @@ from .attributes import AttributesValidator
 from .cpu import CPUValidator
 from .memory import MemoryValidator
 from .network import NetworkValidator
+from .constraints import PlacementConstraintsValidator
+from .engine import ValidationEngine
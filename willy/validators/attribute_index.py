@@ -0,0 +1,56 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from willy.models import ContainerInstance
+from willy.constraints import instance_facts
+from willy.validators.attributes import _instance_max_versions
+
+
+class AttributeIndex:
+    """Inverted index from container instance attributes to the positions of the container instances that have them.
+
+    Built once per cluster, so the attributes required by a service resolve to candidate container instances by
+    set intersection instead of scanning the attributes of every instance.
+    """
+
+    def __init__(self, container_instances: List[ContainerInstance]):
+        self.container_instances = list(container_instances)
+        self.all: Set[int] = set(range(len(self.container_instances)))
+        self.without_attributes: Set[int] = set()
+        self._by_value: Dict[Tuple[str, Optional[str]], Set[int]] = defaultdict(set)
+        self._by_name: Dict[str, Set[int]] = defaultdict(set)
+        # versioned attributes, for example com.amazonaws.ecs.capability.docker-remote-api.1.19, by their name
+        # without the version
+        self._by_version_prefix: Dict[str, Set[int]] = defaultdict(set)
+        # highest version of every versioned attribute, one dict per container instance
+        self.max_versions: List[Dict[str, Tuple[int, ...]]] = []
+        # what placement constraint expressions are evaluated against, one dict per container instance
+        self.facts: List[Dict[str, Optional[str]]] = []
+
+        for position, container_instance in enumerate(self.container_instances):
+            if not container_instance.attributes:
+                self.without_attributes.add(position)
+
+            for attribute in container_instance.attributes:
+                self._by_value[(attribute.name, attribute.value)].add(position)
+                self._by_name[attribute.name].add(position)
+
+            max_versions = _instance_max_versions(container_instance)
+            self.max_versions.append(max_versions)
+
+            for prefix in max_versions:
+                self._by_version_prefix[prefix].add(position)
+
+            self.facts.append(instance_facts(container_instance))
+
+    def __len__(self) -> int:
+        return len(self.container_instances)
+
+    def with_value(self, name: str, value: Optional[str] = None) -> Set[int]:
+        return self._by_value.get((name, value), set())
+
+    def with_name(self, name: str) -> Set[int]:
+        return self._by_name.get(name, set())
+
+    def with_version_prefix(self, prefix: str) -> Set[int]:
+        return self._by_version_prefix.get(prefix, set())
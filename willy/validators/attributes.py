@@ -1,5 +1,6 @@
 import re
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 
 from willy.exceptions import MissingECSAttributeException
 from willy.models import (
@@ -13,60 +14,54 @@ from willy.validators import BaseValidator
 
 VERSION_REGEX = r"(.*?)(\d\.\d{1,})"
 SQUARE_BRACKETS_REGEX = r"[\[\]]"
+# attribute names, and the attributes of container instances, repeat across the instances and services of a
+# cluster, so they are parsed once
+PARSE_CACHE_SIZE = 4096
 
 
-def _split_attr_version(attribute_name: str):
-    return re.search(VERSION_REGEX, attribute_name).groups()
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_versioned_attribute(
+    attribute_name: str,
+) -> Optional[Tuple[str, Tuple[int, ...]]]:
+    # com.amazonaws.ecs.capability.docker-remote-api.1.19 -> ("com.amazonaws.ecs.capability.docker-remote-api.", (1, 19))
+    match = re.search(VERSION_REGEX, attribute_name)
 
+    if not match:
+        return None
 
-def _contains_version(attribute_name: str):
-    return bool(re.match(VERSION_REGEX, attribute_name))
+    prefix, version = match.groups()
 
+    return prefix, tuple(int(elem) for elem in version.split("."))
 
-def _contains_square_brackets(attribute_name: str):
-    return bool(re.search(SQUARE_BRACKETS_REGEX, attribute_name))
+
+def _contains_version(attribute_name: str):
+    return _parse_versioned_attribute(attribute_name) is not None
 
 
-def _compare_versioned_attribute(
-    task_def_attributes: List[Attribute], container_instance_attributes: List[Attribute]
-):
-    lesser_than_or_equal_to_required = []
-    greater_than_or_equal_to_required = []
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _max_versions(attribute_names: Tuple[str, ...]) -> Dict[str, Tuple[int, ...]]:
+    # the returned dict is shared between callers and must not be changed
+    max_versions = {}
 
-    for task_def_attribute in task_def_attributes:
-        attribute_name, task_def_version = _split_attr_version(task_def_attribute.name)
+    for attribute_name in attribute_names:
+        parsed = _parse_versioned_attribute(attribute_name)
 
-        relevant_ci_attrs = [
-            Attribute(name=elem.name)
-            for elem in container_instance_attributes
-            if elem.name.startswith(attribute_name)
-        ]
+        if parsed:
+            prefix, version = parsed
+            max_versions[prefix] = max(version, max_versions.get(prefix, version))
 
-        # if com.amazonaws.ecs.capability.docker-remote-api.1.19 is in attributes on the container instance with the
-        # same version
-        if task_def_attribute in relevant_ci_attrs:
-            lesser_than_or_equal_to_required.append(task_def_attribute)
+    return max_versions
 
-        # if not, we have to compare versions
-        else:
-            for attr in relevant_ci_attrs:
-                _, instance_attribute_version = _split_attr_version(attr.name)
-                # python compares strings lexicographically, so
-                # com.amazonaws.ecs.capability.docker-remote-api.1.19 > com.amazonaws.ecs.capability.docker-remote-api.1.18
-                if task_def_version > instance_attribute_version:
-                    greater_than_or_equal_to_required.append(task_def_attribute)
-                else:
-                    # com.amazonaws.ecs.capability.docker-remote-api.1.19 < com.amazonaws.ecs.capability.docker-remote-api.1.20
-                    lesser_than_or_equal_to_required.append(task_def_attribute)
 
-    if not lesser_than_or_equal_to_required and not greater_than_or_equal_to_required:
-        return False
+def _instance_max_versions(
+    container_instance: ContainerInstance,
+) -> Dict[str, Tuple[int, ...]]:
+    """Highest version of every versioned attribute on the container instance, by attribute name without the version."""
+    return _max_versions(tuple(attr.name for attr in container_instance.attributes))
+
 
-    # if the list of attributes with version lesser than or equal to the one on container instances is equal to the list of task def attributes
-    # then the container instance has all the attributes that the task def requires
-    return sorted(list(set(lesser_than_or_equal_to_required))) == sorted(
-        [Attribute(name=elem.name) for elem in task_def_attributes]
-    )
+def _contains_square_brackets(attribute_name: str):
+    return bool(re.search(SQUARE_BRACKETS_REGEX, attribute_name))
 
 
 def _split_attributes(attributes: List[Attribute]):
@@ -86,10 +81,127 @@ def _split_attributes(attributes: List[Attribute]):
     return versioned_attributes, non_versioned_attributes, list_attributes
 
 
+def _has_versioned_attributes(
+    versioned_attributes: List[Attribute], max_versions: Dict[str, Tuple[int, ...]]
+) -> bool:
+    # versions are compared as numbers, so docker-remote-api.1.19 is newer than docker-remote-api.1.9
+    for attr in versioned_attributes:
+        prefix, version = _parse_versioned_attribute(attr.name)
+
+        if max_versions.get(prefix, ()) < version:
+            return False
+
+    return True
+
+
 class AttributesValidator(BaseValidator):
     def __init__(self):
         self.missing_attributes = []
         self.result: ValidatorResult = ValidatorResult()
+        self._split_service = None
+        self._split_service_attributes = ([], [], [])
+
+    def _service_attributes(self, service: Service):
+        # the attributes of a service are split once, not for every container instance
+        if self._split_service is not service:
+            self._split_service = service
+            self._split_service_attributes = _split_attributes(
+                service.requires_attributes
+            )
+
+        return self._split_service_attributes
+
+    def check_instance(
+        self,
+        cluster: Cluster,
+        service: Service,
+        container_instance: ContainerInstance,
+    ) -> Optional[str]:
+        (
+            versioned_attributes,
+            non_versioned_attributes,
+            list_attributes,
+        ) = self._service_attributes(service)
+        missing = []
+
+        if versioned_attributes and not _has_versioned_attributes(
+            versioned_attributes, _instance_max_versions(container_instance)
+        ):
+            missing.extend(versioned_attributes)
+
+        if (
+            non_versioned_attributes
+            and service.task_definition.requires_attributes
+            != container_instance.attributes
+        ):
+            missing.extend(
+                attr
+                for attr in non_versioned_attributes
+                if attr not in container_instance.attributes
+            )
+
+        # one of the values of an 'in [...]' expression is enough
+        if list_attributes and not any(
+            Attribute(name=attr.name, value=attr.value) in container_instance.attributes
+            for attr in list_attributes
+        ):
+            missing.extend(list_attributes)
+
+        if not missing:
+            return None
+
+        self.missing_attributes.extend(missing)
+
+        return f"Missing attributes: {', '.join(str(elem) for elem in missing)}"
+
+    def candidates(self, index, service: Service) -> Optional[Set[int]]:
+        (
+            versioned_attributes,
+            non_versioned_attributes,
+            list_attributes,
+        ) = self._service_attributes(service)
+        candidates = index.all
+
+        for attr in non_versioned_attributes:
+            candidates = candidates & index.with_value(attr.name, attr.value)
+
+        # check_instance skips non-versioned attributes on instances whose attributes equal the ones of the
+        # task definition, which only matters when both are empty
+        if (
+            non_versioned_attributes
+            and service.task_definition.requires_attributes == []
+        ):
+            candidates = candidates | index.without_attributes
+
+        if list_attributes:
+            candidates = candidates & set().union(
+                *(index.with_value(attr.name, attr.value) for attr in list_attributes)
+            )
+
+        # versions are compared on instances that have every required attribute in some version
+        if versioned_attributes:
+            for attr in versioned_attributes:
+                prefix, _ = _parse_versioned_attribute(attr.name)
+                candidates = candidates & index.with_version_prefix(prefix)
+
+            candidates = {
+                position
+                for position in candidates
+                if _has_versioned_attributes(
+                    versioned_attributes, index.max_versions[position]
+                )
+            }
+
+        return candidates
+
+    def fail(
+        self,
+        cluster: Cluster,
+        service: Service,
+        container_instances: List[ContainerInstance],
+    ):
+        self.result.invalid_instances = container_instances
+        self._raise_exception(service=service, cluster=cluster)
 
     def _raise_exception(self, service: Service, cluster: Cluster):
         missing_attrs_str = f"""{f"{chr(10)}".join([str(elem) for elem in list(set(self.missing_attributes))])}"""
@@ -120,25 +232,12 @@ class AttributesValidator(BaseValidator):
         valid_instances = []
 
         for container_instance in container_instances:
-            versioned_instance_attributes, _, _ = _split_attributes(
-                container_instance.attributes
-            )
-            all_attributes_present = sorted(
-                versioned_attributes, key=lambda attr: attr.name
-            ) == sorted(versioned_instance_attributes, key=lambda attr: attr.name)
-
-            if all_attributes_present:
+            if _has_versioned_attributes(
+                versioned_attributes, _instance_max_versions(container_instance)
+            ):
                 valid_instances.append(container_instance)
             else:
-                all_attribute_greater_than_or_equal_to = _compare_versioned_attribute(
-                    task_def_attributes=versioned_attributes,
-                    container_instance_attributes=container_instance.attributes,
-                )
-
-                if all_attribute_greater_than_or_equal_to:
-                    valid_instances.append(container_instance)
-                else:
-                    self.missing_attributes.extend(versioned_attributes)
+                self.missing_attributes.extend(versioned_attributes)
 
         return valid_instances
 
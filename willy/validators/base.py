@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List
+from typing import List, Optional, Set
 
 from willy.models import Cluster, Service, ContainerInstance, ValidatorResult
 
@@ -13,3 +13,38 @@ class BaseValidator(object):
         container_instances: List[ContainerInstance],
     ) -> ValidatorResult:
         raise NotImplementedError()
+
+    @abstractmethod
+    def check_instance(
+        self,
+        cluster: Cluster,
+        service: Service,
+        container_instance: ContainerInstance,
+    ) -> Optional[str]:
+        """Returns the reason why the service can not run on the container instance, or None if it can."""
+        raise NotImplementedError()
+
+    def fail(
+        self,
+        cluster: Cluster,
+        service: Service,
+        container_instances: List[ContainerInstance],
+    ):
+        """Raises the exception of this validator for container instances that all failed `check_instance`."""
+        self.validate(
+            cluster=cluster, service=service, container_instances=container_instances
+        )
+
+    def mask(self, columns, service: Service):
+        """Returns a boolean array of the container instances in a `ColumnarCluster` that pass `check_instance`.
+
+        Validators that can not be vectorized return None and are checked one container instance at a time.
+        """
+        return None
+
+    def candidates(self, index, service: Service) -> Optional[Set[int]]:
+        """Returns the positions of the container instances in an `AttributeIndex` that pass `check_instance`.
+
+        Validators that can not use the index return None.
+        """
+        return None
@@ -0,0 +1,102 @@
+from typing import List, Optional, Set
+
+from willy.constraints import InvalidExpressionError, compile_expression, instance_facts
+from willy.exceptions import PlacementConstraintException
+from willy.models import Cluster, ContainerInstance, Service, ValidatorResult
+from willy.validators import BaseValidator
+
+
+class PlacementConstraintsValidator(BaseValidator):
+    """Evaluates the memberOf expressions of a service that are not checked as required attributes."""
+
+    def check_instance(
+        self,
+        cluster: Cluster,
+        service: Service,
+        container_instance: ContainerInstance,
+    ) -> Optional[str]:
+        expressions = service.all_constraint_expressions
+
+        if not expressions:
+            return None
+
+        facts = instance_facts(container_instance)
+        not_met = []
+
+        for expression in expressions:
+            try:
+                if not compile_expression(expression).matches(facts):
+                    not_met.append(expression)
+
+            except InvalidExpressionError as exc:
+                return f"Invalid placement constraint: {exc}"
+
+        if not not_met:
+            return None
+
+        return f"Placement constraints not met: {', '.join(not_met)}"
+
+    def candidates(self, index, service: Service) -> Optional[Set[int]]:
+        expressions = service.all_constraint_expressions
+
+        if not expressions:
+            return None
+
+        candidates = index.all
+
+        for expression in expressions:
+            try:
+                candidates = candidates & compile_expression(expression).positions(
+                    index
+                )
+            except InvalidExpressionError:
+                return set()
+
+        return candidates
+
+    def validate(
+        self,
+        cluster: Cluster,
+        service: Service,
+        container_instances: List[ContainerInstance],
+    ) -> ValidatorResult:
+        result: ValidatorResult = ValidatorResult()
+        reasons = {}
+
+        for container_instance in container_instances:
+            reason = self.check_instance(cluster, service, container_instance)
+
+            if reason:
+                reasons[container_instance.arn] = reason
+                result.invalid_instances.append(container_instance)
+            else:
+                result.valid_instances.append(container_instance)
+
+        if not result.valid_instances:
+            table = f"""
+Container instances incapable of running the service:\n
+{'Instance ID':>20} | Reason
+{'-' * 53}
+"""
+
+            for ins in result.invalid_instances:
+                table += f"{ins.instance_id:>20} | {reasons[ins.arn]}\n"
+
+            result.message = (
+                f"Service '{service.name}' can not run on the '{cluster.name}' cluster. "
+                f"There are no container instances that meet the placement constraints of the service."
+            )
+            result.verbose_message = f"{result.message}\n{table}"
+
+            raise PlacementConstraintException(
+                message=result.message,
+                verbose_message=result.verbose_message,
+                valid_instances=result.valid_instances,
+                invalid_instances=result.invalid_instances,
+            )
+
+        result.success = True
+        result.message = f"Cluster '{cluster.name}' has container instances that meet the placement constraints of the '{service.name}' service."
+        result.verbose_message = result.message
+
+        return result
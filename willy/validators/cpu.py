@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from willy.exceptions import NotEnoughCPUException
 from willy.models import Cluster, ValidatorResult, Service, ContainerInstance
@@ -6,6 +6,23 @@ from willy.validators import BaseValidator
 
 
 class CPUValidator(BaseValidator):
+    def check_instance(
+        self,
+        cluster: Cluster,
+        service: Service,
+        container_instance: ContainerInstance,
+    ) -> Optional[str]:
+        if container_instance.cpu_remaining >= service.total_cpu_needed:
+            return None
+
+        return (
+            f"Not enough CPU units: {service.total_cpu_needed} required, "
+            f"{container_instance.cpu_remaining} remaining"
+        )
+
+    def mask(self, columns, service: Service):
+        return columns.cpu_remaining >= service.total_cpu_needed
+
     def validate(
         self,
         cluster: Cluster,
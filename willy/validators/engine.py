@@ -0,0 +1,207 @@
+from typing import List, Optional, Type
+
+from willy.columnar import ColumnarCluster, columnar_available
+from willy.models import Cluster, ContainerInstance, Service, ValidatorResult
+from willy.validators.attribute_index import AttributeIndex
+from willy.validators.attributes import AttributesValidator
+from willy.validators.base import BaseValidator
+from willy.validators.constraints import PlacementConstraintsValidator
+from willy.validators.cpu import CPUValidator
+from willy.validators.memory import MemoryValidator
+from willy.validators.network import NetworkValidator
+
+DEFAULT_VALIDATORS = [
+    CPUValidator,
+    MemoryValidator,
+    NetworkValidator,
+    AttributesValidator,
+    PlacementConstraintsValidator,
+]
+
+
+class ValidationEngine:
+    """Runs all validators over the container instances in a single pass.
+
+    Each instance is checked by the validators in order and stops at the first one that rejects it. If no
+    instance is valid, the validator furthest down the list that rejected an instance raises its exception for
+    the instances it rejected. That is the same validator, with the same instances, that would have raised if
+    the validators ran one after another.
+    """
+
+    def __init__(
+        self,
+        validators: Optional[List[Type[BaseValidator]]] = None,
+        columnar: Optional[bool] = None,
+    ):
+        self.validators = validators or DEFAULT_VALIDATORS
+        # the columnar view is used when NumPy is installed, unless disabled explicitly
+        self.columnar = columnar_available() if columnar is None else columnar
+        self._source: Optional[List[ContainerInstance]] = None
+        self._columns: Optional[ColumnarCluster] = None
+        self._attribute_index: Optional[AttributeIndex] = None
+
+    def _reset(self, container_instances: List[ContainerInstance]):
+        # the views are built once and reused for every service checked against the same container instances
+        if self._source is not container_instances:
+            self._source = container_instances
+            self._columns = None
+            self._attribute_index = None
+
+    def columns(
+        self, container_instances: List[ContainerInstance]
+    ) -> Optional[ColumnarCluster]:
+        if not self.columnar:
+            return None
+
+        self._reset(container_instances)
+
+        if self._columns is None:
+            self._columns = ColumnarCluster(container_instances)
+
+        return self._columns
+
+    def attribute_index(
+        self, container_instances: List[ContainerInstance]
+    ) -> AttributeIndex:
+        self._reset(container_instances)
+
+        if self._attribute_index is None:
+            self._attribute_index = AttributeIndex(container_instances)
+
+        return self._attribute_index
+
+    def _accepted(
+        self,
+        validator: BaseValidator,
+        service: Service,
+        container_instances: List[ContainerInstance],
+    ) -> Optional[list]:
+        # container instances that pass the validator, by position, when the validator can tell without
+        # checking them one by one
+        columns = self.columns(container_instances)
+
+        if columns is not None:
+            mask = validator.mask(columns=columns, service=service)
+
+            if mask is not None:
+                return mask.tolist()
+
+        index = self.attribute_index(container_instances)
+        candidates = validator.candidates(index=index, service=service)
+
+        if candidates is None:
+            return None
+
+        accepted = [False] * len(container_instances)
+
+        for position in candidates:
+            accepted[position] = True
+
+        return accepted
+
+    def accepted(
+        self,
+        cluster: Cluster,
+        service: Service,
+        validators: Optional[List[Type[BaseValidator]]] = None,
+        container_instances: Optional[List[ContainerInstance]] = None,
+    ) -> List[bool]:
+        """Returns, by position, whether each container instance passes all the validators. Never raises."""
+        container_instances = (
+            cluster.container_instances
+            if container_instances is None
+            else container_instances
+        )
+        accepted = [True] * len(container_instances)
+
+        for validator in [validator() for validator in validators or self.validators]:
+            mask = self._accepted(validator, service, container_instances)
+
+            for idx, container_instance in enumerate(container_instances):
+                if not accepted[idx]:
+                    continue
+
+                if mask is not None:
+                    accepted[idx] = mask[idx]
+                    continue
+
+                accepted[idx] = not validator.check_instance(
+                    cluster=cluster,
+                    service=service,
+                    container_instance=container_instance,
+                )
+
+        return accepted
+
+    def validate(
+        self,
+        cluster: Cluster,
+        service: Service,
+        container_instances: Optional[List[ContainerInstance]] = None,
+    ) -> ValidatorResult:
+        validators = [validator() for validator in self.validators]
+        container_instances = (
+            cluster.container_instances
+            if container_instances is None
+            else container_instances
+        )
+
+        result = ValidatorResult()
+        # instances rejected by each validator
+        rejected: List[List[ContainerInstance]] = [[] for _ in validators]
+
+        masks = [
+            self._accepted(validator, service, container_instances)
+            for validator in validators
+        ]
+
+        for idx, container_instance in enumerate(container_instances):
+            for position, validator in enumerate(validators):
+                mask = masks[position]
+
+                if mask is not None and mask[idx]:
+                    continue
+
+                # also called for instances rejected by a mask or index, to get the reason
+                reason = validator.check_instance(
+                    cluster=cluster,
+                    service=service,
+                    container_instance=container_instance,
+                )
+
+                if reason:
+                    rejected[position].append(container_instance)
+                    result.invalid_instances.append(
+                        {"arn": container_instance.arn, "reason": reason}
+                    )
+                    break
+
+            else:
+                result.valid_instances.append(container_instance)
+
+        if not result.valid_instances:
+            position = max(
+                (position for position, elem in enumerate(rejected) if elem),
+                default=0,
+            )
+            validators[position].fail(
+                cluster=cluster,
+                service=service,
+                container_instances=rejected[position],
+            )
+
+            # fail() raises, unless a validator's validate() accepts instances its check_instance() rejected
+            reasons = "\n".join(
+                f"{elem['arn']}: {elem['reason']}" for elem in result.invalid_instances
+            )
+            result.message = (
+                f"Service '{service.name}' can not run on the '{cluster.name}' cluster."
+            )
+            result.verbose_message = f"{result.message}\n\n{reasons}"
+
+            return result
+
+        result.success = True
+        result.message = f"Service '{service.name}' can be scheduled on the '{cluster.name}' cluster."
+
+        return result
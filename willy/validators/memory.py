@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from xml.sax.handler import property_interning_dict
 
 from willy.exceptions import NotEnoughMemoryException
@@ -7,6 +7,23 @@ from willy.validators import BaseValidator
 
 
 class MemoryValidator(BaseValidator):
+    def check_instance(
+        self,
+        cluster: Cluster,
+        service: Service,
+        container_instance: ContainerInstance,
+    ) -> Optional[str]:
+        if container_instance.memory_remaining > service.total_memory_needed:
+            return None
+
+        return (
+            f"Not enough memory: {service.total_memory_needed} required, "
+            f"{container_instance.memory_remaining} remaining"
+        )
+
+    def mask(self, columns, service: Service):
+        return columns.memory_remaining > service.total_memory_needed
+
     def validate(
         self,
         cluster: Cluster,
@@ -1,11 +1,32 @@
-from typing import List
+from typing import List, Optional
 
 from willy.exceptions import NoPortsAvailableException
-from willy.models import Service, Cluster, ValidatorResult, ContainerInstance
+from willy.models import (
+    Service,
+    Cluster,
+    ValidatorResult,
+    ContainerInstance,
+    mask_to_ports,
+)
 from willy.validators import BaseValidator
 
 
 class NetworkValidator(BaseValidator):
+    def check_instance(
+        self,
+        cluster: Cluster,
+        service: Service,
+        container_instance: ContainerInstance,
+    ) -> Optional[str]:
+        used_ports = service.ports_mask & container_instance.ports_mask
+
+        if not used_ports:
+            return None
+
+        ports = ", ".join(str(port) for port in mask_to_ports(used_ports))
+
+        return f"Ports in use: {ports}"
+
     def validate(
         self,
         cluster: Cluster,
@@ -14,17 +35,11 @@ class NetworkValidator(BaseValidator):
     ) -> ValidatorResult:
         result: ValidatorResult = ValidatorResult()
 
-        task_def_ports = service.all_ports
-
-        for container_instance in cluster.container_instances:
-            free_host_ports = [
-                port
-                for port in task_def_ports
-                if port not in container_instance.all_ports
-            ]
+        task_def_ports = service.ports_mask
 
+        for container_instance in container_instances:
             # container instance has free ports (TCP and UDP) that the task def is requesting
-            if free_host_ports == task_def_ports:
+            if not task_def_ports & container_instance.ports_mask:
                 result.valid_instances.append(container_instance)
             else:
                 result.invalid_instances.append(container_instance)
@@ -54,9 +69,6 @@ Container instances incapable of running the service:\n
             result.message = msg
             result.verbose_message = f"{msg}\n{table}"
 
-            print(result.message)
-            print(result.verbose_message)
-
             raise NoPortsAvailableException(
                 message=result.message,
                 verbose_message=result.verbose_message,